@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+'''
+Time common api calls and actions against a synthetic project tree built from
+the builtin vfx_* templates. Each run appends one JSON record to the results
+file so timings can be compared across commits. Results are written to
+CACHE_ROOT/benchmarks/results.jsonl by default.
+
+The tree contains collections x sequences x shots x tasks x workspaces x
+versions entries. Nothing is read from or written to the network, actions
+that talk to a host application use a stub host.
+
+Usage:
+    python benchmarks/bench_actions.py [--collections 2] [--sequences 4]
+        [--shots 10] [--tasks 3] [--workspaces 1] [--versions 5]
+        [--repeat 10] [--output path/to/results.jsonl]
+'''
+from __future__ import absolute_import, division, print_function
+import os
+import io
+import sys
+import json
+import shutil
+import argparse
+import platform
+import datetime
+import tempfile
+import subprocess
+from timeit import default_timer
+import construct
+from construct import api
+from construct.constants import DEFAULT_LOGGING, CACHE_ROOT
+from construct.context import Context, clear_path_cache
+from construct.extension import HostExtension
+from construct.utils import unipath
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTPUT = unipath(CACHE_ROOT, 'benchmarks', 'results.jsonl')
+TASK_TYPES = ['anim', 'light', 'comp', 'fx', 'layout', 'model', 'rig']
+WORKSPACES = ['maya', 'nuke', 'houdini', 'katana']
+EXTENSION = '.mb'
+LOGGING = dict(
+    DEFAULT_LOGGING,
+    loggers={'construct': {'level': 'WARNING', 'handlers': ['console']}},
+)
+
+
+class BenchHost(HostExtension):
+    '''Stub host used to run actions that require a host application'''
+
+    name = 'BenchHost'
+    attr_name = 'bench'
+    host_name = 'bench'
+
+    def __init__(self):
+        super(BenchHost, self).__init__()
+        self.file = None
+
+    def save_file(self, file):
+        dirname = os.path.dirname(file)
+        if not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with open(file, 'a'):
+            os.utime(file, None)
+        self.file = file
+
+    def open_file(self, file):
+        self.file = file
+
+    def get_filepath(self):
+        return self.file
+
+    def modified(self):
+        return False
+
+
+def touch(path):
+    with open(path, 'a'):
+        os.utime(path, None)
+
+
+def build_tree(root, collections, sequences, shots, tasks, workspaces,
+               versions):
+    '''Build a synthetic project using the builtin vfx_* templates.
+
+    Returns:
+        tuple - (project, list of workspace entries)
+    '''
+
+    project = api.new_project(root=unipath(root, 'bench_project'))
+    templates = {
+        tag: api.get_template('vfx_' + tag, tag)
+        for tag in ['collection', 'sequence', 'shot', 'task', 'workspace']
+    }
+    path_templates = {
+        name: api.get_path_template(name)
+        for name in ['collection', 'sequence', 'shot', 'workspace']
+    }
+    file_template = api.get_path_template('workspace_file')
+
+    workspace_entries = []
+    for c in range(collections):
+        collection = 'coll_%02d' % c
+        templates['collection'].copy(path_templates['collection'].format(
+            dict(project=project.path, collection=collection)
+        ))
+
+        for s in range(sequences):
+            sequence = 'seq_%03d' % s
+            templates['sequence'].copy(path_templates['sequence'].format(
+                dict(
+                    project=project.path,
+                    collection=collection,
+                    sequence=sequence,
+                )
+            ))
+
+            for k in range(shots):
+                shot = 'sh_%04d' % ((k + 1) * 10)
+                shot_path = path_templates['shot'].format(dict(
+                    project=project.path,
+                    collection=collection,
+                    sequence=sequence,
+                    shot=shot,
+                ))
+                templates['shot'].copy(shot_path)
+
+                for t in range(tasks):
+                    task_type = TASK_TYPES[t % len(TASK_TYPES)]
+                    task = templates['task'].copy(
+                        unipath(shot_path, task_type)
+                    )
+                    task.tag(task_type)
+                    short = task.short
+
+                    for w in range(workspaces):
+                        workspace = templates['workspace'].copy(
+                            path_templates['workspace'].format(dict(
+                                task=task.path,
+                                workspace=WORKSPACES[w % len(WORKSPACES)],
+                            ))
+                        )
+                        workspace_entries.append(workspace)
+
+                        for v in range(versions):
+                            touch(unipath(workspace.path, file_template.format(
+                                dict(
+                                    task=short,
+                                    name=shot,
+                                    version='{:0>3d}'.format(v + 1),
+                                    ext=EXTENSION,
+                                )
+                            )))
+
+    api.reindex(project.path)
+    return project, workspace_entries
+
+
+def measure(repeat, fn):
+    '''Call fn repeat times, fn receives the iteration index.'''
+
+    times = []
+    for i in range(repeat):
+        st = default_timer()
+        fn(i)
+        times.append(default_timer() - st)
+
+    return dict(
+        repeat=repeat,
+        min=min(times),
+        mean=sum(times) / len(times),
+        max=max(times),
+    )
+
+
+def run_benchmarks(project, workspaces, repeat):
+    '''Time api calls and actions, returns a dict of results per benchmark'''
+
+    workspace = workspaces[-1]
+    task = workspace.parent()
+    shot = task.parent()
+    sequence = shot.parent()
+    file_template = api.get_path_template('workspace_file')
+    selector = '%s/%s' % (sequence.name, shot.name)
+
+    def search(i):
+        list(api.search(tags=['shot'], root=project.path))
+
+    def search_fs(i):
+        list(api.search(tags=['shot'], root=project.path, use_index=False))
+
+    def quick_select(i):
+        assert api.quick_select(selector, root=project.path)
+
+    def context_from_path_cold(i):
+        clear_path_cache()
+        Context.from_path(workspace.path)
+
+    def context_from_path(i):
+        Context.from_path(workspace.path)
+
+    def get_next_version(i):
+        workspace.get_next_version(shot.name, EXTENSION)
+
+    ctx = Context.from_path(workspace.path)
+
+    def collect_actions(i):
+        construct.actions.collect(ctx)
+
+    def new_shot(i):
+        api.set_context_from_entry(sequence)
+        api.new_shot(name='bench_%04d' % i)
+
+    def publish(i):
+        scene_file = unipath(workspace.path, file_template.format(dict(
+            task=task.short,
+            name='publish%04d' % i,
+            version='001',
+            ext=EXTENSION,
+        )))
+        touch(scene_file)
+        publish_ctx = Context.from_path(scene_file)
+        publish_ctx.host = 'bench'
+        publish_ctx.push()
+        try:
+            action = api.publish.instance()
+            action.run()
+        finally:
+            publish_ctx.pop()
+        assert action.stats.number_of_failures == 0
+
+    benchmarks = [
+        ('search', search),
+        ('search_fs', search_fs),
+        ('quick_select', quick_select),
+        ('context_from_path_cold', context_from_path_cold),
+        ('context_from_path', context_from_path),
+        ('get_next_version', get_next_version),
+        ('actions_collect', collect_actions),
+        ('new_shot', new_shot),
+        ('publish', publish),
+    ]
+
+    results = {}
+    for name, fn in benchmarks:
+        results[name] = measure(repeat, fn)
+        print('%-24s min %.6fs  mean %.6fs' % (
+            name, results[name]['min'], results[name]['mean']
+        ))
+        api.set_context(Context.from_path(workspace.path))
+
+    return results
+
+
+def get_commit():
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=HERE,
+            stderr=subprocess.STDOUT,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode('utf-8').strip()
+
+
+def load_previous(output, params):
+    '''Get the last record in output that was run with the same params'''
+
+    if not os.path.isfile(output):
+        return
+
+    previous = None
+    with io.open(output, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get('params') == params:
+                previous = record
+    return previous
+
+
+def save_record(output, record):
+    dirname = os.path.dirname(output)
+    if dirname and not os.path.isdir(dirname):
+        os.makedirs(dirname)
+
+    line = json.dumps(record, sort_keys=True)
+    with io.open(output, 'a', encoding='utf-8') as f:
+        f.write(line.decode('utf-8') if isinstance(line, bytes) else line)
+        f.write(u'\n')
+
+
+def print_comparison(previous, results):
+    print('\nCompared to %s (%s)' % (
+        previous.get('commit'), previous.get('timestamp')
+    ))
+    for name, result in sorted(results.items()):
+        before = previous['results'].get(name)
+        if not before or not before['min']:
+            continue
+        print('%-24s %+.1f%%' % (
+            name, (result['min'] / before['min'] - 1) * 100
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--collections', type=int, default=2)
+    parser.add_argument('--sequences', type=int, default=4)
+    parser.add_argument('--shots', type=int, default=10)
+    parser.add_argument('--tasks', type=int, default=3)
+    parser.add_argument('--workspaces', type=int, default=1)
+    parser.add_argument('--versions', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--keep', action='store_true',
+                        help='keep the synthetic project tree')
+    args = parser.parse_args()
+
+    params = dict(
+        collections=args.collections,
+        sequences=args.sequences,
+        shots=args.shots,
+        tasks=args.tasks,
+        workspaces=args.workspaces,
+        versions=args.versions,
+    )
+
+    root = unipath(tempfile.mkdtemp())
+    construct.init(root=root, logging=LOGGING)
+    construct.extensions.register(BenchHost)
+    try:
+        st = default_timer()
+        project, workspaces = build_tree(root, **params)
+        print('built %d workspaces in %.2fs: %s' % (
+            len(workspaces), default_timer() - st, project.path
+        ))
+        results = run_benchmarks(project, workspaces, args.repeat)
+    finally:
+        construct.uninit()
+        if args.keep:
+            print('kept project tree: ' + root)
+        else:
+            shutil.rmtree(root)
+
+    record = dict(
+        timestamp=datetime.datetime.utcnow().isoformat(),
+        commit=get_commit(),
+        python=platform.python_version(),
+        platform=sys.platform,
+        params=params,
+        results=results,
+    )
+    previous = load_previous(args.output, params)
+    save_record(args.output, record)
+    if previous:
+        print_comparison(previous, results)
+
+
+if __name__ == '__main__':
+    main()
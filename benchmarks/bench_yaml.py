@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+'''
+Compare parse times of a large studio config using the vendored pure python
+yaml package and the yaml backend selected by construct.yamlutils.
+
+Usage:
+    python benchmarks/bench_yaml.py [--projects 200] [--repeat 5]
+'''
+from __future__ import absolute_import, division, print_function
+import argparse
+from timeit import default_timer
+from construct import yamlutils
+from construct.constants import DEFAULT_CONFIG
+from construct.vendor import yaml as vendored_yaml
+
+
+def build_studio_config(projects):
+    '''Build a config resembling a studio config with many projects'''
+
+    config = yamlutils.load_file(DEFAULT_CONFIG)
+    config['PROJECTS'] = {}
+    for i in range(projects):
+        config['PROJECTS']['project_%03d' % i] = {
+            'ROOT': '/mnt/projects/project_%03d' % i,
+            'FPS': 24.0,
+            'RESOLUTION': [1920, 1080],
+            'PATH_TEMPLATES': {
+                'shot_%03d' % j: '{project}/shots/{sequence}/{shot}/%03d' % j
+                for j in range(20)
+            },
+            'STATUSES': dict(config.get('STATUSES', {})),
+        }
+    return yamlutils.safe_dump(config)
+
+
+def best_of(repeat, fn, *args):
+    times = []
+    for _ in range(repeat):
+        st = default_timer()
+        fn(*args)
+        times.append(default_timer() - st)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(__doc__)
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = build_studio_config(args.projects)
+    print('config size: %d KB' % (len(text) // 1024))
+
+    vendored = best_of(args.repeat, vendored_yaml.safe_load, text)
+    print('vendored yaml:  %.4fs' % vendored)
+
+    if yamlutils.HAS_LIBYAML:
+        fast = best_of(args.repeat, yamlutils.safe_load, text)
+        print('libyaml:        %.4fs (%.1fx)' % (fast, vendored / fast))
+    else:
+        print('libyaml:        unavailable, install pyyaml with libyaml')
+
+
+if __name__ == '__main__':
+    main()
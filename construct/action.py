@@ -6,6 +6,7 @@ __all__ = [
     'ActionCollector',
     'ActionProxy',
     'get_action_identifier',
+    'get_context_signature',
     'group_actions',
     'is_action',
     'is_action_type',
@@ -20,12 +21,14 @@ from construct import types, actionparams, signals
 from construct.compat import basestring
 from construct.constants import ACTION_SIGNALS
 from construct.utils import missing, classproperty
+from construct.models import is_entry
 from construct.actionrunner import ActionRunner
 from construct.tasks import sort_tasks, CtxAction
 from construct.errors import ActionUnavailable
 
 
 _log = logging.getLogger(__name__)
+COLLECTOR_CACHE_SIZE = 256
 
 
 class Action(types.ABC):
@@ -141,12 +144,8 @@ class Action(types.ABC):
         params = self.params(ctx)
         actionparams.validate(params)
 
-        # Combine kwargs with action parameter defaults
-        action_kwargs = actionparams.get_defaults(params)
-        action_kwargs.update(kwargs)
-
-        # Create action context
-        self.ctx = ActionContext(self, args, action_kwargs, ctx)
+        # Create action context, defaults are computed for missing kwargs
+        self.ctx = ActionContext(self, args, kwargs, ctx, params)
 
         # Validate kwargs against params
         actionparams.validate_kwargs(params, self.ctx.kwargs)
@@ -206,6 +205,7 @@ class ActionCollector(object):
 
     def __init__(self, extension_collector):
         self._extensions = extension_collector
+        self._cache = OrderedDict()
 
     def __iter__(self):
         for action in sort_actions(self.collect().values()):
@@ -217,15 +217,22 @@ class ActionCollector(object):
     def get(self, identifier, ctx=None):
         from construct.api import get_context
         ctx = ctx or get_context()
-        try:
-            action = self.collect(missing)[identifier]
-        except KeyError:
+
+        # Only extensions declaring the action are loaded
+        action = None
+        for extension in self._extensions:
+            if extension.enabled and extension.has_action(identifier):
+                action = extension.get_actions().get(identifier)
+                if action:
+                    break
+
+        if action is None:
             _log.error('Action not found: %s', identifier)
             return
-        else:
-            if not action._available(ctx):
-                raise ActionUnavailable('Action unavaibale in current context')
-            return action
+
+        if not action._available(ctx):
+            raise ActionUnavailable('Action unavaibale in current context')
+        return action
 
     def collect(self, ctx=None):
         '''Collect all actions in the given context. If no context is provided
@@ -240,6 +247,9 @@ class ActionCollector(object):
 
         from construct.api import get_context
         ctx = ctx or get_context()
+        return dict(self._cached(('actions',), ctx, self._collect, ctx))
+
+    def _collect(self, ctx):
         actions = {}
         for name, extension in self._extensions.by_name.items():
             if extension.enabled and extension._available(ctx):
@@ -269,15 +279,53 @@ class ActionCollector(object):
         from construct.api import get_context
         ctx = ctx or get_context()
         identifier = get_action_identifier(action_or_identifier)
-
+        return list(self._cached(
+            ('tasks', identifier),
+            ctx,
+            self._collect_tasks,
+            identifier,
+            ctx,
+        ))
+
+    def _collect_tasks(self, identifier, ctx):
         tasks = []
         for name, extension in self._extensions.by_name.items():
-            if extension.enabled and extension._available(ctx):
+            if (
+                extension.enabled and
+                extension.has_tasks(identifier) and
+                extension._available(ctx)
+            ):
                 more_tasks = extension.get_tasks(identifier, ctx)
                 tasks.extend(more_tasks)
 
         return sort_tasks(tasks)
 
+    def _cached(self, name, ctx, fn, *args):
+        '''Get the result of fn(*args) from an LRU cache of
+        COLLECTOR_CACHE_SIZE results. Results are keyed by name, the version
+        of the extension registry and the signature of ctx.'''
+
+        signature = get_context_signature(ctx)
+        if signature is None:
+            return fn(*args)
+
+        key = (name, self._extensions.version, signature)
+        result = self._cache.pop(key, missing)
+        if result is missing:
+            result = fn(*args)
+
+        self._cache[key] = result
+        while len(self._cache) > COLLECTOR_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+        return result
+
+    def clear_cache(self):
+        '''Clear cached action and task collections. Only needed when the
+        availability of actions depends on more than the Context keys.'''
+
+        self._cache.clear()
+
 
 class ActionProxy(object):
     '''Proxy object that allows you to call Actions as if they were functions.
@@ -309,6 +357,32 @@ class ActionProxy(object):
         return a._returns()
 
 
+def get_context_signature(ctx):
+    '''Get a hashable summary of the Context keys that Action, Task and
+    Extension availability depend on. Entries are summarized by their path.
+
+    Returns:
+        tuple or None if a value in ctx is not hashable
+    '''
+
+    if ctx is None:
+        return ()
+
+    signature = []
+    for key in ctx.keys:
+        value = getattr(ctx, key, None)
+        if is_entry(value):
+            value = value.path
+        signature.append(value)
+    signature = tuple(signature)
+
+    try:
+        hash(signature)
+    except TypeError:
+        return None
+    return signature
+
+
 def sort_actions(actions):
     '''Sort the given actions by identifier'''
 
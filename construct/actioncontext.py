@@ -2,13 +2,14 @@
 from __future__ import absolute_import
 from construct.context import Context
 from construct.tasks import group_tasks
+from construct.stats import Stats
 from construct import types, actionparams
 from construct.constants import WAITING
 
 
 class ActionContext(Context):
 
-    def __init__(self, action, args, kwargs, ctx=None):
+    def __init__(self, action, args, kwargs, ctx=None, params=None):
         from construct.api import actions, get_context
 
         if ctx is None:
@@ -24,6 +25,9 @@ class ActionContext(Context):
         self.requests = {}
         self.artifacts = types.Namespace()
         self.store = types.Namespace()
+        self.stats = Stats(self)
         self.args = args
-        self.kwargs = actionparams.get_defaults(action.params(ctx))
-        self.kwargs.update(kwargs)
+        if params is None:
+            params = action.params(ctx)
+        self.kwargs = dict(kwargs)
+        self.kwargs.update(actionparams.get_defaults(params, kwargs))
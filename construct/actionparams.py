@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
-__all__ = ['validate', 'validate_kwargs', 'get_defaults']
+__all__ = ['validate', 'validate_kwargs', 'get_defaults', 'deferred']
 
 import string
 from construct.errors import ParameterError, ArgumentError
@@ -14,6 +14,34 @@ OPTIONS = ['type', 'label', 'default', 'required', 'options']
 VALID_CHARACTERS = string.ascii_lowercase + string.digits + '_'
 
 
+class deferred(object):
+    '''Defer computing a parameter's default or options until they are
+    needed. Use this for values that require I/O like scanning a directory
+    or querying a host. The wrapped function is called at most once.
+
+    >>> params['version']['default'] = deferred(get_next_version, name, ext)
+
+    Defaults are only computed when an Action is created without a value for
+    the parameter, options are only computed when validating a value.
+    '''
+
+    def __init__(self, fn, *args, **kwargs):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.computed = False
+        self.value = None
+
+    def __repr__(self):
+        return '<deferred>(%s)' % getattr(self.fn, '__name__', self.fn)
+
+    def __call__(self):
+        if not self.computed:
+            self.value = self.fn(*self.args, **self.kwargs)
+            self.computed = True
+        return self.value
+
+
 def validate(parameters):
     '''Validate Action parameters dict
 
@@ -110,6 +138,8 @@ def validate_kwargs(parameters, kwargs):
         type_ = options['type']
         value = kwargs.get(name, None)
         valid_values = options.get('options', None)
+        if callable(valid_values) and value is not None:
+            valid_values = valid_values()
 
         if value is None and required:
             raise ArgumentError(f('Missing required argument: {name}'))
@@ -135,8 +165,9 @@ def validate_kwargs(parameters, kwargs):
     return True
 
 
-def get_defaults(parameters):
-    '''Extract default values from parameters dict.
+def get_defaults(parameters, kwargs=None):
+    '''Extract default values from parameters dict. Callable defaults, like
+    :class:`deferred`, are only called for parameters missing from kwargs.
 
     >>> parameters = {'arg': {'name': 'Arg', 'default': 1.0}}
     >>> get_defaults(parameters)
@@ -144,19 +175,22 @@ def get_defaults(parameters):
 
     Arguments:
         parameters (dict): describes parameters of a callable:
+        kwargs (dict): values already provided, defaults are skipped for
+            parameters with a value other than None
 
     Returns:
         dict: Containing name, default value pairs
     '''
 
+    kwargs = kwargs or {}
     defaults = {}
     for name, options in parameters.items():
-        try:
-            default = options['default']
-            if callable(default):
-                default = default()
-            defaults[name] = default
-        except KeyError:
+        if kwargs.get(name, None) is not None or 'default' not in options:
             continue
 
+        default = options['default']
+        if callable(default):
+            default = default()
+        defaults[name] = default
+
     return defaults
@@ -1,10 +1,12 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
-__all__ = ['TaskGroup', 'ActionRunner']
+__all__ = ['TaskGroup', 'ActionRunner', 'ThreadPoolActionRunner']
 
 import logging
 import six
+from collections import defaultdict
+from concurrent import futures
 from construct.types import Stack
 from construct import signals
 from construct.constants import *
@@ -18,11 +20,13 @@ from construct.errors import (
     Skip,
     Disable
 )
-from construct.tasks import AsyncRequest
+from construct.tasks import AsyncRequest, wait_any
 from construct.compat import basestring
 
 
 _log = logging.getLogger(__name__)
+READY = 'READY'
+DONE = 'DONE'
 
 
 class ActionLogger(object):
@@ -198,161 +202,220 @@ class ActionRunner(object):
 
         return self.ctx.requests[task.identifier]
 
-    def _process_waiting(self):
-        '''Process waiting tasks'''
+    def _watch(self, request):
+        '''Register a request to be re-evaluated when the requests it
+        depends on change status.'''
 
-        nwaiting = len(self._waiting)
-        for _ in range(nwaiting):
+        dependencies = request.task.dependencies()
+        if dependencies is None:
+            # Opaque predicates are re-evaluated whenever any request changes
+            self._watch_all.append(request)
+        else:
+            for identifier in dependencies:
+                self._dependents[identifier].append(request)
+
+    def _wake(self, request):
+        '''Queue a request for evaluation'''
+
+        if self._state.get(request) in (WAITING, SKIPPED, None):
+            if request not in self._woken:
+                self._woken.add(request)
+                self._wake_queue.push(request)
+
+    def _notify(self, request, state=None):
+        '''Wake the requests depending on request after it's status has
+        changed.'''
+
+        self._state[request] = state or request.status
+        identifier = request.task.identifier
+        for dependent in self._dependents.get(identifier, []):
+            self._wake(dependent)
+        for dependent in self._watch_all:
+            self._wake(dependent)
 
-            request = self._waiting.pop()
-            task = request.task
+    def _evaluate(self, request):
+        '''Evaluate the requires and skips predicates of a request'''
 
-            if not request.enabled:
-                self._disabled.push(request)
+        self._woken.discard(request)
+        task = request.task
+        state = self._state.get(request)
 
-            elif task.ready(self.ctx):
+        if state == SKIPPED:
+            # Skipped requests run when their requirements are met later on
+            if task.ready(self.ctx):
+                self._skipped.remove(request)
+                self._state[request] = READY
                 self._ready.push(request)
 
-            elif task.skip(self.ctx):
-                request.set_status(SKIPPED)
-                self._skipped.push(request)
+        elif not request.enabled:
+            self._state[request] = DISABLED
+            self._disabled.push(request)
 
-            else:
-                self._waiting.push(request)
+        elif task.ready(self.ctx):
+            self._state[request] = READY
+            self._ready.push(request)
 
-    def _process_ready(self):
-        '''Process ready tasks'''
+        elif task.skip(self.ctx):
+            request.set_status(SKIPPED)
+            self._skipped.push(request)
+            self._notify(request)
 
-        nready = len(self._ready)
-        for _ in range(nready):
+        else:
+            self._state[request] = WAITING
 
-            request = self._ready.pop()
-            task = request.task
+    def _process_request(self, request, timeout=None):
+        '''Run a ready request or collect the result of a running
+        AsyncRequest. Returns False when an AsyncRequest is still running.'''
 
-            if task.skip(self.ctx):
-                request.set_status(SKIPPED)
-                self._skipped.push(request)
-                continue
+        task = request.task
 
-            try:
+        if self._state.get(request) == READY and task.skip(self.ctx):
+            request.set_status(SKIPPED)
+            self._skipped.push(request)
+            self._notify(request)
+            return True
 
-                get_kwargs = {'propagate': True}
-                if isinstance(request, AsyncRequest):
-                    get_kwargs['timeout'] = 0
+        self._state[request] = RUNNING
 
-                result = request.get(**get_kwargs)
+        try:
 
-            except TimeoutError:
+            get_kwargs = {'propagate': True}
+            if isinstance(request, AsyncRequest):
+                get_kwargs['timeout'] = timeout
 
-                # AsyncRequest timed out, push it back onto the ready stack
-                # and check it again next time around
-                self._ready.push(request)
+            result = request.get(**get_kwargs)
 
-            except ValidationError:
+        except TimeoutError:
 
-                # Task failed to validate, future tasks can handle this
-                # tasks validation errors by requiring failure of this task
-                # and receiving the result of this task as a parameter
-                self._fail_request(request)
+            # AsyncRequest is still running, it's result will be collected
+            # once there is nothing else left to run
+            self._running.push(request)
+            return False
 
-            except Fail:
+        except ValidationError:
 
-                # Task failed but does not want to stop execution
-                self._fail_request(request)
+            # Task failed to validate, future tasks can handle this
+            # tasks validation errors by requiring failure of this task
+            # and receiving the result of this task as a parameter
+            self._fail_request(request)
 
-            except Abort:
+        except Fail:
 
-                # Task explicitly sent Abort Error
-                self._fail_request(request)
-                raise
+            # Task failed but does not want to stop execution
+            self._fail_request(request)
 
-            except Pause:
+        except Abort:
 
-                # Task wants to paused execution of the Action
-                self._success.push(request)
-                self.ctx.results[task.identifier] = result
-                raise
+            # Task explicitly sent Abort Error
+            self._fail_request(request)
+            raise
 
-            except Confirm:
+        except Pause:
 
-                # Task has requested user confirmation
-                self._fail_request(request)
+            # Task wants to paused execution of the Action
+            self._success.push(request)
+            self.ctx.results[task.identifier] = result
+            raise
 
-                # TODO: Get user input on Confirm
-                raise NotImplementedError(
-                    'Confirm error handling not yet implemented'
-                )
+        except Confirm:
 
-            except Skip:
+            # Task has requested user confirmation
+            self._fail_request(request)
 
-                # Task wants to skip
-                self._skipped.push(request)
-                request.set_status(SKIPPED)
+            # TODO: Get user input on Confirm
+            raise NotImplementedError(
+                'Confirm error handling not yet implemented'
+            )
 
-            except Disable:
+        except Skip:
 
-                # Task wants to skip
-                self._waiting.push(request)
-                request.set_enabled(False)
-                request.set_status(DISABLED)
+            # Task wants to skip
+            self._skipped.push(request)
+            request.set_status(SKIPPED)
 
-            except Exception:
+        except Disable:
 
-                # Propagate unrecognized exceptions
-                self._fail_request(request)
-                raise
+            # Task wants to be disabled
+            self._disabled.push(request)
+            request.set_enabled(False)
+            request.set_status(DISABLED)
 
-            else:
+        except Exception:
 
-                # Maybe add support for generator tasks here
-                # The implementation would be a task that is a generator
-                # that yields instances of other tasks
-                # Each task yielded would be added to the _waiting stack
-                # for future processing
-                self._success.push(request)
-                self.ctx.results[task.identifier] = result
+            # Propagate unrecognized exceptions
+            self._fail_request(request)
+            raise
 
-            finally:
+        else:
 
-                # Perform any teardown necessary
-                pass
+            # Maybe add support for generator tasks here
+            # The implementation would be a task that is a generator
+            # that yields instances of other tasks
+            # Each task yielded would be added to the _waiting stack
+            # for future processing
+            self._success.push(request)
+            self.ctx.results[task.identifier] = result
 
-    def _process_skipped(self):
+        self._notify(request, DONE)
+        return True
 
-        for _ in range(len(self._skipped)):
-            request = self._skipped.pop()
-            task = request.task
+    def _can_dispatch(self):
+        '''Returns True when another ready request can be dispatched'''
 
-            if task.ready(self.ctx):
-                self._ready.push(request)
-            else:
-                self._skipped.push(request)
+        return True
 
-    def _skip_waiting(self):
+    def _dispatch(self, request):
+        '''Run a ready request'''
 
-        nwaiting = len(self._waiting)
-        for _ in range(nwaiting):
-            request = self._waiting.pop()
-            task = request.task
+        self._process_request(request, timeout=0)
 
-            if task.ready(self.ctx):
-                self._ready.push(request)
-            else:
-                request.set_status(SKIPPED)
-                self._skipped.push(request)
+    def _collect(self):
+        '''Wait for a running request to finish. Returns False when there are
+        no running requests.'''
+
+        if not self._running:
+            return False
+
+        for request in wait_any(self._running):
+            self._running.remove(request)
+            self._process_request(request, timeout=None)
+
+        return True
 
     def _run_once(self, propagate=True):
+        '''Run the requests in the waiting stack.
+
+        Each request is evaluated once up front, afterwards a request is only
+        re-evaluated when a request it depends on changes status. Requests
+        that are still waiting when nothing is left to run are skipped.
+        '''
+
+        requests = [self._waiting.pop() for _ in range(len(self._waiting))]
+        self._dependents = defaultdict(list)
+        self._watch_all = []
+        self._state = {}
+        self._woken = set()
+        self._wake_queue = Stack()
+        self._running = Stack()
+
+        for request in requests:
+            self._watch(request)
+            self._wake(request)
 
         while True:
 
-            self._process_waiting()
+            while self._wake_queue:
+                self._evaluate(self._wake_queue.pop())
 
-            if not self._ready:
-                self._skip_waiting()
-                return
+            if self._ready and self._can_dispatch():
+                self._dispatch(self._ready.pop())
+            elif not self._collect():
+                break
 
-            self._process_ready()
-            self._process_skipped()
+        for request in requests:
+            if self._state.get(request) == WAITING:
+                request.set_status(SKIPPED)
+                self._skipped.push(request)
 
     def retry_group(self, priority):
         '''Retry TaskGroup of priority'''
@@ -368,20 +431,22 @@ class ActionRunner(object):
 
         if group.waiting:
 
-            signals.send('group.before', group)
-            group.push()
-            group.set_status(RUNNING)
+            with self.ctx.stats.collect():
 
-            try:
+                signals.send('group.before', group)
+                group.push()
+                group.set_status(RUNNING)
 
-                self._run_once()
+                try:
 
-            finally:
+                    self._run_once()
 
-                if not group.failed:
-                    group.set_status(SUCCESS)
+                finally:
 
-                signals.send('group.after', group)
+                    if not group.failed:
+                        group.set_status(SUCCESS)
+
+                    signals.send('group.after', group)
 
         else:
 
@@ -391,14 +456,81 @@ class ActionRunner(object):
         '''Run all TaskGroups of the action sequentially'''
 
         self._logger.connect()
-        signals.send('action.before', self.ctx)
 
-        try:
+        with self.ctx.stats.collect():
 
-            for priority in self.ctx.priorities:
-                self.run_group(priority)
+            signals.send('action.before', self.ctx)
 
-        finally:
+            try:
+
+                for priority in self.ctx.priorities:
+                    self.run_group(priority)
+
+            finally:
+
+                signals.send('action.after', self.ctx)
+                self._logger.disconnect()
+
+
+class ThreadPoolActionRunner(ActionRunner):
+    '''ActionRunner that runs ready requests concurrently using a pool of
+    threads. Actions opt in by setting their runner_cls attribute.
+
+    Examples:
+
+        class CopyFiles(Action):
+            ...
+            runner_cls = ThreadPoolActionRunner
 
-            signals.send('action.after', self.ctx)
-            self._logger.disconnect()
+    Attributes:
+        max_workers (int): Maximum number of requests to run at once
+    '''
+
+    max_workers = 4
+
+    def __init__(self, action, ctx, logger=ActionLogger):
+        super(ThreadPoolActionRunner, self).__init__(action, ctx, logger)
+        self.max_workers = getattr(action, 'max_workers', self.max_workers)
+        self._executor = None
+        self._futures = {}
+
+    def _can_dispatch(self):
+        return len(self._futures) < self.max_workers
+
+    def _dispatch(self, request):
+
+        if isinstance(request, AsyncRequest) or request.task.skip(self.ctx):
+            return super(ThreadPoolActionRunner, self)._dispatch(request)
+
+        # Request.get pushes the request and it's context onto the worker
+        # thread's stacks. Results are handled in this thread once the
+        # request is done.
+        self._state[request] = RUNNING
+        future = self._executor.submit(request.get, propagate=False)
+        self._futures[request] = future
+
+    def _collect(self):
+
+        if not self._futures:
+            return super(ThreadPoolActionRunner, self)._collect()
+
+        pending = list(self._futures) + list(self._running)
+        for request in wait_any(pending):
+            if request in self._futures:
+                self._futures.pop(request)
+            else:
+                self._running.remove(request)
+            self._process_request(request, timeout=None)
+
+        return True
+
+    def _run_once(self, propagate=True):
+
+        self._futures = {}
+        executor = futures.ThreadPoolExecutor(self.max_workers)
+        self._executor = executor
+        try:
+            super(ThreadPoolActionRunner, self)._run_once(propagate)
+        finally:
+            self._executor = None
+            executor.shutdown(wait=True)
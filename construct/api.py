@@ -2,13 +2,21 @@
 from __future__ import absolute_import
 
 import os
+import sys
+import six
 import fsfs
 import logging
+from fsfs import channels
+from contextlib import contextmanager
 from logging.config import dictConfig
-from itertools import chain
-from construct.vendor import lucidity, yaml
-from construct.context import _ctx_stack, _req_stack, Context
-from construct.config import Config
+from construct.vendor import lucidity
+from construct.context import (
+    _ctx_stack,
+    _req_stack,
+    Context,
+    clear_path_cache,
+)
+from construct.config import Config, load_config
 from construct.extension import ExtensionCollector, Extension, HostExtension
 from construct.action import Action, ActionCollector, ActionProxy
 from construct.constants import DEFAULT_LOGGING
@@ -16,6 +24,7 @@ from construct.actioncontext import ActionContext
 from construct.utils import unipath, ensure_instance
 from construct.stats import log_call
 from construct.errors import TemplateError
+from construct import entryindex, templateregistry, yamlutils
 
 __all__ = [
     'Context',
@@ -38,6 +47,10 @@ __all__ = [
     'get_request',
     'search',
     'quick_select',
+    'reindex',
+    'migrate_logs',
+    'batch',
+    'bulk_write',
     'get_path_template',
     'get_path_templates',
     'get_template_search_paths',
@@ -51,8 +64,11 @@ __all__ = [
     'new_project',
     'new_sequence',
     'new_shot',
+    'new_shots',
     'new_asset',
+    'new_assets',
     'new_task',
+    'new_tasks',
     'new_workspace',
     'new_template',
     'publish',
@@ -69,6 +85,7 @@ config = Config()
 config_file = None
 extensions = ExtensionCollector()
 actions = ActionCollector(extensions)
+_path_templates = {}
 
 
 @log_call
@@ -83,9 +100,8 @@ def init(root=None, host=None, extension_paths=None, logging=None):
     global config_file
     config_file = os.environ.get('CONSTRUCT_CONFIG')
     if config_file:
-        with open(config_file, 'r') as f:
-            config_data = yaml.safe_load(f.read())
-        config.update(config_data)
+        config.update(load_config(config_file))
+    config.invalidate()
 
     # Configure logging
     dictConfig(logging or config.get('LOGGING', DEFAULT_LOGGING))
@@ -102,6 +118,10 @@ def init(root=None, host=None, extension_paths=None, logging=None):
     fsfs.set_entry_factory(factory)
     fsfs.set_data_root(FSFS_DATA_ROOT)
     fsfs.set_data_file(FSFS_DATA_FILE)
+    fsfs.set_data_encoder(yamlutils.safe_dump)
+    fsfs.set_data_decoder(yamlutils.safe_load)
+    entryindex.connect()
+    channels.EntryDataChanged.connect(_on_entry_data_changed)
 
     # Setup initial context
     global _context
@@ -151,12 +171,16 @@ def uninit():
     global _context
     _log.debug('Clearing context...')
     _context = None
+    clear_path_cache()
+    templateregistry.clear_registries()
 
     _log.debug('Removing all extensions...')
     extensions.clear()
 
     _log.debug('Restoring default fsfs policy...')
     fsfs.set_default_policy()
+    entryindex.disconnect()
+    channels.EntryDataChanged.disconnect(_on_entry_data_changed)
 
     _log.debug('Uninitialized!')
     _initialized = False
@@ -169,6 +193,15 @@ def set_context(ctx):
 
     global _context
     _context = ctx
+    config.invalidate()
+
+
+def _on_entry_data_changed(entry, data):
+    '''Invalidate config when the project in context is written'''
+
+    project = _context.project if _context else None
+    if project and unipath(entry.path) == unipath(project.path):
+        config.invalidate()
 
 
 @log_call
@@ -178,6 +211,7 @@ def set_context_from_entry(entry):
     global _context
     new_context = Context.from_path(entry.path)
     _context.update(new_context, exclude=['host', 'root'])
+    config.invalidate()
 
 
 @log_call
@@ -187,6 +221,7 @@ def set_context_from_path(path):
     global _context
     new_context = Context.from_path(path)
     _context.update(new_context, exclude=['host', 'root'])
+    config.invalidate()
 
 
 @log_call
@@ -270,30 +305,49 @@ def get_file_type(file):
 def get_path_template(name):
     '''Get one of the current projects templates by name'''
 
-    return lucidity.Template(name, config['PATH_TEMPLATES'][name], anchor=None)
+    return _get_path_template(name, config['PATH_TEMPLATES'][name])
 
 
 @log_call
 def get_path_templates():
     '''Get a dict containining the current projects templates'''
 
-    return {k: lucidity.Template(k, v, anchor=None)
-            for k, v in config['PATH_TEMPLATES']}
+    return {k: _get_path_template(k, v)
+            for k, v in config['PATH_TEMPLATES'].items()}
+
+
+def _get_path_template(name, pattern):
+    '''Get a compiled lucidity.Template from the path template cache. The
+    cache is keyed by name and pattern so templates are rebuilt whenever the
+    configured pattern changes.'''
+
+    key = (name, pattern)
+    if key not in _path_templates:
+        _path_templates[key] = lucidity.Template(name, pattern, anchor=None)
+    return _path_templates[key]
 
 
 @log_call
 def get_template_search_paths():
+    '''Get existing template search paths, project templates first followed
+    by the template paths of each extension.'''
+
+    return [p for p in _get_template_search_paths() if os.path.isdir(p)]
+
 
+def _get_template_search_paths():
     ctx = get_context()
 
-    paths = set()
+    paths = []
     if ctx.project:
-        paths.add(unipath(ctx.project.data.path, 'templates'))
+        paths.append(unipath(ctx.project.data.path, 'templates'))
 
     for ext in extensions:
-        paths.update(ext._template_paths)
+        for path in ext._template_paths:
+            if path not in paths:
+                paths.append(path)
 
-    return [p for p in paths if os.path.isdir(p)]
+    return paths
 
 
 @log_call
@@ -318,28 +372,25 @@ def get_template(name, *tags):
 
 @log_call
 def get_templates(*tags):
-    '''Get all templates matching a set of tags.'''
+    '''Get all templates matching a set of tags. Templates are looked up in
+    a :class:`TemplateRegistry` cached per list of search paths.'''
 
-    entries = chain(*(
-        fsfs.search(path, depth=1).tags(*tags)
-        for path in get_template_search_paths()
-    ))
-
-    templates = {}
-    for template in entries:
-        if template.name in templates:
-            continue
-        templates[template.name] = template
-
-    return templates
+    registry = templateregistry.get_registry(_get_template_search_paths())
+    return registry.get_templates(*tags)
 
 
 @log_call
 def search(name=None, tags=None, **kwargs):
-    '''Search for Construct Entries by name or tag'''
+    '''Search for Construct Entries by name or tag
+
+    When searching down from a root within an indexed project the project's
+    entry index is queried instead of walking the filesystem. Pass
+    use_index=False to force a filesystem walk.
+    '''
 
     ctx = get_context()
     root = kwargs.pop('root', None)
+    use_index = kwargs.pop('use_index', True)
 
     if root is None:
         entry = ctx.get_deepest_entry()
@@ -348,7 +399,19 @@ def search(name=None, tags=None, **kwargs):
         else:
             root = ctx.root or os.getcwd()
 
-    entries = fsfs.search(root, **kwargs)
+    entry_index = None
+    if use_index and kwargs.get('direction', fsfs.DOWN) == fsfs.DOWN:
+        entry_index = entryindex.find_index(root)
+
+    if entry_index:
+        entries = entry_index.search(
+            root,
+            levels=kwargs.get('levels', None),
+            skip_root=kwargs.get('skip_root', False),
+        )
+    else:
+        entries = fsfs.search(root, **kwargs)
+
     if name:
         entries = entries.name(name)
     if tags:
@@ -363,6 +426,7 @@ def quick_select(selector, **kwargs):
 
     ctx = get_context()
     root = kwargs.pop('root', None)
+    use_index = kwargs.pop('use_index', True)
 
     if root is None:
         entry = ctx.get_deepest_entry()
@@ -371,6 +435,15 @@ def quick_select(selector, **kwargs):
         else:
             root = ctx.root or os.getcwd()
 
+    if use_index:
+        entry_index = entryindex.find_index(root)
+        if entry_index:
+            return entry_index.quick_select(
+                root,
+                selector,
+                skip_root=kwargs.get('skip_root', False)
+            )
+
     first_depth = 5 if ctx.project else 3
     if ctx.project:
         first_depth = 4
@@ -378,14 +451,107 @@ def quick_select(selector, **kwargs):
     return fsfs.quick_select(root, selector, first_depth=first_depth)
 
 
+@log_call
+def reindex(root=None):
+    '''Rebuild the entry index of a project. Defaults to the current project.
+
+    Returns:
+        EntryIndex
+    '''
+
+    if root is None:
+        ctx = get_context()
+        if not ctx.project:
+            raise RuntimeError('No project in context, pass a root to index.')
+        root = ctx.project.path
+
+    entry_index = entryindex.get_index(root)
+    entry_index.rebuild()
+    return entry_index
+
+
+@log_call
+def migrate_logs(root=None):
+    '''Move comments stored in the data of Entries created by older versions
+    to their append logs. Defaults to the current project.
+
+    Returns:
+        list of migrated Entries
+    '''
+
+    if root is None:
+        ctx = get_context()
+        if not ctx.project:
+            raise RuntimeError('No project in context, pass a root.')
+        root = ctx.project.path
+
+    migrated = []
+    for entry in fsfs.search(root):
+        if entry.migrate_logs():
+            migrated.append(entry)
+    return migrated
+
+
+@contextmanager
+def batch(*entries):
+    '''Batch reads and writes of many entries. Each entry's data file is
+    written once when the batch exits. See :meth:`models.Entry.batch`.
+
+    Examples:
+        >>> with construct.batch(*shots):  # doctest: +SKIP
+        ...     for shot in shots:
+        ...         shot.set_status('complete')
+        ...         shot.write(frame_range=[1001, 1100])
+    '''
+
+    entries = list(entries)
+    for entry in entries:
+        entry._begin_batch()
+
+    commit = False
+    try:
+        yield entries
+        commit = True
+    finally:
+        # End every batch even if flushing one of the entries fails
+        exc_info = None
+        for entry in entries:
+            try:
+                entry._end_batch(commit)
+            except Exception:
+                exc_info = exc_info or sys.exc_info()
+        if exc_info:
+            six.reraise(*exc_info)
+
+
+@log_call
+def bulk_write(entries, replace=False, **data):
+    '''Write the same data to many entries, flushing each data file once.
+
+    Arguments:
+        entries (list): Entries to write to
+        replace (bool): Replace all data instead of updating it
+        **data: key, value pairs to write to each Entry's data
+    '''
+
+    entries = list(entries)
+    with batch(*entries):
+        for entry in entries:
+            entry.write(replace, **data)
+    return entries
+
+
 # Builtin Action Aliases
 
 new_project = ActionProxy('new.project')
 new_sequence = ActionProxy('new.sequence')
 new_shot = ActionProxy('new.shot')
+new_shots = ActionProxy('new.shots')
 new_asset_type = ActionProxy('new.asset_type')
 new_asset = ActionProxy('new.asset')
+new_assets = ActionProxy('new.assets')
 new_task = ActionProxy('new.task')
+new_tasks = ActionProxy('new.tasks')
 new_workspace = ActionProxy('new.workspace')
 new_template = ActionProxy('new.template')
 save = ActionProxy('save')
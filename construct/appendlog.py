@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+'''
+Append-only JSON-lines logs used to store Entry history like comments and
+versions. Appending a record writes one line instead of re-serializing the
+whole history, and records can be read oldest or latest first without loading
+the entire file.
+'''
+from __future__ import absolute_import
+
+__all__ = [
+    'AppendLog',
+]
+
+import os
+import io
+import json
+import datetime
+from itertools import islice
+from construct.utils import atomic_write
+
+
+DATETIME_KEY = '$datetime'
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+BLOCK_SIZE = 8192
+
+
+class AppendLog(object):
+    '''A file of JSON records, one per line.
+
+    Arguments:
+        path (str): Path to log file
+    '''
+
+    def __init__(self, path):
+        self.path = path
+
+    def __repr__(self):
+        return '<AppendLog>(%s)' % self.path
+
+    def __iter__(self):
+        return self.iter()
+
+    def __len__(self):
+        return sum(1 for _ in self._iter_lines())
+
+    @property
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def append(self, record):
+        '''Append a record to the log'''
+
+        self.extend([record])
+
+    def extend(self, records):
+        '''Append many records to the log'''
+
+        lines = u''.join(encode_record(r) + u'\n' for r in records)
+        if not lines:
+            return
+
+        with io.open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+
+    def replace(self, records):
+        '''Atomically replace all records in the log'''
+
+        lines = u''.join(encode_record(r) + u'\n' for r in records)
+        atomic_write(self.path, lines.encode('utf-8'), mode='wb')
+
+    def iter(self, latest_first=False):
+        '''Iterate over records
+
+        Arguments:
+            latest_first (bool): Yield the last appended records first
+        '''
+
+        if latest_first:
+            lines = self._iter_lines_reversed()
+        else:
+            lines = self._iter_lines()
+
+        for line in lines:
+            yield decode_record(line)
+
+    def read(self, latest_first=False, offset=0, limit=None):
+        '''Read a page of records
+
+        Arguments:
+            latest_first (bool): Read the last appended records first
+            offset (int): Number of records to skip
+            limit (int): Maximum number of records to return
+
+        Returns:
+            list of records
+        '''
+
+        stop = None if limit is None else offset + limit
+        return list(islice(self.iter(latest_first), offset, stop))
+
+    def _iter_lines(self):
+        if not self.exists:
+            return
+
+        with io.open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+
+    def _iter_lines_reversed(self):
+        '''Yield lines from the end of the file reading blocks backwards'''
+
+        if not self.exists:
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            remainder = b''
+            while position > 0:
+                size = min(BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                block = f.read(size) + remainder
+                lines = block.split(b'\n')
+                remainder = lines.pop(0)
+                for line in reversed(lines):
+                    line = line.strip()
+                    if line:
+                        yield line.decode('utf-8')
+
+            remainder = remainder.strip()
+            if remainder:
+                yield remainder.decode('utf-8')
+
+
+def encode_record(record):
+    '''Encode a record as a line of text'''
+
+    line = json.dumps(record, default=_encode_default, sort_keys=True)
+    if isinstance(line, bytes):
+        # Python 2 returns a byte str, which io.open text files reject
+        line = line.decode('utf-8')
+    return line
+
+
+def decode_record(line):
+    return json.loads(line, object_hook=_decode_object)
+
+
+def _encode_default(obj):
+    if isinstance(obj, datetime.datetime):
+        return {DATETIME_KEY: obj.strftime(DATETIME_FORMAT)}
+    raise TypeError('%r is not JSON serializable' % obj)
+
+
+def _decode_object(obj):
+    if len(obj) == 1 and DATETIME_KEY in obj:
+        return datetime.datetime.strptime(obj[DATETIME_KEY], DATETIME_FORMAT)
+    return obj
@@ -50,11 +50,21 @@ class Builtins(Extension):
         self.add_task(shots.NewShot, shots.validate_shot)
         self.add_task(shots.NewShot, shots.commit_shot)
 
+        self.add_action(shots.NewShots)
+        self.add_task(shots.NewShots, shots.stage_shots)
+        self.add_task(shots.NewShots, shots.validate_shots)
+        self.add_task(shots.NewShots, shots.commit_shots)
+
         self.add_action(assets.NewAsset)
         self.add_task(assets.NewAsset, assets.stage_asset)
         self.add_task(assets.NewAsset, assets.validate_asset)
         self.add_task(assets.NewAsset, assets.commit_asset)
 
+        self.add_action(assets.NewAssets)
+        self.add_task(assets.NewAssets, assets.stage_assets)
+        self.add_task(assets.NewAssets, assets.validate_assets)
+        self.add_task(assets.NewAssets, assets.commit_assets)
+
         self.add_action(assets.NewAssetType)
         self.add_task(assets.NewAssetType, assets.stage_asset_type)
         self.add_task(assets.NewAssetType, assets.validate_asset_type)
@@ -65,6 +75,11 @@ class Builtins(Extension):
         self.add_task(tasks.NewTask, tasks.validate_task)
         self.add_task(tasks.NewTask, tasks.commit_task)
 
+        self.add_action(tasks.NewTasks)
+        self.add_task(tasks.NewTasks, tasks.stage_tasks)
+        self.add_task(tasks.NewTasks, tasks.validate_tasks)
+        self.add_task(tasks.NewTasks, tasks.commit_tasks)
+
         self.add_action(workspaces.NewWorkspace)
         self.add_task(workspaces.NewWorkspace, workspaces.stage_workspace)
         self.add_task(workspaces.NewWorkspace, workspaces.validate_workspace)
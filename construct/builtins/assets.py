@@ -3,6 +3,8 @@ from __future__ import absolute_import
 import os
 from construct import api
 from construct.action import Action
+from construct.snapshots import copy_template
+from construct.builtins import bulk
 from construct.tasks import (
     task,
     pass_kwargs,
@@ -236,10 +238,77 @@ def commit_asset(asset_item):
     '''Make new asset'''
 
     if asset_item['template']:
-        asset = asset_item['template'].copy(asset_item['path'])
+        asset = copy_template(asset_item['template'], asset_item['path'])
     else:
         asset = fsfs.get_entry(asset_item['path'])
 
     asset.tag(*asset_item['tags'])
 
     return asset
+
+
+class NewAssets(Action):
+    '''Create many new Assets'''
+
+    label = 'New Assets'
+    identifier = 'new.assets'
+    returns = artifact('assets')
+
+    @staticmethod
+    def parameters(ctx):
+        params = NewAsset.parameters(ctx)
+        params.pop('name')
+        params['names'] = {
+            'label': 'Asset Names',
+            'required': True,
+            'type': bulk.NAMES_TYPE,
+            'help': 'Names of assets separated by commas'
+        }
+        return params
+
+    @staticmethod
+    def available(ctx):
+        return NewAsset.available(ctx)
+
+
+@task(priority=types.STAGE)
+@pass_kwargs
+@returns(store('asset_items'))
+def stage_assets(project, collection, asset_type, names, template=None):
+    '''Stage new Assets'''
+
+    path_template = api.get_path_template('asset')
+    template = bulk.get_template(template, 'asset')
+    return [
+        bulk.make_item(
+            name=name,
+            path=path_template.format(dict(
+                project=project.path,
+                collection=collection,
+                asset_type=asset_type,
+                asset=name
+            )),
+            tags=['asset'],
+            template=template,
+        )
+        for name in bulk.split_names(names)
+    ]
+
+
+@task(priority=types.VALIDATE)
+@requires(success('stage_assets'))
+@params(store('asset_items'))
+def validate_assets(asset_items):
+    '''Skip assets that already exist'''
+
+    return bulk.validate_items(asset_items)
+
+
+@task(priority=types.COMMIT)
+@requires(success('validate_assets'))
+@params(store('asset_items'))
+@returns(artifact('assets'))
+def commit_assets(asset_items):
+    '''Make new assets'''
+
+    return bulk.commit_items(asset_items)
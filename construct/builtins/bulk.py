@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+'''
+Shared helpers for Actions that create many Entries at once like new.shots,
+new.assets and new.tasks.
+
+Each Entry to create is described by an item dict with name, path, tags and
+template keys. Items are validated together and committed concurrently,
+items that fail store the reason in their error key without failing the
+rest of the items.
+'''
+from __future__ import absolute_import
+import os
+import re
+import logging
+from collections import defaultdict
+from concurrent import futures
+import fsfs
+from construct import api, types
+from construct.errors import Abort, TemplateError
+from construct.snapshots import get_snapshot
+
+
+_log = logging.getLogger(__name__)
+MAX_WORKERS = 8
+NAMES_TYPE = (str, types.Text, list, tuple)
+
+
+def split_names(names):
+    '''Split a string of names separated by commas or whitespace. Lists of
+    names are returned as is.'''
+
+    if isinstance(names, (list, tuple)):
+        return list(names)
+    return [n for n in re.split(r'[,\s]+', names) if n]
+
+
+def get_template(name, tag):
+    '''Get a template or None if the template does not exist'''
+
+    if not name:
+        return
+    try:
+        return api.get_template(name, tag)
+    except TemplateError:
+        return
+
+
+def make_item(name, path, tags, template=None):
+    return dict(
+        name=name,
+        path=path,
+        tags=tags,
+        template=template,
+        error=None,
+    )
+
+
+def iter_valid(items):
+    for item in items:
+        if not item['error']:
+            yield item
+
+
+def validate_items(items):
+    '''Mark items whose path already exists or is duplicated as failed. Lists
+    each parent directory once instead of checking each item's path.
+
+    Raises:
+        Abort: when no valid items remain
+    '''
+
+    by_parent = defaultdict(list)
+    for item in iter_valid(items):
+        parent, name = os.path.split(item['path'])
+        by_parent[parent].append((name, item))
+
+    for parent, children in by_parent.items():
+        try:
+            existing = set(os.listdir(parent))
+        except OSError:
+            existing = set()
+
+        for name, item in children:
+            if name in existing:
+                item['error'] = 'Already exists: ' + item['path']
+            existing.add(name)
+
+    if not any(iter_valid(items)):
+        raise Abort('No valid items to create: ' + ', '.join(
+            item['error'] for item in items
+        ))
+    return True
+
+
+def commit_item(item, snapshot):
+    if snapshot:
+        entry = snapshot.instantiate(item['path'], max_workers=1)
+    else:
+        entry = fsfs.get_entry(item['path'])
+
+    entry.tag(*item['tags'])
+    return entry
+
+
+def commit_items(items, max_workers=MAX_WORKERS):
+    '''Create Entries for all valid items concurrently. Each item writes
+    it's template snapshot in a single worker thread.
+
+    Returns:
+        list of new Entries in item order
+    '''
+
+    items = list(iter_valid(items))
+    snapshots = {}
+    for item in items:
+        template = item['template']
+        if template and template.path not in snapshots:
+            snapshots[template.path] = get_snapshot(template)
+
+    def commit(item):
+        template = item['template']
+        snapshot = snapshots[template.path] if template else None
+        return commit_item(item, snapshot)
+
+    entries = []
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = [(item, executor.submit(commit, item)) for item in items]
+        for item, future in results:
+            try:
+                entries.append(future.result())
+            except Exception as e:
+                _log.error('Failed to create %s: %s', item['name'], e)
+                item['error'] = str(e)
+
+    return entries
@@ -3,6 +3,7 @@ from __future__ import absolute_import
 import os
 from construct import api
 from construct.action import Action
+from construct.snapshots import copy_template
 from construct.tasks import (
     task,
     pass_kwargs,
@@ -115,7 +116,10 @@ def commit_collection(collection_item):
     '''Make new collection'''
 
     if collection_item['template']:
-        collection = collection_item['template'].copy(collection_item['path'])
+        collection = copy_template(
+            collection_item['template'],
+            collection_item['path'],
+        )
     else:
         collection = fsfs.get_entry(collection_item['path'])
 
@@ -15,6 +15,7 @@ from construct.tasks import (
     requires,
 )
 from construct.errors import Abort
+from construct.actionparams import deferred
 from construct import types, get_host, utils, get_path_template, get_file_type
 from construct.vendor.lucidity.error import ParseError
 
@@ -77,8 +78,11 @@ class Save(Action):
         params['ext']['options'] = extensions
         params['ext']['required'] = False
 
-        next_version = ctx.workspace.get_next_version(name, extension)
-        params['version']['default'] = next_version
+        params['version']['default'] = deferred(
+            ctx.workspace.get_next_version,
+            name,
+            extension,
+        )
         params['version']['required'] = False
         return params
 
@@ -105,14 +109,19 @@ def build_filename(workspace, name, version, ext):
 
 
 @task
+@pass_context
 @requires(success('build_filename'))
 @params(store('file'))
-def save_file(file):
+def save_file(ctx, file):
     '''Save file in Host application'''
 
     host = get_host()
     host.save_file(file)
 
+    workspace = ctx.kwargs.get('workspace')
+    if workspace:
+        workspace.add_work_file(file)
+
 
 class Open(Action):
     '''Open a file'''
@@ -200,8 +209,11 @@ class SaveNextVersion(Action):
         params['ext']['options'] = extensions
         params['ext']['required'] = False
 
-        next_version = ctx.workspace.get_next_version(name, extension)
-        params['version']['default'] = next_version
+        params['version']['default'] = deferred(
+            ctx.workspace.get_next_version,
+            name,
+            extension,
+        )
         params['version']['required'] = False
 
         return params
@@ -316,7 +328,7 @@ def save_next_workfile(ctx, publish_items):
         next_version = int(scene['scene_data']['version']) + 1
 
     # Construct the next scene_file path
-    next_scene_name = scene['scene_file'].replace(
+    next_scene_name = os.path.basename(scene['scene_file']).replace(
         scene['scene_data']['version'],
         '{:0>3d}'.format(next_version),
     )
@@ -328,6 +340,8 @@ def save_next_workfile(ctx, publish_items):
 
     # Copy the original scene file to the next version
     shutil.copy2(scene['scene_file'], next_scene_file)
+    if ctx.workspace:
+        ctx.workspace.add_work_file(next_scene_file)
 
     return next_scene_file
 
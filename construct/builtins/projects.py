@@ -3,6 +3,7 @@ from __future__ import absolute_import
 import os
 from construct import api, types
 from construct.action import Action
+from construct.snapshots import copy_template
 from construct.tasks import (
     task,
     pass_kwargs,
@@ -88,5 +89,5 @@ def validate_project(project_item):
 def commit_project(project_item):
     '''Copy the project template to project directory'''
 
-    project = project_item['template'].copy(project_item['path'])
+    project = copy_template(project_item['template'], project_item['path'])
     return project
@@ -3,6 +3,7 @@ from __future__ import absolute_import
 import os
 from construct import api
 from construct.action import Action
+from construct.snapshots import copy_template
 from construct.tasks import (
     task,
     pass_kwargs,
@@ -131,7 +132,10 @@ def commit_sequence(sequence_item):
     '''Make new sequence'''
 
     if sequence_item['template']:
-        sequence = sequence_item['template'].copy(sequence_item['path'])
+        sequence = copy_template(
+            sequence_item['template'],
+            sequence_item['path'],
+        )
     else:
         sequence = fsfs.get_entry(sequence_item['path'])
 
@@ -3,6 +3,8 @@ from __future__ import absolute_import
 import os
 from construct import api
 from construct.action import Action
+from construct.snapshots import copy_template
+from construct.builtins import bulk
 from construct.tasks import (
     task,
     pass_kwargs,
@@ -142,10 +144,77 @@ def commit_shot(shot_item):
     '''Create new shot'''
 
     if shot_item['template']:
-        shot = shot_item['template'].copy(shot_item['path'])
+        shot = copy_template(shot_item['template'], shot_item['path'])
     else:
         shot = fsfs.get_entry(shot_item['path'])
 
     shot.tag(*shot_item['tags'])
 
     return shot
+
+
+class NewShots(Action):
+    '''Create many new Shots'''
+
+    label = 'New Shots'
+    identifier = 'new.shots'
+    returns = artifact('shots')
+
+    @staticmethod
+    def parameters(ctx):
+        params = NewShot.parameters(ctx)
+        params.pop('name')
+        params['names'] = {
+            'label': 'Shot Names',
+            'required': True,
+            'type': bulk.NAMES_TYPE,
+            'help': 'Names of shots separated by commas'
+        }
+        return params
+
+    @staticmethod
+    def available(ctx):
+        return NewShot.available(ctx)
+
+
+@task(priority=types.STAGE)
+@pass_kwargs
+@returns(store('shot_items'))
+def stage_shots(project, collection, sequence, names, template=None):
+    '''Stage new shot Entries'''
+
+    path_template = api.get_path_template('shot')
+    template = bulk.get_template(template, 'shot')
+    return [
+        bulk.make_item(
+            name=name,
+            path=path_template.format(dict(
+                project=project.path,
+                collection=collection,
+                sequence=sequence.name,
+                shot=name
+            )),
+            tags=['shot'],
+            template=template,
+        )
+        for name in bulk.split_names(names)
+    ]
+
+
+@task(priority=types.VALIDATE)
+@requires(success('stage_shots'))
+@params(store('shot_items'))
+def validate_shots(shot_items):
+    '''Skip shots that already exist'''
+
+    return bulk.validate_items(shot_items)
+
+
+@task(priority=types.COMMIT)
+@requires(success('validate_shots'))
+@params(store('shot_items'))
+@returns(artifact('shots'))
+def commit_shots(shot_items):
+    '''Create new shots'''
+
+    return bulk.commit_items(shot_items)
@@ -3,6 +3,8 @@ from __future__ import absolute_import
 import os
 from construct import api, config, types
 from construct.action import Action
+from construct.snapshots import copy_template
+from construct.builtins import bulk
 from construct.tasks import (
     task,
     pass_kwargs,
@@ -117,10 +119,75 @@ def commit_task(task_item):
     '''Create new task'''
 
     if task_item['template']:
-        task = task_item['template'].copy(task_item['path'])
+        task = copy_template(task_item['template'], task_item['path'])
     else:
         task = fsfs.get_entry(task_item['path'])
 
     task.tag(*task_item['tags'])
 
     return task
+
+
+class NewTasks(Action):
+    '''Create many new Tasks, one for each task type'''
+
+    label = 'New Tasks'
+    identifier = 'new.tasks'
+    returns = artifact('tasks')
+
+    @staticmethod
+    def parameters(ctx):
+        params = NewTask.parameters(ctx)
+        params.pop('type')
+        params.pop('name')
+        params['names'] = {
+            'label': 'Task Types',
+            'required': True,
+            'type': bulk.NAMES_TYPE,
+            'help': 'Types of tasks separated by commas'
+        }
+        return params
+
+    @staticmethod
+    def available(ctx):
+        return NewTask.available(ctx)
+
+
+@task(priority=types.STAGE)
+@pass_kwargs
+@returns(store('task_items'))
+def stage_tasks(parent, names, template=None):
+    '''Stage tasks for creation'''
+
+    template = bulk.get_template(template, 'task')
+    return [
+        bulk.make_item(
+            name=name,
+            path=unipath(parent.path, name),
+            tags=['task', name],
+            template=template,
+        )
+        for name in bulk.split_names(names)
+    ]
+
+
+@task(priority=types.VALIDATE)
+@requires(success('stage_tasks'))
+@params(store('task_items'))
+def validate_tasks(task_items):
+    '''Skip tasks that already exist or have an unknown type'''
+
+    for item in task_items:
+        if item['name'] not in config['TASK_TYPES']:
+            item['error'] = 'Unknown task type: ' + item['name']
+    return bulk.validate_items(task_items)
+
+
+@task(priority=types.COMMIT)
+@requires(success('validate_tasks'))
+@params(store('task_items'))
+@returns(artifact('tasks'))
+def commit_tasks(task_items):
+    '''Create new tasks'''
+
+    return bulk.commit_items(task_items)
@@ -14,6 +14,7 @@ from construct.tasks import (
 )
 from construct import types, get_host, utils, get_path_template
 from construct.vendor.lucidity.error import ParseError
+from construct.actionparams import deferred
 
 
 class SaveFrameRange(Action):
@@ -64,15 +65,10 @@ class SaveFrameRange(Action):
 
         host = get_host()
         if host:
-            frame_range = host.get_frame_range()
-
-            if frame_range is NotImplemented:
-                return params
-
-            params['min']['default'] = float(frame_range[0])
-            params['start']['default'] = float(frame_range[1])
-            params['end']['default'] = float(frame_range[2])
-            params['max']['default'] = float(frame_range[3])
+            # Query the host once, only for frames that were not provided
+            frame_range = deferred(host.get_frame_range)
+            for i, key in enumerate(['min', 'start', 'end', 'max']):
+                params[key]['default'] = deferred(_get_frame, frame_range, i)
 
         return params
 
@@ -178,12 +174,7 @@ class SaveFPS(Action):
 
         host = get_host()
         if host:
-            frame_rate = host.get_frame_rate()
-
-            if frame_rate is NotImplemented:
-                return params
-
-            params['fps']['default'] = float(frame_rate)
+            params['fps']['default'] = deferred(_get_fps, host)
 
         return params
 
@@ -249,3 +240,17 @@ def apply_frame_rate(fps):
     host = get_host()
     host.set_frame_rate(fps)
     return {'fps': fps}
+
+
+def _get_frame(frame_range, index):
+    frame_range = frame_range()
+    if frame_range is NotImplemented:
+        return
+    return float(frame_range[index])
+
+
+def _get_fps(host):
+    frame_rate = host.get_frame_rate()
+    if frame_rate is NotImplemented:
+        return
+    return float(frame_rate)
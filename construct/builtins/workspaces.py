@@ -2,6 +2,7 @@
 from __future__ import absolute_import
 import os
 from construct.action import Action
+from construct.snapshots import copy_template
 from construct.tasks import (
     task,
     pass_kwargs,
@@ -16,6 +17,7 @@ from construct.tasks import (
 )
 from construct import types, api
 from construct.errors import Abort, Disable
+from construct.actionparams import deferred
 import fsfs
 
 
@@ -56,9 +58,7 @@ class NewWorkspace(Action):
             params['task']['default'] = ctx.task
             params['task']['required'] = False
 
-        templates = api.get_templates('workspace')
-        if templates:
-            params['template']['options'] = list(templates.keys())
+        params['template']['options'] = deferred(_get_workspace_templates)
 
         return params
 
@@ -111,7 +111,10 @@ def commit_workspace(workspace_item):
     '''Create new workspace'''
 
     if workspace_item['template']:
-        workspace = workspace_item['template'].copy(workspace_item['path'])
+        workspace = copy_template(
+            workspace_item['template'],
+            workspace_item['path'],
+        )
     else:
         workspace = fsfs.get_entry(workspace_item['path'])
 
@@ -160,20 +163,12 @@ class SetWorkspace(Action):
         # Get default workspace for this host
         host = api.get_host()
         params['name']['default'] = host.name
+        params['template']['default'] = deferred(
+            _get_default_workspace_template,
+            host,
+        )
 
-        default_workspace = host.name
-        for name, data in api.config['SOFTWARE'].items():
-            if data['host'] == host.name:
-                default_workspace = data['default_workspace']
-                break
-
-        template = api.get_template(default_workspace, 'workspace')
-        if template:
-            params['template']['default'] = template.name
-
-        templates = api.get_templates('workspace')
-        if templates:
-            params['template']['options'] = list(templates.keys())
+        params['template']['options'] = deferred(_get_workspace_templates)
 
         return params
 
@@ -227,6 +222,22 @@ def ensure_workspace(ctx, task, name, template):
         workspace.tag(*template.tags)
         workspace.write(**template.read())
     else:
-        workspace = template.copy(path)
+        workspace = copy_template(template, path)
 
     return workspace
+
+
+def _get_workspace_templates():
+    return list(api.get_templates('workspace').keys())
+
+
+def _get_default_workspace_template(host):
+    default_workspace = host.name
+    for name, data in api.config['SOFTWARE'].items():
+        if data['host'] == host.name:
+            default_workspace = data['default_workspace']
+            break
+
+    template = api.get_template(default_workspace, 'workspace')
+    if template:
+        return template.name
@@ -6,8 +6,8 @@ import argparse
 import colorama
 import construct
 import warnings
-from collections import OrderedDict
-from construct import signals, get_context
+from construct import signals, get_context, stats
+from construct.errors import ActionUnavailable
 from construct.constants import FAILED, SUCCESS, SKIPPED
 from construct.cli.commands import commands, ActionCommand
 from construct.cli.formatters import (
@@ -197,6 +197,12 @@ def setup_parser():
         action='store_true',
         dest='-v'
     )
+    parser.add_argument(
+        '--profile',
+        help='print a profile report of api calls after running',
+        action='store_true',
+        dest='profile'
+    )
     parser.add_argument(
         'command',
         help=argparse.SUPPRESS,
@@ -206,6 +212,23 @@ def setup_parser():
     return parser
 
 
+def get_command(name, parser):
+    '''Build the command or ActionCommand for name. Only the requested command
+    is constructed, returns None when no command is available for name.'''
+
+    for command in commands:
+        if command.name == name:
+            return command(parser)
+
+    try:
+        action = construct.actions.get(name)
+    except ActionUnavailable:
+        return
+
+    if action:
+        return ActionCommand(action, parser)
+
+
 def main():
     '''CLI Entry Point'''
 
@@ -215,6 +238,8 @@ def main():
 
     parser = setup_parser()
     args, extra_args = parser.parse_known_args()
+    if args.profile:
+        stats.enable_profiling()
     root_flags = [f for f, v in args.__dict__.items()
                   if f.startswith('-') and v]
 
@@ -223,16 +248,8 @@ def main():
     construct.init(host='cli', logging=logging_config(logging_level))
     construct.set_context_from_path(os.getcwd())
 
-    # Add all subcommands including contextual actions
-    subcommands = OrderedDict()
-
-    for command in commands:
-        subcommands[command.name] = command(parser)
-
-    for action in construct.actions:
-        subcommands[action.identifier] = ActionCommand(action, parser)
-
-    # Print root help if we received no command argument
+    # Print root help if we received no command argument, the root help
+    # formatter lists all commands and contextual actions
     if not args.command:
         parser.print_help()
         sys.exit()
@@ -240,15 +257,18 @@ def main():
     command_name = args.command
     command_args = root_flags + extra_args
 
-    if command_name not in subcommands:
+    command = get_command(command_name, parser)
+    if command is None:
         print('Command does not exist: ', command_name)
         sys.exit(1)
 
-    command = subcommands[command_name]
     args, extra_args = command.parse(command_args)
     args.__dict__.pop('verbose')
     command.run(args, *extra_args)
 
+    if stats.is_profiling():
+        print(stats.format_report())
+
 
 if __name__ == '__main__':
     main()
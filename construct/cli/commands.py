@@ -374,7 +374,7 @@ class Write(Command):
         except Exception as e:
             print('Failed to write data: ')
             print(dict(data))
-            print(e.message)
+            print(str(e))
         else:
             print('Wrote data to ' + args.root)
 
@@ -429,6 +429,50 @@ class Untag(Command):
         fsfs.untag(args.root, *args.tags)
 
 
+class Reindex(Command):
+    '''Rebuild the entry index of a project
+
+    Examples:
+        construct reindex
+        construct reindex -r path/to/project
+        construct reindex --migrate-logs
+
+    The index is used by search, push and quick selections instead of
+    walking the project's directory tree. Pass --migrate-logs to also move
+    comments stored in entry data by older versions to their append logs.
+    '''
+
+    name = 'reindex'
+
+    def setup_parser(self, parser):
+        parser.add_argument(
+            '--root', '-r',
+            default=None,
+            help='Project directory to index, defaults to current project'
+        )
+        parser.add_argument(
+            '--migrate-logs',
+            action='store_true',
+            help='Move comments stored in entry data to append logs'
+        )
+
+    def run(self, args, *extra_args):
+        ctx = construct.get_context()
+        if not args.root and not ctx.project:
+            error('Not in a project, pass a project directory with --root.')
+            sys.exit(1)
+
+        if args.migrate_logs:
+            migrated = construct.migrate_logs(args.root)
+            print('Migrated logs of {} entries'.format(len(migrated)))
+
+        entry_index = construct.reindex(args.root)
+        print('Indexed {} entries in {}'.format(
+            entry_index.count(),
+            entry_index.root
+        ))
+
+
 class ActionCommand(Command):
     ''':class:`Action` CLI command class'''
 
@@ -469,15 +513,23 @@ class ActionCommand(Command):
             )
             return parser.add_argument(param_flag, **arg_spec)
 
-        # Handle all other options
+        # Handle all other options, deferred defaults and options are left
+        # for the Action to compute when the option is not provided
+        default = param_options.get('default', None)
+        if callable(default):
+            default = None
+        choices = param_options.get('options', None)
+        if callable(choices):
+            choices = None
+
         arg_spec = dict(
             action=('store', 'store_true')[param_options['type'] is bool],
             type=param_options.get('type', str),
             dest=param_name,
             help=param_options.get('help', None),
             # required=param_options.get('required', False),
-            default=param_options.get('default', None),
-            choices=param_options.get('options', None)
+            default=default,
+            choices=choices
         )
 
         # Build a validator if we get a tuple of types, argparse calls
@@ -505,8 +557,10 @@ class ActionCommand(Command):
             self.add_option(parser, param_name, param_options)
 
     def run(self, args, *extra_args):
+        # Drop options that were not provided so the Action computes defaults
+        kwargs = {k: v for k, v in args.__dict__.items() if v is not None}
         try:
-            action = self.action(*extra_args, **args.__dict__)
+            action = self.action(*extra_args, **kwargs)
             action.run()
         except ActionControlFlowError as e:
             msg = styled(
@@ -1,39 +1,72 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
-from construct.constants import DEFAULT_CONFIG
-from construct.vendor import yaml
+import os
+import sys
+import errno
+import hashlib
+import logging
+from timeit import default_timer
+from six.moves import cPickle as pickle
+from construct.constants import DEFAULT_CONFIG, CACHE_ROOT
+from construct.utils import classproperty, unipath, atomic_write
+from construct import yamlutils
 try:
     from collections import ChainMap
 except ImportError:
     from chainmap import ChainMap
 
 
+_log = logging.getLogger(__name__)
+
+
 class Config(object):
     '''Config object that looks up values in the following order.
 
         1. context.project.data
         2. config.dict
         3. config.defaults
+
+    The flattened chain is memoized per project and version of config.dict.
+    Use :meth:`update` or item assignment to modify config.dict so the
+    memoized chain is invalidated. The memoized chain is also invalidated
+    when the context is set, when the project's data is written in this
+    process and by :meth:`invalidate`. Changes made to the project's data by
+    other processes are noticed within stat_interval seconds.
+
+    The defaults are loaded from DEFAULT_CONFIG on first access of
+    Config.defaults using :func:`load_config`.
     '''
 
-    defaults = {}
+    _defaults = None
+    stat_interval = 1.0
 
-    with open(DEFAULT_CONFIG, 'r') as f:
-        defaults.update(yaml.safe_load(f.read()))
+    @classproperty
+    def defaults(cls):
+        if Config._defaults is None:
+            Config._defaults = load_config(DEFAULT_CONFIG)
+        return Config._defaults
 
     def __init__(self, *args, **kwargs):
         self.dict = dict(*args, **kwargs)
+        self._version = 0
+        self._cache_key = None
+        self._cache = None
+        self._stamp = None
+        self._stamp_path = None
+        self._stamp_time = None
 
     def __str__(self):
         return str(self.flatten())
 
-    def chain(self):
+    def chain(self, ctx=None):
         '''Build chainmap for current context'''
 
         dicts = []
 
-        from construct.api import get_context
-        ctx = get_context()
+        if ctx is None:
+            from construct.api import get_context
+            ctx = get_context()
+
         if ctx and ctx.project:
             data = dict(
                 (k, v) for k, v in ctx.project.data.items()
@@ -45,17 +78,138 @@ class Config(object):
         dicts.append(self.defaults)
         return ChainMap(*dicts)
 
+    def _flattened(self):
+        '''Get the memoized flattened chain, rebuilding it when the project
+        in context, the project's data or config.dict has changed.'''
+
+        from construct.api import get_context
+        ctx = get_context()
+        project = ctx.project if ctx else None
+
+        if project:
+            key = (self._version, project.path, self._get_stamp(project))
+        else:
+            key = (self._version, None, None)
+
+        if key != self._cache_key or self._cache is None:
+            self._cache = dict(self.chain(ctx))
+            self._cache_key = key
+
+        return self._cache
+
+    def _get_stamp(self, project):
+        '''Get the modification time and size of the project's data file,
+        the file is stat'd at most once every stat_interval seconds.'''
+
+        now = default_timer()
+        if (
+            self._stamp_path == project.path and
+            now - self._stamp_time < self.stat_interval
+        ):
+            return self._stamp
+
+        try:
+            st = os.stat(project.data.file)
+            stamp = (st.st_mtime, st.st_size)
+        except (OSError, TypeError):
+            stamp = None
+
+        self._stamp = stamp
+        self._stamp_path = project.path
+        self._stamp_time = now
+        return stamp
+
+    def invalidate(self):
+        '''Clear the memoized chain, the project's data is read again on
+        the next lookup.'''
+
+        self._cache_key = None
+        self._cache = None
+        self._stamp_path = None
+
     def flatten(self):
-        return dict(self.chain())
+        return dict(self._flattened())
 
     def get(self, *args):
-        return self.chain().get(*args)
+        return self._flattened().get(*args)
 
     def __getitem__(self, item):
-        return self.chain().__getitem__(item)
+        return self._flattened().__getitem__(item)
 
     def __setitem__(self, item, value):
         self.dict.__setitem__(item, value)
+        self._version += 1
 
     def update(self, *args, **kwargs):
         self.dict.update(*args, **kwargs)
+        self._version += 1
+
+
+def get_snapshot_path(path):
+    '''Get the path to the config snapshot of a yaml file'''
+
+    key = hashlib.sha1(unipath(path).encode('utf-8')).hexdigest()
+    return unipath(
+        CACHE_ROOT,
+        'config',
+        '%s.py%d.pickle' % (key, sys.version_info[0])
+    )
+
+
+def load_config(path):
+    '''Load a yaml config file using a pickled snapshot of the parsed data.
+
+    Snapshots are stored in CACHE_ROOT and are keyed by the modification
+    time, size and sha1 hash of the yaml file. When only the modification
+    time changed and the hash still matches the snapshot is reused without
+    parsing the yaml file.
+    '''
+
+    st = os.stat(path)
+    stamp = (st.st_mtime, st.st_size)
+    snapshot_path = get_snapshot_path(path)
+    snapshot = _read_snapshot(snapshot_path)
+    if snapshot and snapshot['stamp'] == stamp:
+        return snapshot['data']
+
+    with open(path, 'rb') as f:
+        content = f.read()
+    sha1 = hashlib.sha1(content).hexdigest()
+
+    if snapshot and snapshot['sha1'] == sha1:
+        data = snapshot['data']
+    else:
+        _log.debug('Parsing config: %s', path)
+        data = yamlutils.safe_load(content)
+
+    _write_snapshot(
+        snapshot_path,
+        dict(source=path, stamp=stamp, sha1=sha1, data=data)
+    )
+    return data
+
+
+def _read_snapshot(snapshot_path):
+    try:
+        with open(snapshot_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_snapshot(snapshot_path, snapshot):
+    '''Write a snapshot, failures are logged and ignored.'''
+
+    try:
+        try:
+            os.makedirs(os.path.dirname(snapshot_path))
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        atomic_write(
+            snapshot_path,
+            pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL),
+            mode='wb'
+        )
+    except (IOError, OSError) as e:
+        _log.debug('Failed to write config snapshot: %s', e)
@@ -26,6 +26,10 @@ ACTION_SIGNALS = [
 EXTENSIONS_ENTRY_POINT = 'construct.extensions'
 USER_CONFIG = unipath('~/.construct/construct.yaml')
 DEFAULT_CONFIG = package_path('defaults', 'construct.yaml')
+CACHE_ROOT = unipath(
+    os.environ.get('CONSTRUCT_CACHE', '~/.construct/cache')
+)
+EXTENSION_MANIFEST = 'extensions.json'
 DEFAULT_ROOT = unipath('~/projects')
 DEFAULT_HOST = 'standalone'
 DEFAULT_LOGGING = dict(
@@ -51,6 +55,7 @@ DEFAULT_LOGGING = dict(
 
 FSFS_DATA_ROOT = '.data'
 FSFS_DATA_FILE = 'data'
+ENTRY_INDEX_FILE = 'index.sqlite'
 
 TIMER = timeit.default_timer
 SLEEP = time.sleep
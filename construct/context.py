@@ -3,6 +3,8 @@ from __future__ import absolute_import
 
 __all__ = [
     'Context',
+    'resolve_path',
+    'clear_path_cache',
     '_ctx_stack',
     '_req_stack',
 ]
@@ -10,7 +12,7 @@ __all__ = [
 import os
 import fsfs
 from getpass import getuser
-from collections import Mapping
+from collections import Mapping, OrderedDict
 from werkzeug.local import LocalStack
 from construct.constants import DEFAULT_ROOT, DEFAULT_HOST
 from construct.utils import platform, unipath
@@ -19,6 +21,8 @@ from construct.models import is_entry
 
 _ctx_stack = LocalStack()
 _req_stack = LocalStack()
+_path_cache = OrderedDict()
+PATH_CACHE_SIZE = 128
 
 
 class Context(object):
@@ -165,10 +169,68 @@ class Context(object):
             ctx.file = unipath(path)
             path = os.path.dirname(path)
 
-        for entry in fsfs.search(path, direction=fsfs.UP):
-            tags = entry.tags
-            for key in Context.entry_keys:
-                if key in tags:
-                    setattr(ctx, key, entry)
+        for key, entry in resolve_path(path).items():
+            setattr(ctx, key, entry)
 
         return ctx
+
+
+def resolve_path(path):
+    '''Get a dict mapping Context.entry_keys to the entries found above path.
+
+    Results are kept in an LRU cache of PATH_CACHE_SIZE paths. A cached
+    result is reused while the data directories of all ancestors of path
+    have the same modification times, so resolving a path again only stats
+    each ancestor's data directory.
+    '''
+
+    path = unipath(path)
+    data_root = fsfs.get_data_root()
+    ancestors = _get_ancestors(path)
+    stamps = tuple(_get_data_mtime(a, data_root) for a in ancestors)
+    cache_key = (path, data_root, fsfs.get_entry_factory())
+
+    cached = _path_cache.pop(cache_key, None)
+    if cached and cached[0] == stamps:
+        _path_cache[cache_key] = cached
+        return dict(cached[1])
+
+    entries = {}
+    for ancestor, stamp in zip(ancestors, stamps):
+        if stamp is None:
+            continue
+
+        entry = fsfs.get_entry(ancestor)
+        tags = entry.tags
+        for key in Context.entry_keys:
+            if key in tags:
+                entries[key] = entry
+
+    _path_cache[cache_key] = (stamps, entries)
+    while len(_path_cache) > PATH_CACHE_SIZE:
+        _path_cache.popitem(last=False)
+
+    return dict(entries)
+
+
+def clear_path_cache():
+    '''Clear the cache used by :func:`resolve_path`'''
+
+    _path_cache.clear()
+
+
+def _get_ancestors(path):
+    ancestors = [path]
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path:
+            return ancestors
+        ancestors.append(parent)
+        path = parent
+
+
+def _get_data_mtime(path, data_root):
+    try:
+        return os.stat(path + '/' + data_root).st_mtime
+    except OSError:
+        return None
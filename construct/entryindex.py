@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+
+__all__ = [
+    'EntryIndex',
+    'IndexQuery',
+    'find_index',
+    'get_index',
+    'path_sort_key',
+    'clear_cache',
+    'connect',
+    'disconnect',
+]
+
+import os
+import sqlite3
+import logging
+from contextlib import contextmanager
+import fsfs
+from fsfs import channels
+from scandir import scandir
+from construct.constants import FSFS_DATA_ROOT, ENTRY_INDEX_FILE
+from construct.utils import unipath
+
+
+_log = logging.getLogger(__name__)
+_indexes = {}
+# Directories known not to contain an index, cleared when an index is built
+_no_index = set()
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    uuid TEXT,
+    level INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tags (
+    path TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (path, tag)
+);
+CREATE INDEX IF NOT EXISTS entries_name ON entries (name);
+CREATE INDEX IF NOT EXISTS tags_tag ON tags (tag);
+'''
+
+
+class EntryIndex(object):
+    '''SQLite backed index of all the Entries below a root directory.
+
+    The index lives in the root Entry's data directory and stores the path,
+    name, uuid and tags of every Entry. Paths are stored relative to the root
+    so an index remains valid when a project is mounted at different
+    locations.
+
+    Arguments:
+        root (str): Directory of the Entry owning the index, usually a project
+    '''
+
+    def __init__(self, root):
+        self.root = unipath(root)
+        self.path = unipath(self.root, FSFS_DATA_ROOT, ENTRY_INDEX_FILE)
+
+    def __repr__(self):
+        return '{}({!r})'.format(self.__class__.__name__, self.root)
+
+    @property
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    @contextmanager
+    def connect(self):
+        '''Contextmanager yielding a sqlite3 connection to the index.
+        Changes are committed on exit.'''
+
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            yield conn
+            conn.commit()
+        except:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def count(self):
+        '''Number of indexed Entries'''
+
+        with self.connect() as conn:
+            return conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def contains(self, path):
+        '''True when the Entry at path is in the index'''
+
+        relpath = self.relpath(path)
+        if relpath is None:
+            return False
+
+        with self.connect() as conn:
+            return conn.execute(
+                'SELECT 1 FROM entries WHERE path = ?', (relpath,)
+            ).fetchone() is not None
+
+    def relpath(self, path):
+        '''Get path relative to the index root. Returns None if path is not
+        within the index root.'''
+
+        path = unipath(path)
+        if path == self.root:
+            return ''
+        if path.startswith(self.root + '/'):
+            return path[len(self.root) + 1:]
+
+    def abspath(self, relpath):
+        '''Get absolute path from a path relative to the index root'''
+
+        if not relpath:
+            return self.root
+        return self.root + '/' + relpath
+
+    def rebuild(self):
+        '''Walk the root directory and rebuild the index from scratch.
+
+        Returns:
+            int - number of indexed Entries
+        '''
+
+        rows = []
+        tag_rows = []
+        for relpath, level, tags, uuid in _walk_entries(self.root):
+            rows.append((relpath, _basename(relpath, self.root), uuid, level))
+            tag_rows.extend([(relpath, tag) for tag in tags])
+
+        data_path = os.path.dirname(self.path)
+        if not os.path.isdir(data_path):
+            os.makedirs(data_path)
+
+        with self.connect() as conn:
+            conn.executescript(SCHEMA)
+            conn.execute('DELETE FROM entries')
+            conn.execute('DELETE FROM tags')
+            conn.executemany('INSERT INTO entries VALUES (?, ?, ?, ?)', rows)
+            conn.executemany('INSERT INTO tags VALUES (?, ?)', tag_rows)
+
+        _indexes[self.root] = self
+        _no_index.clear()
+        _log.debug('Indexed %d entries in %s', len(rows), self.root)
+        return len(rows)
+
+    def add(self, path):
+        '''Add or update the Entry at path'''
+
+        relpath = self.relpath(path)
+        if relpath is None:
+            return
+
+        entry = fsfs.get_entry(unipath(path))
+        tags = entry.tags
+        uuid = entry.uuid
+        with self.connect() as conn:
+            level = self._get_level(conn, _dirname(relpath))
+            if not relpath:
+                level = 0
+            conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                (relpath, _basename(relpath, self.root), uuid, level)
+            )
+            conn.execute('DELETE FROM tags WHERE path = ?', (relpath,))
+            conn.executemany(
+                'INSERT INTO tags VALUES (?, ?)',
+                [(relpath, tag) for tag in tags]
+            )
+
+    def remove(self, path):
+        '''Remove the Entry at path and all of it's children'''
+
+        relpath = self.relpath(path)
+        if relpath is None:
+            return
+
+        where, params = _within(relpath, include_root=True)
+        with self.connect() as conn:
+            conn.execute('DELETE FROM entries WHERE ' + where, params)
+            conn.execute('DELETE FROM tags WHERE ' + where, params)
+
+    def move(self, old_path, new_path):
+        '''Update the paths of an Entry and it's children after a move'''
+
+        self.remove(old_path)
+        if self.relpath(new_path) is None:
+            return
+        for child_path in [new_path] + _child_paths(new_path):
+            self.add(child_path)
+
+    def tag(self, path, *tags):
+        '''Add tags to an indexed Entry, indexing the Entry if necessary'''
+
+        relpath = self.relpath(path)
+        if relpath is None:
+            return
+
+        with self.connect() as conn:
+            row = conn.execute(
+                'SELECT 1 FROM entries WHERE path = ?',
+                (relpath,)
+            ).fetchone()
+            if row:
+                conn.executemany(
+                    'INSERT OR IGNORE INTO tags VALUES (?, ?)',
+                    [(relpath, tag) for tag in tags]
+                )
+                return
+
+        self.add(path)
+
+    def untag(self, path, *tags):
+        '''Remove tags from an indexed Entry'''
+
+        relpath = self.relpath(path)
+        if relpath is None:
+            return
+
+        with self.connect() as conn:
+            conn.executemany(
+                'DELETE FROM tags WHERE path = ? AND tag = ?',
+                [(relpath, tag) for tag in tags]
+            )
+
+    def query(self, root=None, name=None, tags=None, uuid=None, levels=None,
+              skip_root=False, latest_first=False, limit=None):
+        '''Query the index returning a list of absolute Entry paths.
+
+        Arguments:
+            root (str): Only return Entries within this directory
+            name (str): Only return Entries whose name contains this string
+            tags (list): Only return Entries with all of these tags
+            uuid (str): Only return the Entry with this uuid
+            levels (int): Number of child Entries deep to search
+            skip_root (bool): Exclude the root Entry from the results
+            latest_first (bool): Reverse the path ordering of the results
+            limit (int): Maximum number of results
+
+        Returns:
+            list of paths ordered by :func:`path_sort_key`
+        '''
+
+        relpath = self.relpath(root or self.root)
+        if relpath is None:
+            return []
+
+        where, params = _within(relpath, include_root=not skip_root)
+        clauses = ['(' + where + ')']
+        params = list(params)
+
+        with self.connect() as conn:
+
+            if levels:
+                # Match fsfs semantics, the root Entry counts as a level
+                # unless it's skipped
+                child_level = self._get_level(conn, relpath)
+                is_entry = conn.execute(
+                    'SELECT 1 FROM entries WHERE path = ?',
+                    (relpath,)
+                ).fetchone()
+                max_level = child_level + levels - 1
+                if is_entry and not skip_root:
+                    max_level -= 1
+                clauses.append('level <= ?')
+                params.append(max_level)
+
+            if name:
+                clauses.append('instr(name, ?) > 0')
+                params.append(name)
+
+            if uuid:
+                clauses.append('uuid = ?')
+                params.append(uuid)
+
+            for tag in tags or []:
+                clauses.append(
+                    'EXISTS (SELECT 1 FROM tags '
+                    'WHERE tags.path = entries.path AND tags.tag = ?)'
+                )
+                params.append(tag)
+
+            sql = 'SELECT path FROM entries WHERE ' + ' AND '.join(clauses)
+            # Order like path_sort_key, "/" sorts before any other character
+            sql += " ORDER BY replace(path, '/', char(1)) " + (
+                'DESC' if latest_first else 'ASC'
+            )
+            if limit:
+                sql += ' LIMIT %d' % int(limit)
+
+            rows = conn.execute(sql, params).fetchall()
+
+        return [self.abspath(row[0]) for row in rows]
+
+    def select(self, root, selector, sep='/'):
+        '''Return paths of Entries matching a selector like "parent/entry".
+
+        Matches the semantics of fsfs selectors, an Entry is selected when
+        the parts of the selector are found, in order, in the names of the
+        Entries leading from root to the Entry.
+        '''
+
+        parts = [p for p in selector.split(sep) if p]
+        if not parts:
+            return []
+
+        candidates = self.query(root, name=parts[-1])
+        if len(parts) == 1:
+            return candidates
+
+        matches = set()
+        for part in set(parts):
+            matches.update(self.query(root, name=part))
+
+        root = unipath(root)
+        selected = []
+        for candidate in candidates:
+            chain = [
+                p for p in _ancestors(candidate, root)
+                if p in matches
+            ] + [candidate]
+            i = 0
+            for path in chain:
+                if parts[i] in os.path.basename(path):
+                    i += 1
+                if i == len(parts):
+                    if path == candidate:
+                        selected.append(candidate)
+                    break
+
+        return selected
+
+    def quick_select(self, root, selector, sep='/', skip_root=False):
+        '''Like fsfs.quick_select but uses the index to find the shortest
+        matching path for each part of the selector.'''
+
+        match = unipath(root)
+        first = True
+        for part in [p for p in selector.split(sep) if p]:
+            paths = self.query(
+                match,
+                name=part,
+                skip_root=not first or skip_root
+            )
+            if not paths:
+                return
+            match = min(paths, key=len)
+            first = False
+
+        if match:
+            return fsfs.get_entry(match)
+
+    def search(self, root=None, levels=None, skip_root=False):
+        '''Returns an :class:`IndexQuery` yielding Entries within root.'''
+
+        return IndexQuery(self, root or self.root, levels, skip_root)
+
+    def _get_level(self, conn, relpath):
+        '''Get the level of an Entry directly below relpath. This is one more
+        than the level of relpath or the nearest indexed parent Entry.'''
+
+        parts = relpath.split('/') if relpath else []
+        candidates = ['/'.join(parts[:i]) for i in range(len(parts) + 1)]
+
+        rows = conn.execute(
+            'SELECT path, level FROM entries WHERE path IN (%s)' %
+            ', '.join(['?'] * len(candidates)),
+            candidates
+        ).fetchall()
+        if not rows:
+            return 0
+
+        path, level = max(rows, key=lambda row: len(row[0]))
+        return level + 1
+
+
+class IndexQuery(object):
+    '''Chainable query of an :class:`EntryIndex`. Supports the same query
+    methods as fsfs.Search so it can be used in place of one.'''
+
+    def __init__(self, index, root, levels=None, skip_root=False,
+                 name=None, tags=None, uuid=None, selector=None, sep='/',
+                 predicates=None, latest_first=False, limit=None):
+        self.index = index
+        self.root = root
+        self.levels = levels
+        self.skip_root = skip_root
+        self._name = name
+        self._tags = tags or []
+        self._uuid = uuid
+        self.selector = selector
+        self.sep = sep
+        self.predicates = predicates or []
+        self._latest_first = latest_first
+        self._limit = limit
+
+    def __iter__(self):
+        if self.selector:
+            paths = self.index.select(self.root, self.selector, self.sep)
+            if self._tags or self._uuid or self.levels or self.skip_root:
+                others = set(self._query())
+                paths = [p for p in paths if p in others]
+            paths = sorted(
+                paths,
+                key=path_sort_key,
+                reverse=self._latest_first
+            )
+        else:
+            # Entries are instantiated lazily, so the limit can only be
+            # applied in sql when there are no predicates
+            limit = None if self.predicates else self._limit
+            paths = self._query(limit)
+
+        count = 0
+        for path in paths:
+            if self._limit and count >= self._limit:
+                return
+
+            entry = fsfs.get_entry(path)
+            if all([p(entry) for p in self.predicates]):
+                count += 1
+                yield entry
+
+    def _query(self, limit=None):
+        return self.index.query(
+            self.root,
+            name=self._name,
+            tags=self._tags,
+            uuid=self._uuid,
+            levels=self.levels,
+            skip_root=self.skip_root,
+            latest_first=self._latest_first,
+            limit=limit,
+        )
+
+    def clone(self, **kwargs):
+        '''Clone this query. Pass kwargs to override attributes.'''
+
+        kwargs.setdefault('index', self.index)
+        kwargs.setdefault('root', self.root)
+        kwargs.setdefault('levels', self.levels)
+        kwargs.setdefault('skip_root', self.skip_root)
+        kwargs.setdefault('name', self._name)
+        kwargs.setdefault('tags', self._tags)
+        kwargs.setdefault('uuid', self._uuid)
+        kwargs.setdefault('selector', self.selector)
+        kwargs.setdefault('sep', self.sep)
+        kwargs.setdefault('predicates', self.predicates)
+        kwargs.setdefault('latest_first', self._latest_first)
+        kwargs.setdefault('limit', self._limit)
+        return self.__class__(**kwargs)
+
+    def one(self):
+        '''Returns the first Entry'''
+
+        for entry in self:
+            return entry
+
+    def latest_first(self, latest_first=True):
+        '''Returns a new query yielding Entries in reverse path order'''
+
+        return self.clone(latest_first=latest_first)
+
+    def limit(self, limit):
+        '''Returns a new query that stops after limit Entries'''
+
+        return self.clone(limit=limit)
+
+    def tags(self, *tags):
+        '''Returns a new query yielding Entries that match tags'''
+
+        return self.clone(tags=list(self._tags) + list(tags))
+
+    def uuid(self, uuid):
+        '''Returns a new query yielding Entries that match uuid'''
+
+        return self.clone(uuid=uuid)
+
+    def name(self, name, sep='/'):
+        '''Returns a new query yielding Entries that match name'''
+
+        if sep in name:
+            return self.clone(selector=name.strip(sep), sep=sep)
+        return self.clone(name=name)
+
+    def filter(self, predicate):
+        '''Returns a new query with an additional predicate'''
+
+        return self.clone(predicates=self.predicates + [predicate])
+
+
+def path_sort_key(path):
+    '''Sort key ordering paths one directory name at a time, so an Entry
+    comes before it's children and siblings are ordered by name. This is the
+    order of the walk used when no index is available.'''
+
+    return path.split('/')
+
+
+def get_index(root):
+    '''Get the EntryIndex for a root directory, whether it exists or not.'''
+
+    root = unipath(root)
+    if root not in _indexes:
+        _indexes[root] = EntryIndex(root)
+    return _indexes[root]
+
+
+def find_index(path):
+    '''Find the nearest EntryIndex containing path. Directories without an
+    index are remembered until an index is rebuilt, so an index created by
+    another process is only found after calling :func:`clear_cache`.
+
+    Returns:
+        EntryIndex or None
+    '''
+
+    path = unipath(path)
+
+    for root, index in list(_indexes.items()):
+        if path == root or path.startswith(root + '/'):
+            if index.exists:
+                return index
+            _indexes.pop(root, None)
+
+    root = path
+    checked = []
+    while root not in _no_index:
+        index_file = unipath(root, FSFS_DATA_ROOT, ENTRY_INDEX_FILE)
+        if os.path.isfile(index_file):
+            return get_index(root)
+
+        checked.append(root)
+        next_root = os.path.dirname(root)
+        if next_root == root:
+            break
+        root = next_root
+
+    _no_index.update(checked)
+
+
+def clear_cache():
+    '''Forget the directories known not to contain an index'''
+
+    _no_index.clear()
+
+
+def _walk_entries(root, relpath='', level=0):
+    '''Walk root yielding (relpath, level, tags, uuid) for every Entry.'''
+
+    path = unipath(root, relpath) if relpath else root
+    subdirs = []
+    entry_data = None
+    try:
+        for item in scandir(path):
+            if not item.is_dir():
+                continue
+            if item.name == FSFS_DATA_ROOT:
+                entry_data = item.path
+            else:
+                subdirs.append(item.name)
+    except OSError:
+        return
+
+    if entry_data:
+        tags, uuid = [], None
+        for item in scandir(entry_data):
+            if item.name.startswith('tag_'):
+                tags.append(item.name[4:])
+            elif item.name.startswith('uuid_'):
+                uuid = item.name[5:]
+        yield relpath, level, tags, uuid
+        level += 1
+
+    for name in sorted(subdirs):
+        child = relpath + '/' + name if relpath else name
+        for result in _walk_entries(root, child, level):
+            yield result
+
+
+def _within(relpath, include_root=True):
+    '''Build a where clause matching relpath and the paths below it'''
+
+    if not relpath:
+        if include_root:
+            return '1', ()
+        return "path != ''", ()
+
+    clause = '(path > ? AND path < ?)'
+    params = (relpath + '/', relpath + '0')
+    if include_root:
+        clause = '(path = ? OR ' + clause + ')'
+        params = (relpath,) + params
+    return clause, params
+
+
+def _dirname(relpath):
+    if '/' in relpath:
+        return relpath.rsplit('/', 1)[0]
+    return ''
+
+
+def _basename(relpath, root):
+    return os.path.basename(relpath or root)
+
+
+def _ancestors(path, root):
+    '''List parent directories of path from root down to path's parent.'''
+
+    parents = []
+    parent = os.path.dirname(path)
+    while len(parent) >= len(root):
+        parents.insert(0, parent)
+        next_parent = os.path.dirname(parent)
+        if next_parent == parent:
+            break
+        parent = next_parent
+    return parents
+
+
+def _child_paths(path):
+    return [unipath(path, relpath) for relpath, _, _, _ in _walk_entries(path)
+            if relpath]
+
+
+# Keep indexes up to date when entries are created, tagged, moved or deleted
+
+
+def _on_entry_created(entry):
+    entry_index = find_index(entry.path)
+    if entry_index:
+        entry_index.add(entry.path)
+
+
+def _on_entry_tagged(entry, tags):
+    entry_index = find_index(entry.path)
+    if entry_index:
+        entry_index.tag(entry.path, *tags)
+
+
+def _on_entry_untagged(entry, tags):
+    entry_index = find_index(entry.path)
+    if entry_index:
+        entry_index.untag(entry.path, *tags)
+
+
+def _on_entry_moved(entry, old_path, new_path):
+    old_index = find_index(old_path)
+    if old_index:
+        old_index.remove(old_path)
+
+    new_index = find_index(new_path)
+    if new_index:
+        new_index.move(old_path, new_path)
+
+
+def _on_entry_deleted(entry):
+    entry_index = find_index(entry.path)
+    if entry_index and entry_index.root != unipath(entry.path):
+        entry_index.remove(entry.path)
+
+
+def _on_entry_uuid_changed(entry):
+    _on_entry_created(entry)
+
+
+_receivers = [
+    (channels.EntryCreated, _on_entry_created),
+    (channels.EntryTagged, _on_entry_tagged),
+    (channels.EntryUntagged, _on_entry_untagged),
+    (channels.EntryMoved, _on_entry_moved),
+    (channels.EntryRelinked, _on_entry_moved),
+    (channels.EntryDeleted, _on_entry_deleted),
+    (channels.EntryUUIDChanged, _on_entry_uuid_changed),
+]
+
+
+def connect():
+    '''Connect to fsfs channels to update indexes incrementally'''
+
+    for channel, receiver in _receivers:
+        channel.connect(receiver)
+
+
+def disconnect():
+    '''Disconnect from fsfs channels'''
+
+    for channel, receiver in _receivers:
+        channel.disconnect(receiver)
+    _indexes.clear()
+    _no_index.clear()
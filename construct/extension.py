@@ -2,22 +2,49 @@
 from __future__ import absolute_import
 import abc
 import os
+import json
+import errno
 import inspect
 import logging
 from collections import defaultdict, OrderedDict
 from fnmatch import fnmatch
 
-from construct.constants import EXTENSIONS_ENTRY_POINT
+from construct.constants import (
+    EXTENSIONS_ENTRY_POINT,
+    CACHE_ROOT,
+    EXTENSION_MANIFEST,
+)
 from construct.types import ABC
-from construct.utils import iter_modules, ensure_type, missing, unipath
+from construct.utils import (
+    iter_module_paths,
+    import_file,
+    ensure_type,
+    missing,
+    unipath,
+    atomic_write,
+)
 from construct.action import get_action_identifier, Action
 import entrypoints
 
 
 _extensions = {}
+_registry_version = 0
 _log = logging.getLogger(__name__)
 
 
+def get_registry_version():
+    '''Get a counter that is incremented whenever extensions are registered,
+    enabled or disabled or when the actions and tasks they provide change.
+    Used to invalidate caches built from the registered extensions.'''
+
+    return _registry_version
+
+
+def _registry_changed():
+    global _registry_version
+    _registry_version += 1
+
+
 class Config(object):
 
     def __init__(self, key, default=missing):
@@ -36,9 +63,16 @@ class Config(object):
 
 
 class Extension(ABC):
+    '''Base class for all Extensions.
+
+    Extensions discovered on a search path are recorded in the extension
+    manifest. Set lazy to True to defer importing an extension until one of
+    it's actions, tasks or forms is requested.
+    '''
 
     name = None
     attr_name = None
+    lazy = False
 
     @abc.abstractproperty
     def name(self):
@@ -49,12 +83,21 @@ class Extension(ABC):
         '''Nice name used for attribute access like: "builtins"'''
 
     def __init__(self):
-        self.enabled = True
+        self._enabled = True
         self._actions = {}
         self._tasks = defaultdict(list)
         self._template_paths = []
         self._forms = {}
 
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+        _registry_changed()
+
     def _available(self, ctx=missing):
         if ctx is not missing:
             return self.available(ctx)
@@ -96,6 +139,15 @@ class Extension(ABC):
     def get_template_paths(self):
         return list(self._template_paths)
 
+    def has_action(self, identifier):
+        return identifier in self._actions
+
+    def has_tasks(self, identifier):
+        return _match_task_keys(identifier, self._tasks)
+
+    def has_form(self, identifier):
+        return identifier in self._forms
+
     def add_form(self, action_or_identifier, form):
         identifier = get_action_identifier(action_or_identifier)
         self._forms[identifier] = form
@@ -115,6 +167,7 @@ class Extension(ABC):
 
         if action.identifier not in self._actions:
             self._actions[action.identifier] = action
+            _registry_changed()
 
     def remove_action(self, action):
         '''Remove an action from this extensions'''
@@ -122,6 +175,7 @@ class Extension(ABC):
 
         if action.identifier in self._actions:
             self._actions.pop(action.identifier)
+            _registry_changed()
 
     def get_actions(self, ctx=missing):
         '''Get all actions for the specified ctx'''
@@ -142,13 +196,15 @@ class Extension(ABC):
         if task_overrides:
             task = task.clone(**task_overrides)
         self._tasks[identifier].append(task)
+        _registry_changed()
 
     def remove_task(self, action_or_identifier, task, **task_overrides):
         '''Remove a task from the specified action'''
 
         identifier = get_action_identifier(action_or_identifier)
         if task in self._tasks[identifier]:
-            self._tasks.remove(task)
+            self._tasks[identifier].remove(task)
+            _registry_changed()
 
     def get_tasks(self, identifier, ctx=missing):
         '''Get all tasks for the spcified action '''
@@ -252,6 +308,168 @@ class HostExtension(Extension):
         return QtWidgets.QApplication.instance()
 
 
+class LazyExtension(object):
+    '''Stands in for an Extension recorded in the extension manifest. The
+    module defining the Extension is imported the first time one of it's
+    declared actions, tasks or forms is requested.
+    '''
+
+    def __init__(self, collector, record, loader):
+        self.name = record['name']
+        self.attr_name = record['attr_name']
+        self._enabled = True
+        self._template_paths = list(record['template_paths'])
+        self._collector = collector
+        self._record = record
+        self._loader = loader
+        self._extension = None
+
+    def __repr__(self):
+        return '<LazyExtension>(%s)' % self.name
+
+    def __getattr__(self, attr):
+        if attr.startswith('__'):
+            raise AttributeError(attr)
+
+        extension = self._resolve()
+        if extension is None:
+            raise AttributeError(attr)
+        return getattr(extension, attr)
+
+    @property
+    def loaded(self):
+        return self._extension is not None
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        self._enabled = value
+        _registry_changed()
+
+    def _resolve(self):
+        '''Import and load the Extension'''
+
+        if self._extension is None:
+            self._extension = self._collector._load_lazy(self)
+        return self._extension
+
+    def _available(self, ctx=missing):
+        if ctx is missing or not self._record['available']:
+            return True
+        extension = self._resolve()
+        return extension is not None and extension._available(ctx)
+
+    def _unload(self):
+        if self.loaded:
+            self._extension._unload()
+
+    def unload(self):
+        if self.loaded:
+            self._extension.unload()
+
+    def get_template_paths(self):
+        return list(self._template_paths)
+
+    def has_action(self, identifier):
+        return identifier in self._record['actions']
+
+    def has_tasks(self, identifier):
+        return _match_task_keys(identifier, self._record['tasks'])
+
+    def has_form(self, identifier):
+        return identifier in self._record['forms']
+
+    def get_actions(self, ctx=missing):
+        if not self._record['actions'] or self._resolve() is None:
+            return {}
+        return self._extension.get_actions(ctx)
+
+    def get_tasks(self, identifier, ctx=missing):
+        if not self.has_tasks(identifier) or self._resolve() is None:
+            return []
+        return self._extension.get_tasks(identifier, ctx)
+
+    def get_form(self, action_or_identifier):
+        identifier = get_action_identifier(action_or_identifier)
+        if not self.has_form(identifier) or self._resolve() is None:
+            return None
+        return self._extension.get_form(identifier)
+
+
+class ExtensionManifest(object):
+    '''JSON file recording the Extensions defined by each discovered module.
+
+    Records are keyed by source, a module path or entry point, and are
+    invalidated when the stamp of the source changes. For module paths the
+    stamp is the modification time of the module, for entry points it is the
+    version of the distribution providing the entry point.
+    '''
+
+    version = 1
+
+    def __init__(self, path):
+        self.path = path
+        self._sources = None
+        self._changed = False
+
+    @property
+    def sources(self):
+        if self._sources is None:
+            self._sources = self._read()
+        return self._sources
+
+    def _read(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        if data.get('version') != self.version:
+            return {}
+        return data.get('sources', {})
+
+    def get(self, source, stamp):
+        '''Get the Extension records for source. Returns None if source has
+        not been recorded or it's stamp has changed.'''
+
+        entry = self.sources.get(source)
+        if entry is None or entry['stamp'] != stamp:
+            return None
+        return entry['extensions']
+
+    def set(self, source, stamp, records):
+        entry = {'stamp': stamp, 'extensions': records}
+        if self.sources.get(source) != entry:
+            self.sources[source] = entry
+            self._changed = True
+
+    def save(self):
+        '''Atomically write the manifest when any source has changed,
+        failures are logged and ignored.'''
+
+        if not self._changed:
+            return
+
+        data = {'version': self.version, 'sources': self.sources}
+        try:
+            try:
+                os.makedirs(os.path.dirname(self.path))
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+            atomic_write(
+                self.path,
+                json.dumps(data, indent=2, sort_keys=True)
+            )
+            self._changed = False
+        except (IOError, OSError) as e:
+            _log.debug('Failed to write extension manifest: %s', e)
+
+
 class ExtensionCollector(object):
     '''Handles Extension discovery and registration. Also allows looking
     up extensions via attribute access.'''
@@ -259,13 +477,22 @@ class ExtensionCollector(object):
     def __init__(self):
         self.by_name = OrderedDict()
         self.by_attr = OrderedDict()
+        self.manifest = ExtensionManifest(
+            unipath(CACHE_ROOT, EXTENSION_MANIFEST)
+        )
+
+    @property
+    def version(self):
+        '''See :func:`get_registry_version`'''
+
+        return get_registry_version()
 
     def __getattr__(self, name):
         if name in self.by_name:
-            return self.by_name[name]
+            return _resolve(self.by_name[name])
 
         if name in self.by_attr:
-            return self.by_attr[name]
+            return _resolve(self.by_attr[name])
 
         return self.__getattribute__(name)
 
@@ -278,10 +505,10 @@ class ExtensionCollector(object):
 
     def get(self, name, default=missing):
         if name in self.by_name:
-            return self.by_name[name]
+            return _resolve(self.by_name[name])
 
         if name in self.by_attr:
-            return self.by_attr[name]
+            return _resolve(self.by_attr[name])
 
         if default is not missing:
             return default
@@ -299,6 +526,32 @@ class ExtensionCollector(object):
             _log.debug('Extension already loaded: %s' % extension)
             return
 
+        instance = self._instantiate(extension)
+        if instance is None:
+            return
+
+        self.by_name[extension.name] = instance
+        self.by_attr[extension.attr_name] = instance
+        _registry_changed()
+        _log.debug('Registered extension: %s', extension)
+        return instance
+
+    def register_lazy(self, record, loader):
+        '''Register a LazyExtension from a manifest record. The Extension
+        will be loaded using loader the first time it is needed.'''
+
+        if record['name'] in self.by_name:
+            _log.debug('Extension already loaded: %s' % record['name'])
+            return
+
+        proxy = LazyExtension(self, record, loader)
+        self.by_name[proxy.name] = proxy
+        self.by_attr[proxy.attr_name] = proxy
+        _registry_changed()
+        _log.debug('Registered lazy extension: %s', proxy.name)
+        return proxy
+
+    def _instantiate(self, extension):
         try:
             instance = extension()
             instance._load()
@@ -307,10 +560,27 @@ class ExtensionCollector(object):
                 'Failed to load extension: %s: %s' % (extension, str(e))
             )
             return
+        return instance
 
-        self.by_name[extension.name] = instance
-        self.by_attr[extension.attr_name] = instance
-        _log.debug('Registered extension: %s', extension)
+    def _load_lazy(self, proxy):
+        '''Import and load the Extension a LazyExtension stands in for.'''
+
+        _log.debug('Loading lazy extension: %s', proxy.name)
+        extension = getattr(proxy._loader(), proxy._record['cls'], None)
+        if not is_extension_type(extension):
+            _log.debug('Extension no longer exists: %s', proxy.name)
+            return
+
+        instance = self._instantiate(extension)
+        if instance is None:
+            return
+
+        instance.enabled = proxy.enabled
+        if self.by_name.get(proxy.name) is proxy:
+            self.by_name[proxy.name] = instance
+        if self.by_attr.get(proxy.attr_name) is proxy:
+            self.by_attr[proxy.attr_name] = instance
+        return instance
 
     def unregister(self, extension):
         '''Unregister an extension'''
@@ -328,6 +598,7 @@ class ExtensionCollector(object):
             self.by_name.pop(extension.name)
             self.by_attr.pop(extension.attr_name)
             registered_extension._unload()
+            _registry_changed()
             _log.debug('Unregistered extension: %s', registered_extension)
 
     def clear(self):
@@ -340,6 +611,7 @@ class ExtensionCollector(object):
             del ext
 
         self.by_attr = {}
+        _registry_changed()
 
     def discover(self, *paths):
         '''Discover extensions
@@ -356,9 +628,13 @@ class ExtensionCollector(object):
 
         entry_points = entrypoints.get_group_all(EXTENSIONS_ENTRY_POINT)
         for entry_point in entry_points:
-            obj = entry_point.load()
-            for _, extension in inspect.getmembers(obj, is_extension_type):
-                self.register(extension)
+            source = 'entry_point:%s:%s.%s' % (
+                entry_point.name,
+                entry_point.module_name,
+                entry_point.object_name,
+            )
+            stamp = getattr(entry_point.distro, 'version', None)
+            self._discover_source(source, stamp, entry_point.load)
 
         cfg_search_paths = config.get('EXTENSION_PATHS', [])
         search_paths.extend(cfg_search_paths)
@@ -367,9 +643,43 @@ class ExtensionCollector(object):
         if env_search_paths:
             search_paths.extend(env_search_paths.split(os.pathsep))
 
-        for mod in iter_modules(*search_paths):
-            for _, extension in inspect.getmembers(mod, is_extension_type):
-                self.register(extension)
+        for module_path in iter_module_paths(*search_paths):
+            source = unipath(module_path)
+            self._discover_source(
+                source,
+                get_module_mtime(source),
+                _module_loader(source),
+            )
+
+        self.manifest.save()
+
+    def _discover_source(self, source, stamp, loader):
+        '''Register the Extensions defined by source. When source has a valid
+        manifest record LazyExtensions are registered and source is not
+        imported.'''
+
+        records = None
+        if stamp is not None:
+            records = self.manifest.get(source, stamp)
+
+        if records is not None:
+            loader = _memoize_loader(loader)
+            for record in records:
+                if record['lazy']:
+                    self.register_lazy(record, loader)
+                else:
+                    self.register(getattr(loader(), record['cls']))
+            return
+
+        obj = loader()
+        records = []
+        for attr, extension in inspect.getmembers(obj, is_extension_type):
+            instance = self.register(extension)
+            if instance is not None:
+                records.append(get_manifest_record(instance, attr))
+
+        if stamp is not None:
+            self.manifest.set(source, stamp, records)
 
 
 EXTENSION_TYPES = (Extension, HostExtension)
@@ -385,3 +695,71 @@ def is_extension_type(obj):
 
 def is_extension(obj):
     return isinstance(obj, EXTENSION_TYPES)
+
+
+def get_manifest_record(extension, attr):
+    '''Get the manifest record for a loaded Extension instance. attr is the
+    name of the Extension class in it's module.'''
+
+    available = extension.available
+    return {
+        'name': extension.name,
+        'attr_name': extension.attr_name,
+        'cls': attr,
+        'lazy': bool(getattr(extension, 'lazy', False)),
+        'available': (
+            getattr(available, '__func__', available) is not
+            getattr(Extension.available, '__func__', Extension.available)
+        ),
+        'actions': sorted(extension._actions),
+        'tasks': sorted(k for k, v in extension._tasks.items() if v),
+        'forms': sorted(extension._forms),
+        'template_paths': extension.get_template_paths(),
+    }
+
+
+def get_module_mtime(path):
+    '''Get the modification time of a python module or package. The mtime
+    of a package is the latest mtime of it's python files.'''
+
+    if not os.path.isdir(path):
+        return os.path.getmtime(path)
+
+    mtimes = [os.path.getmtime(path)]
+    for root, subdirs, files in os.walk(path):
+        mtimes.extend(
+            os.path.getmtime(os.path.join(root, file))
+            for file in files if file.endswith('.py')
+        )
+    return max(mtimes)
+
+
+def _module_loader(path):
+    def load_module():
+        return import_file(path, isolated=False)
+    return load_module
+
+
+def _memoize_loader(loader):
+    '''Make sure a module defining multiple extensions is imported once'''
+
+    cache = []
+
+    def load():
+        if not cache:
+            cache.append(loader())
+        return cache[0]
+    return load
+
+
+def _match_task_keys(identifier, keys):
+    for key in keys:
+        if key == identifier or fnmatch(identifier, key):
+            return True
+    return False
+
+
+def _resolve(extension):
+    if isinstance(extension, LazyExtension):
+        return extension._resolve()
+    return extension
@@ -1,29 +1,296 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
+import os
+import copy
+import time
 import getpass
 import datetime
 import fsfs
+from fsfs.constants import DEFAULT_SEARCH_DN_DEPTH
+from itertools import islice
+from collections import namedtuple
+from contextlib import contextmanager
 from scandir import scandir
 from construct.vendor.lucidity.error import ParseError
 from construct.errors import ConfigurationError
-from construct.utils import cached_property
+from construct.utils import (
+    cached_property,
+    update_dict,
+    atomic_write,
+    unipath,
+)
+from construct.appendlog import AppendLog
+from construct.entryindex import find_index
 
 
 factory = fsfs.EntryFactory()
+# Data keys whose lists of records are stored in an AppendLog
+LOG_KEYS = ['comments', 'versions']
+_version_indexes = {}
+# Coarsest directory mtime resolution we expect, FAT and some network shares
+# only store mtimes in 2 second steps
+MTIME_GRANULARITY = 2.0
+
+
+def _write_entry_data(entry_data, data):
+    '''Atomically replace the contents of an fsfs EntryData.
+
+    Mirrors EntryData._write from fsfs 0.3 using atomic_write, it relies on
+    the private _init, _lock, _data and _data_mtime members so review this
+    function when upgrading fsfs.
+    '''
+
+    entry_data._init()
+    with entry_data._lock:
+        atomic_write(entry_data.file, fsfs.encode_data(data))
+        entry_data._data = data
+        entry_data._data_mtime = os.path.getmtime(entry_data.file)
 
 
 class Entry(factory.Entry):
     '''Base class for all Construct Entry types'''
 
     default_thumbnail = ''
+    _batch_depth = 0
+    _batch_data = None
+    _batch_dirty = False
+    _batch_logs = None
+
+    @contextmanager
+    def batch(self):
+        '''Coalesce reads and writes of this Entry's data. The data file is
+        read at most once and written once when the outermost batch exits.
+        Changes are discarded if the batch raises an exception.
+
+        Examples:
+            >>> with entry.batch():  # doctest: +SKIP
+            ...     entry.set_status('complete')
+            ...     entry.write(frame_range=[1001, 1100])
+        '''
 
-    def get_comments(self):
-        '''Get Entry comments'''
+        self._begin_batch()
+        commit = False
+        try:
+            yield self
+            commit = True
+        finally:
+            self._end_batch(commit)
+
+    def _begin_batch(self):
+        self._batch_depth += 1
+
+    def _end_batch(self, commit=True):
+        self._batch_depth -= 1
+        if self._batch_depth:
+            return
+
+        data, dirty = self._batch_data, self._batch_dirty
+        logs = self._batch_logs
+        self._batch_data = None
+        self._batch_dirty = False
+        self._batch_logs = None
+        if not commit:
+            return
+
+        if dirty:
+            self._flush(data)
+        for key, records in (logs or {}).items():
+            self.get_log(key).extend(records)
+
+    def _get_batch_data(self, init=False):
+        if self._batch_data is None:
+            if init:
+                # Like fsfs writes, create the Entry's data if it's missing
+                self.data._init()
+            self._batch_data = copy.deepcopy(self.data.read())
+        return self._batch_data
+
+    def _flush(self, data):
+        '''Atomically write data to this Entry's data file'''
+
+        _write_entry_data(self.data, data)
+        self.data_changed.send(self, dict(data))
+
+    def read(self, *keys):
+        '''Read this Entry's data, reads within a batch use the batch's data.
+
+        Arguments:
+            *keys: If specified, the returned dict will only contain these keys
+                   If only one key is passed, return just the value for that
+                   key and not a dict
+
+        Returns:
+            dict or value
+        '''
+
+        if not self._batch_depth:
+            return super(Entry, self).read(*keys)
+
+        data = self._get_batch_data()
+        if not keys:
+            return data
+
+        if len(keys) == 1:
+            return data[keys[0]]
+
+        return dict((k, data[k]) for k in keys)
+
+    def write(self, replace=False, **data):
+        '''Write data to this Entry. Writes within a batch are flushed when
+        the batch exits.
+
+        Arguments:
+            replace (bool): Replace all data instead of updating it
+            **data: key, value pairs to write to the Entry's data
+        '''
+
+        with self.batch():
+            if replace:
+                self._get_batch_data(init=True)
+                self._batch_data = dict(data)
+            else:
+                update_dict(self._get_batch_data(init=True), data)
+            self._batch_dirty = True
+
+    def remove(self, *keys):
+        '''Remove keys from this Entry's data
+
+        Arguments:
+            *keys: Keys to remove from data
+        '''
+
+        with self.batch():
+            data = self._get_batch_data()
+            for key in keys:
+                data.pop(key, None)
+            self._batch_dirty = True
+
+    def _get_index(self):
+        '''Get the EntryIndex containing this Entry or None when this Entry
+        is not indexed yet, like while it's being copied.'''
+
+        entry_index = find_index(self.path)
+        if entry_index and entry_index.contains(self.path):
+            return entry_index
+
+    def _children(self, levels):
+        '''Search child Entries using the entry index when this Entry is
+        indexed, otherwise walk the directory tree.'''
+
+        entry_index = self._get_index()
+        if entry_index:
+            return entry_index.search(self.path, levels, skip_root=True)
+        return self.children(levels=levels)
+
+    def iter_children(self, tags=None, levels=1, latest_first=False,
+                      limit=None):
+        '''Stream child Entries ordered by path, stopping after limit matches.
+
+        Paths are compared one directory name at a time, an Entry comes
+        before it's children and siblings are ordered by name. The order is
+        the same whether or not the Entry is in an entry index. Unlike
+        :meth:`children` only the Entries yielded are instantiated, so
+        finding the latest few children does not list the whole tree.
+
+        Arguments:
+            tags (list): Only yield Entries with all of these tags
+            levels (int): Number of child Entries deep to search
+            latest_first (bool): Yield Entries in reverse path order
+            limit (int): Maximum number of Entries to yield
+
+        Returns:
+            generator yielding Entry objects
+        '''
+
+        tags = list(tags or [])
+        entry_index = self._get_index()
+        if entry_index:
+            query = entry_index.search(self.path, levels, skip_root=True)
+            return iter(
+                query.tags(*tags).latest_first(latest_first).limit(limit)
+            )
+
+        data_root = fsfs.get_data_root()
+        paths = _iter_child_paths(
+            self.path,
+            levels,
+            latest_first,
+            data_root,
+        )
+        if tags:
+            paths = (p for p in paths if _has_tags(p, tags))
+        return (fsfs.get_entry(p) for p in islice(paths, limit))
+
+    def get_log(self, key):
+        '''Get the AppendLog storing the history of key, like comments.'''
+
+        return AppendLog(unipath(self.data.path, key + '.jsonl'))
+
+    def append_log(self, key, *records):
+        '''Append records to the log of key. Within a batch records are
+        appended when the batch exits and discarded if the batch raises.'''
+
+        with self.batch():
+            if self._batch_logs is None:
+                self._batch_logs = {}
+            self._batch_logs.setdefault(key, []).extend(records)
+
+    def iter_log(self, key, latest_first=False):
+        '''Iterate over the records of key. Records still stored in this
+        Entry's data by older versions come before the log's records.'''
 
         try:
-            return self.read('comments')
+            stored = list(self.read(key))
         except KeyError:
-            return []
+            stored = []
+        pending = list((self._batch_logs or {}).get(key, []))
+        log = self.get_log(key)
+
+        if latest_first:
+            parts = [reversed(pending), log.iter(True), reversed(stored)]
+        else:
+            parts = [stored, log.iter(False), pending]
+        for part in parts:
+            for record in part:
+                yield record
+
+    def migrate_logs(self, *keys):
+        '''Move lists of records stored in this Entry's data to their logs.
+        This is a one-time step for Entries created by older versions,
+        defaults to all LOG_KEYS.
+
+        Returns:
+            list of migrated keys
+        '''
+
+        if self._batch_depth:
+            raise RuntimeError('Can not migrate logs within a batch.')
+
+        migrated = []
+        for key in keys or LOG_KEYS:
+            try:
+                records = list(self.read(key))
+            except KeyError:
+                continue
+
+            # Existing log records are newer than the records in data. The
+            # log is written first so records are never lost, only
+            # duplicated if removing them from data fails.
+            log = self.get_log(key)
+            log.replace(records + list(log))
+            self.remove(key)
+            migrated.append(key)
+        return migrated
+
+    def iter_comments(self, latest_first=False):
+        '''Iterate over Entry comments'''
+
+        return self.iter_log('comments', latest_first)
+
+    def get_comments(self):
+        '''Get Entry comments'''
+
+        return list(self.iter_comments())
 
     def new_comment(self, body):
         '''Add a new comment to Entry'''
@@ -33,9 +300,7 @@ class Entry(factory.Entry):
             time=datetime.datetime.utcnow(),
             body=body
         )
-        comments = self.get_comments()
-        comments.append(comment)
-        self.write(comments=comments)
+        self.append_log('comments', comment)
 
     def get_thumbnail(self):
         '''Get Entry thumbnail'''
@@ -51,12 +316,11 @@ class Entry(factory.Entry):
         self.write_file('thumbnail', file)
 
     def get_status(self):
-        '''Get Entry status'''
+        '''Get Entry status, defaults to waiting'''
 
         try:
             return self.read('status')
         except KeyError:
-            self.set_status('waiting')
             return 'waiting'
 
     def set_status(self, status):
@@ -78,56 +342,71 @@ class Project(Entry):
 
     @property
     def collections(self):
-        return self.children(levels=1).tags('collection')
+        return self._children(levels=1).tags('collection')
 
     @property
     def asset_types(self):
-        return self.children(levels=2).tags('asset_type')
+        return self._children(levels=2).tags('asset_type')
 
     @property
     def assets(self):
-        return self.children(levels=3).tags('asset')
+        return self._children(levels=3).tags('asset')
 
     @property
     def sequences(self):
-        return self.children(levels=2).tags('sequence')
+        return self._children(levels=2).tags('sequence')
 
     @property
     def shots(self):
-        return self.children(levels=3).tags('shot')
+        return self._children(levels=3).tags('shot')
+
+    def iter_assets(self, latest_first=False, limit=None):
+        return self.iter_children(['asset'], 3, latest_first, limit)
+
+    def iter_shots(self, latest_first=False, limit=None):
+        return self.iter_children(['shot'], 3, latest_first, limit)
 
 
 class Collection(Entry):
 
     @property
     def sequences(self):
-        return self.children(levels=1).tags('sequence')
+        return self._children(levels=1).tags('sequence')
 
     @property
     def asset_types(self):
-        return self.children(levels=1).tags('asset_type')
+        return self._children(levels=1).tags('asset_type')
 
     @property
     def assets(self):
-        return self.children(levels=2).tags('asset')
+        return self._children(levels=2).tags('asset')
 
     @property
     def shots(self):
-        return self.children(levels=2).tags('shot')
+        return self._children(levels=2).tags('shot')
+
+    def iter_assets(self, latest_first=False, limit=None):
+        return self.iter_children(['asset'], 2, latest_first, limit)
+
+    def iter_shots(self, latest_first=False, limit=None):
+        return self.iter_children(['shot'], 2, latest_first, limit)
 
 
 class Sequence(Entry):
 
     @property
     def shots(self):
-        return self.children(levels=1).tags('shot')
+        return self._children(levels=1).tags('shot')
+
+    def iter_shots(self, latest_first=False, limit=None):
+        return self.iter_children(['shot'], 1, latest_first, limit)
 
 
 class Shot(Entry):
 
     @property
     def tasks(self, *tags):
-        return self.children(levels=1).tags('task', *tags)
+        return self._children(levels=1).tags('task', *tags)
 
 
 class AssetType(Entry):
@@ -136,14 +415,14 @@ class AssetType(Entry):
 
     @property
     def assets(self):
-        return self.children(levels=1).tags('asset')
+        return self._children(levels=1).tags('asset')
 
 
 class Asset(Entry):
 
     @property
     def tasks(self, *tags):
-        return self.children(levels=1).tags('task', *tags)
+        return self._children(levels=1).tags('task', *tags)
 
     @cached_property
     def type(self):
@@ -177,18 +456,21 @@ class Task(Entry):
 
     @property
     def workspaces(self, *tags):
-        return self.children(levels=1).tags('workspace', *tags)
+        return self._children(levels=1).tags('workspace', *tags)
 
     @property
     def publishes(self, *tags):
-        return self.children(levels=1).tags('publish', *tags)
+        return self._children(levels=1).tags('publish', *tags)
+
+    def iter_publishes(self, latest_first=False, limit=None):
+        return self.iter_children(['publish'], 1, latest_first, limit)
 
     def get_latest_publish(self):
-        publishes = list(self.publishes)
-        try:
-            return publishes[-1]
-        except IndexError:
-            pass
+        '''Get the publish whose name sorts last, publish names are
+        expected to sort in version order like v001, v002.'''
+
+        for publish in self.iter_publishes(latest_first=True, limit=1):
+            return publish
 
 
 class Workspace(Entry):
@@ -213,22 +495,85 @@ class Workspace(Entry):
     def get_work_files(self):
         import construct
         path_template = construct.get_path_template('workspace_file')
+        names = [f.name for f in scandir(self.path) if f.is_file()]
+        parsed, rejects = path_template.parse_many(names)
+        names = [name for name in names if name not in rejects]
+
         versions = {}
-        for f in scandir(self.path):
-            try:
-                data = path_template.parse(f.name)
-                data['version'] = int(data['version'])
-                file_type = construct.get_file_type(f.name)
-                if file_type:
-                    file_type = file_type[0]
-                else:
-                    file_type = data['ext'][1:]
-                data['file_type'] = file_type
-            except ParseError:
-                continue
-            versions[f.name] = data
+        for name, data in zip(names, parsed):
+            versions[name] = _work_file_data(name, data)
         return versions
 
+    def get_version_index(self):
+        '''Get an index of the latest work file versions in this Workspace.
+
+        The index is cached per Workspace and rebuilt when the modification
+        time of the Workspace directory changes. A file saved within the
+        filesystem's mtime granularity of the last build may not change the
+        mtime, so while the cached mtime is that recent the number of
+        directory entries is compared as well.
+
+        Returns:
+            dict mapping (task, name, ext) to the latest version dict
+        '''
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return {}
+
+        cached = _version_indexes.get(self.path)
+        if cached and cached.mtime == mtime:
+            if cached.built - mtime > MTIME_GRANULARITY:
+                return cached.index
+            if cached.count == _count_entries(self.path):
+                return cached.index
+
+        # Taken before listing so files added while listing are noticed
+        built = time.time()
+        count = _count_entries(self.path)
+
+        index = {}
+        for data in self.get_work_files().values():
+            _update_version_index(index, data)
+
+        _version_indexes[self.path] = _VersionIndex(mtime, built, count, index)
+        return index
+
+    def add_work_file(self, file):
+        '''Update the version index in place with a newly saved work file.
+
+        Arguments:
+            file (str): Path to the saved work file
+        '''
+
+        cached = _version_indexes.get(self.path)
+        if not cached:
+            return
+
+        import construct
+        name = os.path.basename(file)
+        path_template = construct.get_path_template('workspace_file')
+        try:
+            data = path_template.parse(name)
+        except ParseError:
+            return
+
+        index = cached.index
+        _update_version_index(index, _work_file_data(name, data))
+
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            _version_indexes.pop(self.path, None)
+        else:
+            _version_indexes[self.path] = _VersionIndex(
+                mtime,
+                time.time(),
+                _count_entries(self.path),
+                index,
+            )
+
     def get_latest_version(self, name, ext):
         '''Get the latest version of a workfile.
 
@@ -239,20 +584,7 @@ class Workspace(Entry):
             version dict
         '''
         task = self.parent().short
-        versions = self.get_work_files()
-        version = 0
-        latest_version = None
-
-        for data in versions.values():
-            is_match = (
-                data['name'] == name and
-                data['task'] == task and
-                data['ext'] == ext
-            )
-            if is_match and data['version'] > version:
-                latest_version = data
-
-        return latest_version
+        return self.get_version_index().get((task, name, ext))
 
     def get_next_version(self, name, ext):
         '''Get the next version number of a workfile.
@@ -263,23 +595,12 @@ class Workspace(Entry):
         Returns:
             int
         '''
-        task = self.parent().short
-        versions = self.get_work_files()
-        version = 0
-
-        for data in versions.values():
-            is_match = (
-                data['name'] == name and
-                data['task'] == task and
-                data['ext'] == ext
-            )
-            if is_match:
-                version = max(version, data['version'])
-
-        return version + 1
+        latest_version = self.get_latest_version(name, ext)
+        if latest_version:
+            return latest_version['version'] + 1
+        return 1
 
     def new_version(self, user, name, version, file_type, file):
-        import os
         relative_path = os.path.relpath(file, self.path)
         version = Version(
             user=user,
@@ -288,10 +609,14 @@ class Workspace(Entry):
             name=name,
             version=version,
         )
-        data = self.read()
-        data.setdefault('versions', [])
-        data['versions'].append(version)
-        self.write(**data)
+        self.append_log('versions', version)
+        self.add_work_file(file)
+
+    def iter_versions(self, latest_first=True):
+        '''Iterate over the versions of this Workspace'''
+
+        for record in self.iter_log('versions', latest_first):
+            yield Version(record)
 
 
 class EmbeddedModel(dict):
@@ -299,7 +624,7 @@ class EmbeddedModel(dict):
     __fields__ = []
 
     def __init__(self, *args, **kwargs):
-        super(Version, self).__init__(*args, **kwargs)
+        super(EmbeddedModel, self).__init__(*args, **kwargs)
         self.__dict__ = self
         for field in self.__fields__:
             if field not in self:
@@ -311,6 +636,88 @@ class Version(EmbeddedModel):
     __field__ = ['user', 'name', 'version', 'file_type', 'file']
 
 
+def _work_file_data(name, data):
+    '''Complete data parsed from a work file name'''
+
+    import construct
+    data['file'] = name
+    data['version'] = int(data['version'])
+    file_type = construct.get_file_type(name)
+    if file_type:
+        file_type = file_type[0]
+    else:
+        file_type = data['ext'][1:]
+    data['file_type'] = file_type
+    return data
+
+
+_VersionIndex = namedtuple('_VersionIndex', 'mtime built count index')
+
+
+def _count_entries(path):
+    try:
+        return len(os.listdir(path))
+    except OSError:
+        return None
+
+
+def _update_version_index(index, data):
+    '''Store data in a version index if it's the latest version'''
+
+    key = (data['task'], data['name'], data['ext'])
+    latest = index.get(key)
+    if not latest or data['version'] >= latest['version']:
+        index[key] = data
+
+
 def is_entry(obj):
     '''Returns True if obj is an instance of Entry or EntryProxy'''
     return isinstance(obj, (factory.Entry, factory.EntryProxy))
+
+
+def _iter_child_paths(root, levels, latest_first, data_root,
+                      depth=DEFAULT_SEARCH_DN_DEPTH, gap=0, level=0,
+                      at_root=True):
+    '''Walk down from root yielding the paths of child Entries in path order
+    with the same depth and levels semantics as fsfs.search. Directories are
+    listed lazily as the generator is consumed.'''
+
+    try:
+        dirs = sorted(
+            (e.name for e in scandir(root) if e.is_dir()),
+            reverse=latest_first
+        )
+    except OSError:
+        return
+
+    is_entry = data_root in dirs and not at_root
+    if data_root in dirs:
+        dirs.remove(data_root)
+        gap = 0
+        if is_entry:
+            level += 1
+
+    if is_entry and not latest_first:
+        yield root
+
+    if not (gap == depth or (levels and level == levels)):
+        for name in dirs:
+            child_paths = _iter_child_paths(
+                root + '/' + name,
+                levels,
+                latest_first,
+                data_root,
+                depth,
+                gap + 1,
+                level,
+                False,
+            )
+            for path in child_paths:
+                yield path
+
+    if is_entry and latest_first:
+        yield root
+
+
+def _has_tags(path, tags):
+    return all(os.path.isfile(fsfs.make_tag_path(path, t)) for t in tags)
@@ -9,9 +9,10 @@ __all__ = [
     'disconnect',
 ]
 
+import re
 import logging
 from collections import defaultdict
-from fnmatch import fnmatch
+from fnmatch import fnmatch, translate
 from contextlib import contextmanager
 from construct.utils import dummy_ctxmanager
 from construct.types import weakset
@@ -19,6 +20,8 @@ from construct.types import weakset
 
 ALL = '*'
 _subscribers = defaultdict(weakset)
+_patterns = {}
+_dispatch_cache = {}
 _suppress = None
 _log = logging.getLogger(__name__)
 
@@ -59,17 +62,42 @@ def get_subscribers(identifier):
         callable subscribers
     '''
 
-    for subscriber in _subscribers[identifier]:
-        yield subscriber
+    for key in get_subscription_keys(identifier):
+        for subscriber in _subscribers.get(key, ()):
+            yield subscriber
 
-    for key in _subscribers.keys():
-        if key == identifier:
-            continue
 
-        # Fuzzy Subscription
-        if fnmatch(identifier, key):
-            for subscriber in _subscribers[key]:
-                yield subscriber
+def get_subscription_keys(identifier):
+    '''Get the subscription keys matching identifier. The exact key comes
+    first followed by matching wildcard keys. Results are memoized per
+    identifier until a subscriber connects or disconnects.
+
+    Arguments:
+        identifier (str): Signal identifier
+
+    Returns:
+        list of keys
+    '''
+
+    try:
+        return _dispatch_cache[identifier]
+    except KeyError:
+        pass
+
+    keys = []
+    if identifier in _subscribers:
+        keys.append(identifier)
+
+    for key, pattern in _patterns.items():
+        if key != identifier and pattern.match(identifier):
+            keys.append(key)
+
+    _dispatch_cache[identifier] = keys
+    return keys
+
+
+def _is_wildcard(key):
+    return any(c in key for c in '*?[')
 
 
 def send(identifier, *args, **kwargs):
@@ -83,7 +111,10 @@ def send(identifier, *args, **kwargs):
         return
 
     results = []
-    for subscriber in get_subscribers(identifier):
+    if not _subscribers:
+        return results
+
+    for subscriber in list(get_subscribers(identifier)):
         results.append(subscriber(*args, **kwargs))
     return results
 
@@ -94,7 +125,7 @@ def chain(identifier, *args, **kwargs):
     Arguments:
         identifier (str): signal identifier
     '''
-    if is_suppressed(identifier):
+    if is_suppressed(identifier) or not _subscribers:
         return
 
     subscribers = list(get_subscribers(identifier))
@@ -132,6 +163,11 @@ def connect(identifier, obj):
         obj (callable): signal subscriber
     '''
 
+    if identifier not in _subscribers:
+        if _is_wildcard(identifier):
+            _patterns[identifier] = re.compile(translate(identifier))
+        _dispatch_cache.clear()
+
     _subscribers[identifier].add(obj)
 
 
@@ -143,4 +179,12 @@ def disconnect(identifier, obj):
         obj (callable): signal subscriber
     '''
 
-    _subscribers[identifier].discard(obj)
+    subscribers = _subscribers.get(identifier)
+    if subscribers is None:
+        return
+
+    subscribers.discard(obj)
+    if not subscribers:
+        _subscribers.pop(identifier, None)
+        _patterns.pop(identifier, None)
+        _dispatch_cache.clear()
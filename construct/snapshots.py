@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+'''
+In-memory snapshots of template Entries. A template's directories, files,
+data and tags are read once and cached, new Entries are created from the
+snapshot by writing it's files using a pool of threads and assigning new
+uuids without re-walking the template.
+'''
+from __future__ import absolute_import
+
+__all__ = [
+    'TemplateSnapshot',
+    'get_snapshot',
+    'copy_template',
+    'clear_snapshots',
+]
+
+import os
+import stat
+import shutil
+import threading
+from fnmatch import fnmatch
+from concurrent import futures
+import fsfs
+from construct.constants import ENTRY_INDEX_FILE
+from construct.utils import unipath
+
+
+MAX_WORKERS = 8
+# Files in data directories never copied from templates, uuids are
+# regenerated, the entry index and append logs belong to the template not to
+# it's copies.
+EXCLUDE = ['uuid_*', ENTRY_INDEX_FILE, '*.jsonl']
+_snapshots = {}
+_lock = threading.Lock()
+
+
+class TemplateSnapshot(object):
+    '''The directories, files, data and tags of a template Entry. Files
+    are stored with their contents and permission bits.
+
+    Arguments:
+        path (str): Path to template Entry
+        data_root (str): Name of fsfs data directories
+    '''
+
+    def __init__(self, path, data_root):
+        self.path = unipath(path)
+        self.data_root = data_root
+        self.dirs = []
+        self.files = []
+        self.entries = []
+        self.tags = {}
+        self.stamps = {}
+        self._read()
+
+    def __repr__(self):
+        return '<TemplateSnapshot>(%s)' % self.path
+
+    def _read(self):
+        for root, subdirs, files in os.walk(self.path):
+            rel_root = os.path.relpath(root, self.path)
+            self.stamps[root] = os.stat(root).st_mtime
+            if rel_root != '.':
+                self.dirs.append(rel_root)
+
+            if os.path.basename(root) == self.data_root:
+                entry = os.path.dirname(rel_root) or '.'
+                self.entries.append(entry)
+                self.tags[entry] = sorted(
+                    f[4:] for f in files if f.startswith('tag_')
+                )
+
+            in_data_root = self.data_root in rel_root.split(os.sep)
+            for file in files:
+                if in_data_root and _is_excluded(file):
+                    continue
+
+                file_path = os.path.join(root, file)
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+                st = os.stat(file_path)
+                self.stamps[file_path] = st.st_mtime
+                self.files.append((
+                    os.path.join(rel_root, file),
+                    data,
+                    stat.S_IMODE(st.st_mode),
+                ))
+
+    @property
+    def stale(self):
+        '''True when the template has changed since it was read. This stats
+        every directory and file of the template, so it costs about as much
+        as walking the template without reading it's files.'''
+
+        for path, mtime in self.stamps.items():
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def instantiate(self, dest, max_workers=MAX_WORKERS):
+        '''Create a new Entry at dest from this snapshot. Files are written
+        using max_workers threads.
+
+        Raises:
+            OSError: when dest already exists or writing fails. Any files
+                partially written are removed.
+        '''
+
+        dest = unipath(dest)
+        if os.path.exists(dest):
+            raise OSError('Can not copy template to existing location...')
+
+        files = list(self.files)
+        for entry in self.entries:
+            uuid_file = os.path.join(
+                entry,
+                self.data_root,
+                'uuid_' + fsfs.generate_id()
+            )
+            files.append((uuid_file, b'', None))
+
+        try:
+            os.makedirs(dest)
+            for rel_path in self.dirs:
+                os.makedirs(os.path.join(dest, rel_path))
+
+            def write(file):
+                rel_path, data, mode = file
+                file_path = os.path.join(dest, rel_path)
+                with open(file_path, 'wb') as f:
+                    f.write(data)
+                if mode is not None:
+                    os.chmod(file_path, mode)
+
+            if max_workers > 1 and len(files) > 1:
+                with futures.ThreadPoolExecutor(max_workers) as executor:
+                    list(executor.map(write, files))
+            else:
+                for file in files:
+                    write(file)
+        except:
+            if os.path.exists(dest):
+                shutil.rmtree(dest)
+            raise
+
+        new_entry = fsfs.get_entry(dest)
+        new_entry.created.send(new_entry)
+        for rel_path in self.entries:
+            if rel_path == '.':
+                continue
+            child = fsfs.get_entry(unipath(dest, rel_path))
+            child.created.send(child)
+        return new_entry
+
+
+def _is_excluded(file):
+    return any(fnmatch(file, pattern) for pattern in EXCLUDE)
+
+
+def get_snapshot(template):
+    '''Get a cached TemplateSnapshot of a template Entry. The snapshot is
+    read again when the template has changed, see TemplateSnapshot.stale.'''
+
+    key = (unipath(template.path), fsfs.get_data_root())
+    with _lock:
+        snapshot = _snapshots.get(key)
+        if snapshot is None or snapshot.stale:
+            snapshot = _snapshots[key] = TemplateSnapshot(*key)
+        return snapshot
+
+
+def copy_template(template, dest, max_workers=MAX_WORKERS):
+    '''Create a new Entry at dest from a template Entry. Like
+    template.copy(dest) but the template is only read once per process.'''
+
+    return get_snapshot(template).instantiate(dest, max_workers)
+
+
+def clear_snapshots():
+    '''Clear all cached TemplateSnapshots'''
+
+    with _lock:
+        _snapshots.clear()
@@ -1,18 +1,39 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 from functools import wraps
-from construct.constants import TIMER
+from collections import OrderedDict
+from construct.constants import (
+    TIMER,
+    RUNNING,
+    SUCCESS,
+    FAILED,
+    SKIPPED,
+    DISABLED,
+)
 from construct.utils import get_qualname
+from construct import signals
 from contextlib import contextmanager
+import os
+import json
+import random
 import logging
+import threading
 
 
 _log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_profiles = {}
+MAX_SAMPLES = 1000
 
 
 class Stats(object):
     '''Collection of :class:`Action` execution stats
 
+    Stats are collected from the action.*, group.* and
+    request.status.changed signals while the Action runs and are available as
+    action.stats. Times are in seconds. Actions that suppress signals do not
+    collect stats.
+
     Attributes:
         number_of_failures
         number_of_successes
@@ -23,7 +44,144 @@ class Stats(object):
         task_times
         average_task_time
     '''
-    # TODO: Implement stats
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.start_time = None
+        self.end_time = None
+        self.group_times = OrderedDict()
+        self.task_times = OrderedDict()
+        self.task_statuses = OrderedDict()
+        self._group_starts = {}
+        self._task_starts = {}
+        self._depth = 0
+
+    def __repr__(self):
+        return '<Stats>(%s)' % self.to_json()
+
+    @contextmanager
+    def collect(self):
+        '''Collect stats from signals while in this context'''
+
+        self._depth += 1
+        if self._depth == 1:
+            signals.connect('action.before', self.on_action_before)
+            signals.connect('action.after', self.on_action_after)
+            signals.connect('group.before', self.on_group_before)
+            signals.connect('group.after', self.on_group_after)
+            signals.connect(
+                'request.status.changed',
+                self.on_request_status_changed
+            )
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                signals.disconnect('action.before', self.on_action_before)
+                signals.disconnect('action.after', self.on_action_after)
+                signals.disconnect('group.before', self.on_group_before)
+                signals.disconnect('group.after', self.on_group_after)
+                signals.disconnect(
+                    'request.status.changed',
+                    self.on_request_status_changed
+                )
+
+    def on_action_before(self, ctx):
+        if ctx is self.ctx:
+            self.start_time = TIMER()
+            self.end_time = None
+
+    def on_action_after(self, ctx):
+        if ctx is self.ctx:
+            self.end_time = TIMER()
+
+    def on_group_before(self, group):
+        if group.runner.ctx is self.ctx:
+            self._group_starts[group.priority] = TIMER()
+
+    def on_group_after(self, group):
+        if group.runner.ctx is not self.ctx:
+            return
+
+        start_time = self._group_starts.pop(group.priority, None)
+        if start_time is not None:
+            self.group_times[group.priority.label] = TIMER() - start_time
+
+    def on_request_status_changed(self, request, last_status, status):
+        if request.ctx is not self.ctx:
+            return
+
+        identifier = request.task.identifier
+        if status == RUNNING:
+            self._task_starts[identifier] = TIMER()
+            return
+
+        if status in (SUCCESS, FAILED, SKIPPED, DISABLED):
+            self.task_statuses[identifier] = status
+            start_time = self._task_starts.pop(identifier, None)
+            if start_time is not None:
+                self.task_times[identifier] = TIMER() - start_time
+
+    def _count(self, status):
+        return sum(1 for s in self.task_statuses.values() if s == status)
+
+    @property
+    def number_of_failures(self):
+        return self._count(FAILED)
+
+    @property
+    def number_of_successes(self):
+        return self._count(SUCCESS)
+
+    @property
+    def number_of_skips(self):
+        return self._count(SKIPPED)
+
+    @property
+    def total_execution_time(self):
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or TIMER()) - self.start_time
+
+    @property
+    def average_group_time(self):
+        return _average(self.group_times.values())
+
+    @property
+    def average_task_time(self):
+        return _average(self.task_times.values())
+
+    def slowest_tasks(self, count=5):
+        '''Get a list of (identifier, time) pairs of the slowest tasks'''
+
+        items = sorted(self.task_times.items(), key=lambda i: -i[1])
+        return items[:count]
+
+    def to_dict(self):
+        return dict(
+            action=getattr(self.ctx.action, 'identifier', None),
+            number_of_failures=self.number_of_failures,
+            number_of_successes=self.number_of_successes,
+            number_of_skips=self.number_of_skips,
+            total_execution_time=self.total_execution_time,
+            group_times=dict(self.group_times),
+            average_group_time=self.average_group_time,
+            task_times=dict(self.task_times),
+            average_task_time=self.average_task_time,
+            task_statuses=dict(self.task_statuses),
+        )
+
+    def to_json(self, **kwargs):
+        kwargs.setdefault('sort_keys', True)
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def _average(values):
+    values = list(values)
+    if not values:
+        return 0.0
+    return sum(values) / float(len(values))
 
 
 @contextmanager
@@ -36,13 +194,187 @@ def log_time(msg):
         _log.info('%s: %.8fs', msg, TIMER() - start_time)
 
 
+class CallStats(object):
+    '''Aggregated timings of calls to a function profiled by log_call.
+
+    Percentiles are computed from a uniform reservoir sample of at most
+    MAX_SAMPLES timings.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.timed_calls = 0
+        self.total_time = 0.0
+        self.min_time = None
+        self.max_time = None
+        self.samples = []
+
+    def __repr__(self):
+        return '<CallStats>(%s, calls=%d)' % (self.name, self.calls)
+
+    def add(self, duration=None):
+        '''Record a call, duration is None for calls that were not sampled'''
+
+        self.calls += 1
+        if duration is None:
+            return
+
+        self.timed_calls += 1
+        self.total_time += duration
+        if self.min_time is None or duration < self.min_time:
+            self.min_time = duration
+        if self.max_time is None or duration > self.max_time:
+            self.max_time = duration
+
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(duration)
+        else:
+            index = random.randint(0, self.timed_calls - 1)
+            if index < MAX_SAMPLES:
+                self.samples[index] = duration
+
+    @property
+    def average_time(self):
+        if not self.timed_calls:
+            return 0.0
+        return self.total_time / self.timed_calls
+
+    def percentile(self, percent):
+        '''Get the timing at percent (0-100) of the sampled timings'''
+
+        if not self.samples:
+            return 0.0
+        samples = sorted(self.samples)
+        index = int(round(percent / 100.0 * (len(samples) - 1)))
+        return samples[index]
+
+    def to_dict(self):
+        return dict(
+            name=self.name,
+            calls=self.calls,
+            timed_calls=self.timed_calls,
+            total_time=self.total_time,
+            average_time=self.average_time,
+            min_time=self.min_time or 0.0,
+            max_time=self.max_time or 0.0,
+            p50=self.percentile(50),
+            p90=self.percentile(90),
+            p99=self.percentile(99),
+        )
+
+
+def enable_profiling(sample_rate=1.0):
+    '''Start aggregating timings of functions wrapped by log_call.
+
+    Arguments:
+        sample_rate (float): Fraction of calls to time, all calls are counted
+    '''
+
+    global _sample_rate
+    _sample_rate = float(sample_rate)
+
+
+def disable_profiling():
+    '''Stop profiling, functions wrapped by log_call are called directly'''
+
+    global _sample_rate
+    _sample_rate = None
+
+
+def is_profiling():
+    return _sample_rate is not None
+
+
+def reset_profile():
+    '''Clear all aggregated timings'''
+
+    with _lock:
+        _profiles.clear()
+
+
+def get_report(sort='total_time'):
+    '''Get a list of aggregated timings per function as dicts.
+
+    Arguments:
+        sort (str): Key to sort by in descending order
+    '''
+
+    with _lock:
+        report = [stats.to_dict() for stats in _profiles.values()]
+    return sorted(report, key=lambda d: d[sort], reverse=True)
+
+
+def format_report(sort='total_time', limit=None):
+    '''Format the profile report as a table'''
+
+    columns = [
+        ('name', '{:<40}', '{:<40}'),
+        ('calls', '{:>8}', '{:>8d}'),
+        ('total_time', '{:>12}', '{:>12.6f}'),
+        ('average_time', '{:>12}', '{:>12.6f}'),
+        ('min_time', '{:>10}', '{:>10.6f}'),
+        ('max_time', '{:>10}', '{:>10.6f}'),
+        ('p50', '{:>10}', '{:>10.6f}'),
+        ('p90', '{:>10}', '{:>10.6f}'),
+        ('p99', '{:>10}', '{:>10.6f}'),
+    ]
+    lines = [' '.join(h.format(c) for c, h, _ in columns)]
+    for row in get_report(sort)[:limit]:
+        lines.append(' '.join(f.format(row[c]) for c, _, f in columns))
+    return '\n'.join(lines)
+
+
+def _record(name, duration):
+    with _lock:
+        stats = _profiles.get(name)
+        if stats is None:
+            stats = _profiles[name] = CallStats(name)
+        stats.add(duration)
+
+
+def _profile_call(name, fn, args, kwargs):
+    sample_rate = _sample_rate
+    if sample_rate is None:
+        return fn(*args, **kwargs)
+
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        _record(name, None)
+        return fn(*args, **kwargs)
+
+    start_time = TIMER()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _record(name, TIMER() - start_time)
+
+
 def log_call(fn):
-    '''Log execution time of a wrapped function'''
+    '''Profile calls to the wrapped function. Calls are aggregated per
+    function when profiling is enabled, see :func:`enable_profiling`, and
+    otherwise the wrapped function is called directly.'''
+
+    name = get_qualname(fn)
+
     @wraps(fn)
     def _logged_call(*args, **kwargs):
-        start_time = TIMER()
-        try:
+        if _sample_rate is None:
             return fn(*args, **kwargs)
-        finally:
-            _log.info('%s(): %.8fs', get_qualname(fn), TIMER() - start_time)
+        return _profile_call(name, fn, args, kwargs)
     return _logged_call
+
+
+def _get_env_sample_rate():
+    value = os.environ.get('CONSTRUCT_PROFILE')
+    if not value:
+        return None
+
+    try:
+        sample_rate = float(value)
+    except ValueError:
+        return 1.0
+
+    return sample_rate if sample_rate > 0 else None
+
+
+_sample_rate = _get_env_sample_rate()
@@ -5,11 +5,16 @@ __all__ = [
     'RequestThread',
     'AsyncRequest',
     'AsyncTask',
+    'ProcessRequest',
+    'ProcessTask',
     'Request',
     'Task',
     'TaskCollection',
     'task',
     'async_task',
+    'process_task',
+    'get_process_pool',
+    'shutdown_process_pool',
     'sort_tasks',
     'group_tasks',
     'requires',
@@ -26,8 +31,10 @@ __all__ = [
     'artifact',
     'returns',
     'kwarg',
+    'wait_any',
 ]
 
+import os
 import threading
 import sys
 import inspect
@@ -49,6 +56,7 @@ from construct import signals
 
 
 _log = logging.getLogger(__name__)
+_process_pool = None
 DEFAULT_PRIORITY = Priority(0)
 
 
@@ -90,14 +98,15 @@ class RequestThread(threading.Thread):
                         **self.request.kwargs
                     )
 
-                    # Finish task
-                    self.request.set_value(result)
+                    # Finish task, run callbacks before signalling completion
+                    self.request._value = result
                     self.request._after_task()
+                    self.request.set_value(result)
                     break
 
                 except:
-                    self.request.set_exception(*sys.exc_info())
                     if retries >= self.retries:
+                        self.request.set_exception(*sys.exc_info())
                         break
 
                 retries += 1
@@ -122,7 +131,7 @@ class RequestThread(threading.Thread):
             self.join()
 
     def ready(self):
-        return self.request._status in DONE_STATUSES
+        return self.request.completed
 
     def _get_ready(self, propagate=True):
 
@@ -134,13 +143,13 @@ class RequestThread(threading.Thread):
                 six.reraise(*self.request._exc)
             return self.request._exc
 
-    def get(self, timeout=None, interval=0.2, propagate=True):
+    def get(self, timeout=None, interval=None, propagate=True):
+        '''Block until the request is complete and return it's result. The
+        interval argument is no longer used and only kept for compatibility.
+        '''
 
-        st = TIMER()
-        while not self.ready():
-            if timeout is not None and TIMER() - st > timeout:
-                raise TimeoutError('Result not ready yet...')
-            SLEEP(interval)
+        if not self.request.wait(timeout):
+            raise TimeoutError('Result not ready yet...')
 
         return self._get_ready(propagate)
 
@@ -157,6 +166,8 @@ class Request(object):
         self._status = None
         self._exc = None
         self._value = None
+        self._completed = threading.Event()
+        self._waiters = []
         self.push()
         self.set_status(WAITING)
         self.pop()
@@ -180,6 +191,7 @@ class Request(object):
     def set_value(self, value):
         self._value = value
         self.set_status(SUCCESS)
+        self._set_completed()
 
     @property
     def exception(self):
@@ -188,6 +200,38 @@ class Request(object):
     def set_exception(self, *exc_info):
         self._exc = exc_info
         self.set_status(FAILED)
+        self._set_completed()
+
+    @property
+    def completed(self):
+        '''True once a value or exception has been set'''
+
+        return self._completed.is_set()
+
+    def wait(self, timeout=None):
+        '''Block until a value or exception has been set.
+
+        Returns:
+            True if the request completed, False if timeout was reached
+        '''
+
+        if timeout == 0:
+            return self._completed.is_set()
+        return self._completed.wait(timeout)
+
+    def _set_completed(self):
+        self._completed.set()
+        for waiter in list(self._waiters):
+            waiter.set()
+
+    def _add_waiter(self, event):
+        self._waiters.append(event)
+
+    def _remove_waiter(self, event):
+        try:
+            self._waiters.remove(event)
+        except ValueError:
+            pass
 
     @property
     def status(self):
@@ -259,9 +303,10 @@ class Request(object):
             # Run task
             result = self.task(*self.args, **self.kwargs)
 
-            # Finish task
-            self.set_value(result)
+            # Finish task, run callbacks before signalling completion
+            self._value = result
             self._after_task()
+            self.set_value(result)
             return result
 
         except:
@@ -284,7 +329,7 @@ class AsyncRequest(Request):
         super(AsyncRequest, self).__init__(task, ctx, args, kwargs)
         self._thread = RequestThread(self)
 
-    def get(self, timeout=None, interval=0.2, propagate=True):
+    def get(self, timeout=None, interval=None, propagate=True):
 
         try:
 
@@ -300,6 +345,115 @@ class AsyncRequest(Request):
             self.pop()
 
 
+class ProcessRequest(AsyncRequest):
+    '''Request that runs it's task in a shared process pool.
+
+    Parameters are resolved and result callbacks are run in the calling
+    process, only the task function and it's arguments are sent to the pool.
+    Callbacks run in the thread that collects the result by calling get.
+    Arguments and return values must be picklable.
+
+    Tasks whose module can not be imported by the pool's workers, like
+    modules loaded from an extension path, run in the calling thread instead.
+    '''
+
+    def __init__(self, task, ctx=None, args=None, kwargs=None):
+        super(AsyncRequest, self).__init__(task, ctx, args, kwargs)
+        self._future = None
+        self._in_process = False
+        self._finish_lock = threading.Lock()
+
+    @property
+    def completed(self):
+        '''True once the pool has returned a result, the result is handled
+        by the next call to get.'''
+
+        return (
+            self._completed.is_set() or
+            (self._future is not None and self._future.done())
+        )
+
+    def wait(self, timeout=None):
+        if self._future is None:
+            return super(ProcessRequest, self).wait(timeout)
+        return _wait_future(self._future, timeout)
+
+    def _start(self):
+        reference = _task_reference(self.task)
+        if not _is_importable(reference):
+            _log.warning(
+                'Running %s in process, %s can not be imported by the '
+                'process pool.',
+                self.task.identifier,
+                getattr(self.task.fn, '__module__', self.task.fn),
+            )
+            self._in_process = True
+            return
+
+        try:
+            self.push()
+            self._before_task()
+            self.set_status(RUNNING)
+            self._future = get_process_pool().submit(
+                _call_in_process,
+                reference,
+                self.args,
+                self.kwargs
+            )
+        except:
+            self.set_exception(*sys.exc_info())
+            return
+        finally:
+            self.pop()
+
+        self._future.add_done_callback(self._on_done)
+
+    def _on_done(self, future):
+        # Runs in the pool's callback thread. Only wake threads waiting for
+        # this request, they handle the result in get.
+        for waiter in list(self._waiters):
+            waiter.set()
+
+    def _finish(self):
+        '''Run callbacks and set the value of a finished future'''
+
+        with self._finish_lock:
+            if self._completed.is_set():
+                return
+
+            try:
+                self.push()
+                result = self._future.result()
+                self._value = result
+                self._after_task()
+                self.set_value(result)
+            except:
+                self.set_exception(*sys.exc_info())
+            finally:
+                self.pop()
+
+    def get(self, timeout=None, interval=None, propagate=True):
+
+        if self._future is None and not self._in_process:
+            if not self._completed.is_set():
+                self._start()
+
+        if self._in_process:
+            return Request.get(self, propagate)
+
+        if not self._completed.is_set():
+            if not _wait_future(self._future, timeout):
+                raise TimeoutError('Result not ready yet...')
+            self._finish()
+
+        if self.failed:
+            if propagate:
+                six.reraise(*self._exc)
+            return self._exc
+
+        return self._value
+
+
 class Task(object):
 
     request_cls = Request
@@ -399,6 +553,22 @@ class Task(object):
 
         return False
 
+    def dependencies(self):
+        '''Get the identifiers of the tasks this task's requires and skips
+        predicates depend on. Predicates created by :func:`success`,
+        :func:`done` and :func:`failure` declare their dependency, for any
+        other predicate the dependencies are unknown and None is returned.
+        '''
+
+        dependencies = set()
+        for fn in (self.requires or []) + (self.skips or []):
+            identifier = getattr(fn, '__task_dependency__', None)
+            if identifier is None:
+                return None
+            dependencies.add(identifier)
+
+        return dependencies
+
     def get_params(self, ctx):
 
         args, kwargs = [], {}
@@ -436,6 +606,11 @@ class AsyncTask(Task):
     request_cls = AsyncRequest
 
 
+class ProcessTask(Task):
+
+    request_cls = ProcessRequest
+
+
 class TaskCollection(object):
 
     identifier = None
@@ -604,6 +779,114 @@ def async_task(identifier, priority=None, description=None, cls=AsyncTask):
     return task(identifier, priority, description, cls)
 
 
+def process_task(identifier, priority=None, description=None,
+                 cls=ProcessTask):
+    '''Like :func:`task` decorator. This returns a ProcessTask which will be
+    run in a shared process pool when an Action is evaluated. Use this for
+    CPU bound tasks. Can still be called normally like a standard function.
+
+    The decorated function must be defined at the module level of an
+    importable module and it's arguments and return value must be picklable.
+
+    Arguments:
+        identifier (str or callable): When a string is passed, return
+            a decorator which passes the string to the Task object as it's
+            identifier. If a callable is passed, use the callables name as
+            the Task's identifier.
+        priority (Priority or int): Priority used to order tasks in an action
+        description (str): Defaults to the decorated functions docstring
+        cls (Object): Task type to create, defaults to ProcessTask
+
+    Returns:
+        ProcessTask or instance of cls
+    '''
+
+    return task(identifier, priority, description, cls)
+
+
+def get_process_pool():
+    '''Get the process pool shared by all ProcessRequests'''
+
+    global _process_pool
+    if _process_pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _process_pool = ProcessPoolExecutor()
+    return _process_pool
+
+
+def shutdown_process_pool(wait=True):
+    '''Shutdown the process pool shared by all ProcessRequests'''
+
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=wait)
+        _process_pool = None
+
+
+def _task_reference(task):
+    '''Get a picklable reference to a task's function. The task decorator
+    replaces the function in it's module, so module level functions are
+    referenced by module and name and looked up again in the worker.'''
+
+    fn = task.fn
+    module = getattr(fn, '__module__', None)
+    name = getattr(fn, '__name__', None)
+    if module and name and module != '__main__':
+        return module, name
+    return fn
+
+
+def _is_importable(reference):
+    '''True when the module of a task reference can be imported by the
+    process pool's workers. Modules imported by path, like extension
+    modules, are not on sys.path and can not be found by a new process.'''
+
+    if not isinstance(reference, tuple):
+        return True
+
+    module_name, _ = reference
+    module = sys.modules.get(module_name)
+    module_file = getattr(module, '__file__', None)
+    if module_file is None:
+        return False
+
+    # The module must be found at the same location on sys.path
+    module_root = os.path.splitext(os.path.abspath(module_file))[0]
+    if os.path.basename(module_root) == '__init__':
+        module_root = os.path.dirname(module_root)
+    parts = module_name.split('.')
+    for path in sys.path:
+        if os.path.abspath(os.path.join(path or '.', *parts)) == module_root:
+            return True
+    return False
+
+
+def _wait_future(future, timeout=None):
+    '''Wait for a future, returns True when the future is done.'''
+
+    if timeout == 0:
+        return future.done()
+
+    from concurrent.futures import wait
+    wait([future], timeout)
+    return future.done()
+
+
+def _call_in_process(reference, args, kwargs):
+    '''Call a task function referenced by :func:`_task_reference`'''
+
+    if isinstance(reference, tuple):
+        module, name = reference
+        __import__(module)
+        fn = getattr(sys.modules[module], name)
+        if isinstance(fn, Task):
+            fn = fn.fn
+    else:
+        fn = reference
+
+    return fn(*args, **kwargs)
+
+
 def requires(*funcs):
     '''Task decorator describing a tasks's requirements.
 
@@ -773,6 +1056,7 @@ def success(identifier):
         except KeyError:
             raise TaskError('success(%r): Request not found..' % identifier)
 
+    success.__task_dependency__ = identifier
     return success
 
 
@@ -787,6 +1071,7 @@ def done(identifier):
         except KeyError:
             raise TaskError('done(%r): Request not found..' % identifier)
 
+    done.__task_dependency__ = identifier
     return done
 
 
@@ -801,6 +1086,7 @@ def failure(identifier):
         except KeyError:
             raise TaskError('failure(%r): Request not found..' % identifier)
 
+    failure.__task_dependency__ = identifier
     return failure
 
 
@@ -1003,6 +1289,39 @@ def _setter_for(name, obj):
     )
 
 
+def wait_any(requests, timeout=None):
+    '''Block until any of the requests completes.
+
+    Arguments:
+        requests (list): Request objects to wait for
+        timeout (float): Maximum number of seconds to wait
+
+    Returns:
+        list of completed requests, empty if the timeout was reached
+    '''
+
+    requests = list(requests)
+    completed = [r for r in requests if r.completed]
+    if completed or timeout == 0:
+        return completed
+
+    event = threading.Event()
+    for request in requests:
+        request._add_waiter(event)
+
+    try:
+        # Check again in case a request completed before we were waiting
+        completed = [r for r in requests if r.completed]
+        if not completed:
+            event.wait(timeout)
+            completed = [r for r in requests if r.completed]
+    finally:
+        for request in requests:
+            request._remove_waiter(event)
+
+    return completed
+
+
 # Sort methods
 
 def sort_tasks(tasks):
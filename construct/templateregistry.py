@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+'''
+In-memory index of the template Entries found on a list of template search
+paths. Registries are validated by the modification times of their search
+paths and of each template's data directory, so looking up templates only
+stats those directories. Search paths are listed again when templates are
+added, removed or retagged.
+'''
+from __future__ import absolute_import
+
+__all__ = [
+    'TemplateRegistry',
+    'get_registry',
+    'clear_registries',
+]
+
+import os
+from collections import OrderedDict, defaultdict
+import fsfs
+
+
+REGISTRY_CACHE_SIZE = 32
+_registries = OrderedDict()
+
+
+class TemplateRegistry(object):
+    '''Templates found on paths indexed by name and tag. When more than one
+    template matching the requested tags has the same name the first found
+    is used, so a template only shadows a later template with the same name
+    when it also has the requested tags.
+
+    Arguments:
+        paths (list): Template search paths in priority order
+    '''
+
+    def __init__(self, paths):
+        self.paths = tuple(paths)
+        self.stamps = None
+        self.data_paths = ()
+        self.templates = []
+        self.by_name = OrderedDict()
+        self.by_tag = defaultdict(list)
+
+    def __repr__(self):
+        return '<TemplateRegistry>(%s)' % ', '.join(self.paths)
+
+    def _get_stamps(self):
+        return tuple(_get_mtime(p) for p in self.paths + self.data_paths)
+
+    def refresh(self, force=False):
+        '''Index the templates on our paths again if a path has changed'''
+
+        stamps = self._get_stamps()
+        if stamps == self.stamps and not force:
+            return
+
+        # Stamps are taken before listing so changes made while listing are
+        # picked up by the next refresh
+        stamps = list(stamps[:len(self.paths)])
+        data_paths = []
+        templates = []
+        by_name = OrderedDict()
+        by_tag = defaultdict(list)
+        for path in self.paths:
+            if not os.path.isdir(path):
+                continue
+
+            for template in fsfs.search(path, depth=1):
+                index = len(templates)
+                templates.append(template)
+                by_name.setdefault(template.name, template)
+                data_paths.append(template.data.path)
+                stamps.append(_get_mtime(template.data.path))
+                for tag in template.tags:
+                    by_tag[tag].append(index)
+
+        self.data_paths = tuple(data_paths)
+        self.templates = templates
+        self.by_name = by_name
+        self.by_tag = by_tag
+        self.stamps = tuple(stamps)
+
+    def get_templates(self, *tags):
+        '''Get a dict of templates with all of the given tags'''
+
+        self.refresh()
+
+        if not tags:
+            return OrderedDict(self.by_name)
+
+        # Filter by tags before taking the first template of each name
+        indexes = set.intersection(
+            *(set(self.by_tag.get(tag, ())) for tag in tags)
+        )
+        matches = OrderedDict()
+        for index in sorted(indexes):
+            template = self.templates[index]
+            matches.setdefault(template.name, template)
+        return matches
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def get_registry(paths):
+    '''Get the cached TemplateRegistry for a list of search paths'''
+
+    key = (tuple(paths), fsfs.get_data_root())
+    registry = _registries.pop(key, None)
+    if registry is None:
+        registry = TemplateRegistry(paths)
+
+    _registries[key] = registry
+    while len(_registries) > REGISTRY_CACHE_SIZE:
+        _registries.popitem(last=False)
+
+    return registry
+
+
+def clear_registries():
+    '''Clear all cached TemplateRegistries'''
+
+    _registries.clear()
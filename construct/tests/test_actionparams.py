@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
 from nose.tools import raises
-from construct import actionparams
+from construct import actionparams, Action
+from construct.context import Context
 from construct.errors import ArgumentError
 
 
@@ -55,3 +56,61 @@ def test_missing_required():
         params_1,
         {'str_arg': 'str', 'dict_arg': {}}
     )
+
+
+def test_deferred_defaults():
+    '''Deferred defaults are computed once and only for missing kwargs'''
+
+    calls = []
+
+    def next_version():
+        calls.append(1)
+        return 10
+
+    class DeferredAction(Action):
+        label = 'Deferred Action'
+        identifier = 'test.deferred'
+        param_calls = []
+
+        @classmethod
+        def parameters(cls, ctx):
+            cls.param_calls.append(ctx)
+            return dict(
+                version={
+                    'label': 'Version',
+                    'required': True,
+                    'type': int,
+                    'default': actionparams.deferred(next_version),
+                    'options': actionparams.deferred(lambda: [1, 10]),
+                }
+            )
+
+        @staticmethod
+        def available(ctx):
+            return True
+
+    action = DeferredAction(ctx=Context(), version=1)
+    assert action.ctx.kwargs['version'] == 1
+    assert calls == []
+
+    action = DeferredAction(ctx=Context())
+    assert action.ctx.kwargs['version'] == 10
+    assert calls == [1]
+
+    # Parameters are computed once per Action
+    assert len(DeferredAction.param_calls) == 2
+
+
+@raises(ArgumentError)
+def test_deferred_options():
+    '''Validate kwargs against deferred options'''
+
+    params = dict(
+        choice={
+            'label': 'Choice',
+            'type': str,
+            'options': actionparams.deferred(lambda: ['a', 'b']),
+        }
+    )
+    assert actionparams.validate_kwargs(params, {'choice': 'a'})
+    actionparams.validate_kwargs(params, {'choice': 'c'})
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import json
+import time
+import threading
+from timeit import default_timer
+import construct
+from construct import Action, Extension
+from construct.actionrunner import ThreadPoolActionRunner
+from construct.context import Context
+from construct.constants import SUCCESS, SKIPPED
+from construct.tasks import (
+    task,
+    async_task,
+    process_task,
+    requires,
+    skips,
+    params,
+    returns,
+    store,
+    success,
+    failure,
+)
+
+
+class RunnerAction(Action):
+    '''Action used to test the ActionRunner'''
+
+    label = 'Runner Action'
+    identifier = 'test.runner'
+
+    @staticmethod
+    def available(ctx):
+        return True
+
+
+@task
+@requires(success('first'))
+@params(store('first'))
+@returns(store('second'))
+def second(value):
+    return value + 1
+
+
+@async_task('third')
+@requires(success('second'))
+@params(store('second'))
+@returns(store('third'))
+def third(value):
+    return value + 1
+
+
+@task
+@requires(store('third'))
+@params(store('third'))
+@returns(store('opaque'))
+def opaque(value):
+    return value + 1
+
+
+@task
+@requires(failure('first'))
+def on_failure():
+    return True
+
+
+@task
+@requires(success('first'))
+@skips(success('first'))
+def skipped():
+    return True
+
+
+@task
+@returns(store('first'))
+def first():
+    return 1
+
+
+class ThreadedAction(Action):
+    '''Action used to test the ThreadPoolActionRunner'''
+
+    label = 'Threaded Action'
+    identifier = 'test.threaded'
+    runner_cls = ThreadPoolActionRunner
+    max_workers = 4
+
+    @staticmethod
+    def available(ctx):
+        return True
+
+
+def make_sleeper(identifier):
+
+    @task(identifier)
+    @returns(store(identifier))
+    def sleeper():
+        time.sleep(0.2)
+        ctx = construct.get_context()
+        return threading.current_thread().name, ctx.action.identifier
+
+    return sleeper
+
+
+@task
+@requires(*[success('sleeper%d' % i) for i in range(4)])
+@params(*[store('sleeper%d' % i) for i in range(4)])
+@returns(store('gather'))
+def gather(*results):
+    return results
+
+
+class ProcessAction(Action):
+    '''Action used to test ProcessRequests in the ActionRunner'''
+
+    label = 'Process Action'
+    identifier = 'test.process'
+
+    @staticmethod
+    def available(ctx):
+        return True
+
+
+callback_threads = []
+
+
+def record_thread(ctx, value):
+    callback_threads.append(threading.current_thread())
+
+
+@process_task('process_pid')
+@returns(store('pid'))
+@returns(record_thread)
+def process_pid():
+    return os.getpid()
+
+
+class RunnerExtension(Extension):
+    name = 'RunnerExtension'
+    attr_name = 'runner_extension'
+
+    def load(self):
+        self.add_action(RunnerAction)
+        for t in (second, third, opaque, on_failure, skipped, first):
+            self.add_task(RunnerAction, t)
+
+        self.add_action(ThreadedAction)
+        for i in range(4):
+            self.add_task(ThreadedAction, make_sleeper('sleeper%d' % i))
+        self.add_task(ThreadedAction, gather)
+
+        self.add_action(ProcessAction)
+        self.add_task(ProcessAction, process_pid)
+
+
+def setup_module():
+    construct.extensions.register(RunnerExtension)
+
+
+def teardown_module():
+    construct.extensions.clear()
+
+
+def test_task_dependencies():
+    '''Task dependencies are derived from requires and skips'''
+
+    assert first.dependencies() == set()
+    assert second.dependencies() == set(['first'])
+    assert skipped.dependencies() == set(['first'])
+    assert opaque.dependencies() is None
+
+
+def test_runner_dependency_order():
+    '''ActionRunner runs tasks when their dependencies are met'''
+
+    action = RunnerAction(ctx=Context())
+    action.run()
+
+    assert action.ctx.store['first'] == 1
+    assert action.ctx.store['second'] == 2
+    assert action.ctx.store['third'] == 3
+    assert action.ctx.store['opaque'] == 4
+
+    requests = action.ctx.requests
+    assert requests['opaque'].status == SUCCESS
+    assert requests['on_failure'].status == SKIPPED
+    assert requests['skipped'].status == SKIPPED
+
+
+def test_thread_pool_runner():
+    '''ThreadPoolActionRunner runs independent tasks concurrently'''
+
+    action = ThreadedAction(ctx=Context())
+    st = default_timer()
+    action.run()
+    duration = default_timer() - st
+
+    results = action.ctx.store['gather']
+    assert len(results) == 4
+    assert duration < 0.6
+
+    # Context is propagated to worker threads
+    assert all(r[1] == 'test.threaded' for r in results)
+    assert len(set(r[0] for r in results)) > 1
+
+
+def test_process_task_runner():
+    '''ProcessRequest results are handled in the runner's thread'''
+
+    action = ProcessAction(ctx=Context())
+    action.run()
+
+    assert action.ctx.requests['process_pid'].status == SUCCESS
+    assert action.ctx.store['pid'] != os.getpid()
+    assert callback_threads == [threading.current_thread()]
+
+
+def test_action_stats():
+    '''Action stats are collected while the action runs'''
+
+    action = ThreadedAction(ctx=Context())
+    action.run()
+
+    stats = action.stats
+    assert stats.number_of_successes == 5
+    assert stats.number_of_failures == 0
+    assert set(stats.task_times) == set(
+        ['sleeper0', 'sleeper1', 'sleeper2', 'sleeper3', 'gather']
+    )
+    assert all(stats.task_times['sleeper%d' % i] >= 0.2 for i in range(4))
+    assert stats.total_execution_time >= 0.2
+    assert stats.slowest_tasks(1)[0][0].startswith('sleeper')
+
+    data = json.loads(stats.to_json())
+    assert data['action'] == 'test.threaded'
+    assert len(data['group_times']) == 1
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import stat
+import shutil
+import datetime
+import tempfile
+from construct import appendlog
+from construct.appendlog import AppendLog
+
+
+tmpdir = None
+
+
+def setup_module():
+    global tmpdir
+    tmpdir = tempfile.mkdtemp()
+
+
+def teardown_module():
+    shutil.rmtree(tmpdir)
+
+
+def test_append_and_read():
+    '''AppendLog reads records oldest or latest first'''
+
+    log = AppendLog(os.path.join(tmpdir, 'records.jsonl'))
+    assert list(log) == []
+
+    now = datetime.datetime.utcnow()
+    log.append({'id': 0, 'time': now})
+    log.extend([
+        {'id': i, 'body': u'comment ü %d' % i} for i in range(1, 500)
+    ])
+
+    records = list(log)
+    assert len(log) == 500
+    assert [r['id'] for r in records] == list(range(500))
+    assert records[0]['time'] == now
+
+    # Reverse reads cross block boundaries
+    block_size = appendlog.BLOCK_SIZE
+    appendlog.BLOCK_SIZE = 64
+    try:
+        latest = list(log.iter(latest_first=True))
+    finally:
+        appendlog.BLOCK_SIZE = block_size
+    assert latest == list(reversed(records))
+
+    page = log.read(latest_first=True, offset=10, limit=5)
+    assert [r['id'] for r in page] == [489, 488, 487, 486, 485]
+
+
+def test_replace_keeps_mode():
+    '''AppendLog.replace keeps the permissions of the log file'''
+
+    path = os.path.join(tmpdir, 'mode.jsonl')
+    log = AppendLog(path)
+    log.replace([{'id': 0}])
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~umask
+
+    os.chmod(path, 0o640)
+    log.replace([{'id': 1}])
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert [r['id'] for r in log] == [1]
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import construct
+from construct.context import Context
+from construct.utils import unipath
+
+
+root = None
+project = None
+
+
+def setup_module():
+    global root, project
+    root = unipath(tempfile.mkdtemp())
+    construct.init(root=root)
+    project = construct.new_project(root=root + '/project')
+
+
+def teardown_module():
+    construct.uninit()
+    shutil.rmtree(root)
+
+
+def test_new_shots():
+    '''new.shots creates many shots and skips existing shots'''
+
+    construct.set_context_from_entry(project)
+    collection = construct.ActionProxy('new.collection')(
+        project=project,
+        name='shots'
+    )
+    construct.set_context_from_entry(collection)
+    sequence = construct.new_sequence(name='seq01')
+    construct.set_context_from_entry(sequence)
+    existing = construct.new_shot(name='sh010')
+
+    action = construct.new_shots.instance(names='sh010, sh020 sh030,sh020')
+    action.run()
+
+    shots = action.ctx.artifacts['shots']
+    assert [s.name for s in shots] == ['sh020', 'sh030']
+    assert all('shot' in s.tags for s in shots)
+    assert len(set(s.uuid for s in shots + [existing])) == 3
+
+    errors = [i['error'] for i in action.ctx.store['shot_items']]
+    assert errors[0].startswith('Already exists')
+    assert errors[3].startswith('Already exists')
+    assert errors[1] is None and errors[2] is None
+
+    construct.set_context(Context.from_path(shots[0].path))
+    tasks = construct.new_tasks(names=['anim', 'comp', 'unknown'])
+    assert sorted(t.name for t in tasks) == ['anim', 'comp']
+    assert os.path.isdir(shots[0].path + '/anim/.data')
+    assert 'anim' in tasks[0].tags or 'anim' in tasks[1].tags
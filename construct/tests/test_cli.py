@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import sys
+import shutil
+import tempfile
+import subprocess
+from timeit import default_timer
+import construct
+
+
+# Generous budget, catches regressions like building every action's parser
+STARTUP_BUDGET = 5.0
+package_root = os.path.dirname(os.path.dirname(construct.__file__))
+tmpdir = None
+
+
+def setup_module():
+    global tmpdir
+    tmpdir = tempfile.mkdtemp()
+
+
+def teardown_module():
+    shutil.rmtree(tmpdir)
+
+
+def run_cli(*args):
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        [package_root, env.get('PYTHONPATH', '')]
+    )
+    env['CONSTRUCT_CACHE'] = tmpdir
+    proc = subprocess.Popen(
+        [sys.executable, '-m', 'construct.cli'] + list(args),
+        cwd=tmpdir,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    out, err = proc.communicate()
+    return proc.returncode, out.decode('utf-8', 'replace')
+
+
+def test_cli_startup_time():
+    '''CLI startup stays within budget'''
+
+    st = default_timer()
+    returncode, out = run_cli('version')
+    duration = default_timer() - st
+
+    assert returncode == 0
+    assert construct.__version__ in out
+    assert duration < STARTUP_BUDGET
+
+
+def test_cli_unknown_command():
+    '''CLI exits with an error for unknown commands'''
+
+    returncode, out = run_cli('not.a.command')
+    assert returncode == 1
+    assert 'Command does not exist' in out
+
+
+def test_cli_write_new_entry():
+    '''CLI write creates the data of a directory that is not an Entry'''
+
+    path = os.path.join(tmpdir, 'new_entry')
+    os.makedirs(path)
+    returncode, out = run_cli('write', '-r', path, '-k', 'x', '1')
+    assert returncode == 0
+    assert 'Wrote data to' in out
+    assert os.path.isdir(os.path.join(path, '.data'))
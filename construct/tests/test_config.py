@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import fsfs
+from importlib import import_module
+from six.moves import cPickle as pickle
+from construct import api
+from construct.config import Config, load_config, get_snapshot_path
+from construct.context import Context
+from construct.utils import unipath
+
+
+# construct.config is shadowed by the Config instance in the construct package
+config_module = import_module('construct.config')
+
+
+def test_config_lookup_order():
+    '''Config looks up project data, then config.dict, then defaults'''
+
+    config = Config(STATUSES={'done': '#00FF00'})
+    assert config['STATUSES'] == {'done': '#00FF00'}
+    assert config['TASK_TYPES'] == Config.defaults['TASK_TYPES']
+
+
+def test_config_invalidation():
+    '''Config memoized chain is invalidated'''
+
+    old_context = api._context
+    root = tempfile.mkdtemp()
+    try:
+        api._context = Context()
+        config = Config()
+        assert config.get('MY_KEY') is None
+
+        # Invalidated by update and __setitem__
+        config.update(MY_KEY='dict')
+        assert config['MY_KEY'] == 'dict'
+        config['MY_KEY'] = 'item'
+        assert config['MY_KEY'] == 'item'
+
+        # Invalidated by context's project changing
+        project = fsfs.get_entry(root)
+        project.tag('project')
+        project.write(MY_KEY='project')
+        api._context = Context(project=project)
+        assert config['MY_KEY'] == 'project'
+
+        # Project data is stat'd at most once every stat_interval seconds
+        project.write(MY_KEY='changed')
+        assert config['MY_KEY'] == 'project'
+        config.invalidate()
+        assert config['MY_KEY'] == 'changed'
+
+        config.stat_interval = 0
+        project.write(MY_KEY='external')
+        assert config['MY_KEY'] == 'external'
+
+        # Invalidated when the project's data is written in process
+        assert api.config['MY_KEY'] == 'external'
+        project.write(MY_KEY='written')
+        api._on_entry_data_changed(project, project.read())
+        assert api.config['MY_KEY'] == 'written'
+
+        api._context = Context()
+        assert config['MY_KEY'] == 'item'
+    finally:
+        api._context = old_context
+        shutil.rmtree(root)
+
+
+def test_config_snapshot():
+    '''Config files are loaded from a snapshot keyed by mtime and hash'''
+
+    tmpdir = tempfile.mkdtemp()
+    cache_root = config_module.CACHE_ROOT
+    config_module.CACHE_ROOT = tmpdir
+    try:
+        path = os.path.join(tmpdir, 'config.yaml')
+        with open(path, 'w') as f:
+            f.write('ROOT: /projects\n')
+
+        assert load_config(path) == {'ROOT': '/projects'}
+        snapshot_path = get_snapshot_path(path)
+        assert snapshot_path.startswith(unipath(tmpdir))
+        assert os.path.isfile(snapshot_path)
+
+        # Snapshot is used while the file is unchanged
+        with open(snapshot_path, 'rb') as f:
+            snapshot = pickle.load(f)
+        snapshot['data'] = {'ROOT': '/snapshot'}
+        with open(snapshot_path, 'wb') as f:
+            pickle.dump(snapshot, f)
+        assert load_config(path) == {'ROOT': '/snapshot'}
+
+        # Snapshot is invalidated when the content changes
+        with open(path, 'w') as f:
+            f.write('ROOT: /other/projects\n')
+        os.utime(path, (0, 0))
+        assert load_config(path) == {'ROOT': '/other/projects'}
+    finally:
+        config_module.CACHE_ROOT = cache_root
+        shutil.rmtree(tmpdir)
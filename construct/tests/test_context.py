@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import fsfs
+from construct.context import Context, resolve_path, clear_path_cache
+from construct.models import factory
+from construct.utils import unipath
+
+
+root = None
+
+
+def setup_module():
+    global root
+    root = unipath(tempfile.mkdtemp())
+    fsfs.set_entry_factory(factory)
+    fsfs.tag(root + '/project', 'project')
+    fsfs.tag(root + '/project/assets/prop/cup', 'asset')
+    os.makedirs(root + '/project/assets/prop/cup/model/work')
+
+
+def teardown_module():
+    clear_path_cache()
+    fsfs.set_default_policy()
+    shutil.rmtree(root)
+
+
+def test_context_from_path_cache():
+    '''Context.from_path caches resolved entries until tags change'''
+
+    path = root + '/project/assets/prop/cup/model/work'
+    ctx = Context.from_path(path)
+    assert ctx.project.path == root + '/project'
+    assert ctx.asset.path == root + '/project/assets/prop/cup'
+    assert ctx.task is None
+
+    # Cached entries are reused
+    assert resolve_path(path)['asset'] is ctx.asset
+
+    # Tagging an ancestor invalidates the cached entries
+    fsfs.tag(root + '/project/assets/prop/cup/model', 'task')
+    ctx = Context.from_path(path)
+    assert ctx.task.path == root + '/project/assets/prop/cup/model'
+
+    # So does untagging one
+    fsfs.get_entry(root + '/project/assets/prop/cup').untag('asset')
+    ctx = Context.from_path(path)
+    assert ctx.asset is None
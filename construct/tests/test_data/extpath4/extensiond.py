@@ -0,0 +1,26 @@
+from construct import Extension, Action
+from construct.tasks import task
+
+
+class LazyAction(Action):
+    label = 'Lazy Action'
+    identifier = 'test.lazy'
+
+    @staticmethod
+    def available(ctx):
+        return True
+
+
+@task
+def lazy_task():
+    return True
+
+
+class ExtensionD(Extension):
+    name = 'ExtensionD'
+    attr_name = 'extension_d'
+    lazy = True
+
+    def load(self):
+        self.add_action(LazyAction)
+        self.add_task(LazyAction, lazy_task)
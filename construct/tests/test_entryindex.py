@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import fsfs
+from construct import entryindex
+from construct.utils import unipath
+
+
+root = None
+
+
+def setup_module():
+    global root
+    root = unipath(tempfile.mkdtemp())
+    fsfs.tag(root, 'project')
+    fsfs.tag(root + '/assets', 'collection')
+    fsfs.tag(root + '/assets/prop', 'asset_type')
+    fsfs.tag(root + '/assets/prop/prop_a', 'asset')
+    fsfs.tag(root + '/assets/prop/prop_b', 'asset')
+    fsfs.tag(root + '/assets/prop/prop_a/model', 'task')
+    fsfs.tag(root + '/assets/prop/prop_a/model/work/maya', 'workspace')
+    entryindex.get_index(root).rebuild()
+    entryindex.connect()
+
+
+def teardown_module():
+    entryindex.disconnect()
+    shutil.rmtree(root)
+
+
+def test_rebuild_index():
+    '''Rebuild an EntryIndex'''
+
+    entry_index = entryindex.find_index(root + '/assets/prop')
+    assert entry_index.root == root
+    assert entry_index.count() == 7
+
+
+def test_query_index():
+    '''Query EntryIndex by tags, name and levels'''
+
+    entry_index = entryindex.find_index(root)
+
+    assets = entry_index.query(tags=['asset'])
+    assert assets == [
+        root + '/assets/prop/prop_a',
+        root + '/assets/prop/prop_b',
+    ]
+
+    assert entry_index.query(name='prop_b') == [root + '/assets/prop/prop_b']
+
+    # Levels match fsfs semantics
+    children = entry_index.query(root + '/assets', levels=1, skip_root=True)
+    assert children == [root + '/assets/prop']
+    fs_children = fsfs.search(root + '/assets', levels=1, skip_root=True)
+    assert children == [e.path for e in fs_children]
+
+    # Work directory is not an Entry so workspace is one level below task
+    task = root + '/assets/prop/prop_a/model'
+    assert entry_index.query(task, levels=1, skip_root=True) == [
+        task + '/work/maya'
+    ]
+
+
+def test_index_matches_search():
+    '''IndexQuery yields the same Entries as fsfs.Search'''
+
+    entry_index = entryindex.find_index(root)
+    indexed = entry_index.search(root).tags('asset')
+    searched = fsfs.search(root).tags('asset')
+    assert sorted(e.path for e in indexed) == sorted(e.path for e in searched)
+
+    selected = entry_index.search(root).name('assets/prop_a').one()
+    assert selected.path == root + '/assets/prop/prop_a'
+
+    entry = entry_index.quick_select(root, 'prop/model')
+    assert entry.path == root + '/assets/prop/prop_a/model'
+
+
+def test_index_updates():
+    '''EntryIndex updates when Entries are created, tagged and deleted'''
+
+    entry_index = entryindex.find_index(root)
+    path = root + '/assets/prop/prop_c'
+
+    fsfs.tag(path, 'asset')
+    assert path in entry_index.query(tags=['asset'])
+
+    fsfs.untag(path, 'asset')
+    assert path not in entry_index.query(tags=['asset'])
+
+    fsfs.delete(path, remove_root=True)
+    assert path not in entry_index.query()
+    assert not os.path.exists(path)
+
+
+def test_query_ordering():
+    '''IndexQuery supports latest_first and limit'''
+
+    entry_index = entryindex.find_index(root)
+    query = entry_index.search(root, skip_root=True).tags('asset')
+    latest = [e.path for e in query.latest_first()]
+    assert latest == [
+        root + '/assets/prop/prop_b',
+        root + '/assets/prop/prop_a',
+    ]
+    assert [e.path for e in query.latest_first().limit(1)] == latest[:1]
+
+    # Limit is applied after predicates
+    query = query.filter(lambda e: e.name == 'prop_a').limit(1)
+    assert [e.path for e in query] == [root + '/assets/prop/prop_a']
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, print_function
+import os
+import shutil
+import tempfile
 from construct.tests import data_path
+from construct.context import Context
+from construct.extension import ExtensionManifest, LazyExtension
 import construct
 
 
@@ -28,3 +33,93 @@ def test_discover_multiple_paths():
     assert 'ExtensionA' in exts
     assert 'ExtensionB' in exts
     assert 'ExtensionC' in exts
+
+
+def test_lazy_discovery():
+    '''Discover Extensions lazily using the extension manifest'''
+
+    tmpdir = tempfile.mkdtemp()
+    manifest = construct.extensions.manifest
+    construct.extensions.manifest = ExtensionManifest(
+        os.path.join(tmpdir, 'extensions.json')
+    )
+    ctx = Context()
+
+    try:
+        # First discovery imports the module and writes the manifest
+        construct.extensions.clear()
+        construct.extensions.discover(data_path('extpath4'))
+        ext = construct.extensions.by_name['ExtensionD']
+        assert not isinstance(ext, LazyExtension)
+        assert os.path.isfile(construct.extensions.manifest.path)
+
+        # Next discovery uses the manifest and defers the import
+        construct.extensions.clear()
+        construct.extensions.manifest._sources = None
+        construct.extensions.discover(data_path('extpath4'))
+        ext = construct.extensions.by_name['ExtensionD']
+        assert isinstance(ext, LazyExtension)
+        assert not ext.loaded
+
+        # The manifest is only written when a source changes
+        assert not construct.extensions.manifest._changed
+        assert ext.get_tasks('test.other', ctx) == []
+        assert not ext.loaded
+
+        # Requesting an action loads the extension
+        action = construct.actions.get('test.lazy', ctx)
+        assert action.identifier == 'test.lazy'
+        assert ext.loaded
+        assert construct.extensions.by_name['ExtensionD'] is ext._extension
+        tasks = construct.actions.collect_tasks('test.lazy', ctx)
+        assert [t.identifier for t in tasks] == ['lazy_task']
+
+        # Extensions are loaded at startup unless they opt in to lazy
+        for _ in range(2):
+            construct.extensions.clear()
+            construct.extensions.manifest._sources = None
+            construct.extensions.discover(data_path('extpath1'))
+            ext = construct.extensions.by_name['ExtensionA']
+            assert not isinstance(ext, LazyExtension)
+    finally:
+        construct.extensions.clear()
+        construct.extensions.manifest = manifest
+        shutil.rmtree(tmpdir)
+
+
+def test_action_collector_cache():
+    '''ActionCollector caches collections per registry version and context'''
+
+    construct.extensions.clear()
+    construct.extensions.discover(data_path('extpath4'))
+    ext = construct.extensions.get('ExtensionD')
+    ctx = Context()
+
+    try:
+        calls = []
+        get_tasks = ext.get_tasks
+
+        def counted_get_tasks(identifier, ctx=None):
+            calls.append(identifier)
+            return get_tasks(identifier, ctx)
+        ext.get_tasks = counted_get_tasks
+
+        tasks = construct.actions.collect_tasks('test.lazy', ctx)
+        assert construct.actions.collect_tasks('test.lazy', ctx) == tasks
+        assert construct.actions.collect_tasks('test.lazy', Context()) == tasks
+        assert len(calls) == 1
+
+        # Different context signature
+        construct.actions.collect_tasks('test.lazy', Context(host='other'))
+        assert len(calls) == 2
+
+        # Changing the extension registry invalidates the cache
+        assert 'test.lazy' in construct.actions.collect(ctx)
+        ext.enabled = False
+        assert 'test.lazy' not in construct.actions.collect(ctx)
+        assert construct.actions.collect_tasks('test.lazy', ctx) == []
+        ext.enabled = True
+        assert construct.actions.collect_tasks('test.lazy', ctx) == tasks
+        assert len(calls) == 3
+    finally:
+        construct.extensions.clear()
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import fsfs
+import construct
+from construct import entryindex
+from construct.models import factory
+from construct.utils import unipath
+
+
+root = None
+
+
+def setup_module():
+    global root
+    root = unipath(tempfile.mkdtemp())
+    fsfs.set_entry_factory(factory)
+    fsfs.tag(root + '/model', 'task')
+    fsfs.tag(root + '/model/work/maya', 'workspace')
+
+
+def teardown_module():
+    fsfs.set_default_policy()
+    shutil.rmtree(root)
+
+
+def touch(path):
+    with open(path, 'a'):
+        os.utime(path, None)
+
+
+def test_workspace_version_index():
+    '''Workspace version index tracks latest work files'''
+
+    workspace = fsfs.get_entry(root + '/model/work/maya')
+    for name in ['mdl_cup_v001.mb', 'mdl_cup_v002.mb', 'mdl_mug_v001.mb']:
+        touch(workspace.path + '/' + name)
+
+    assert workspace.get_next_version('cup', '.mb') == 3
+    assert workspace.get_next_version('mug', '.mb') == 2
+    assert workspace.get_next_version('cup', '.ma') == 1
+
+    latest = workspace.get_latest_version('cup', '.mb')
+    assert latest['version'] == 2
+    assert latest['file'] == 'mdl_cup_v002.mb'
+
+    # Index is updated in place when a work file is saved
+    new_file = workspace.path + '/mdl_cup_v003.mb'
+    touch(new_file)
+    workspace.add_work_file(new_file)
+    assert workspace.get_next_version('cup', '.mb') == 4
+
+    # Saves within the mtime granularity are found by the entry count
+    st = os.stat(workspace.path)
+    touch(workspace.path + '/mdl_cup_v004.mb')
+    os.utime(workspace.path, (st.st_atime, st.st_mtime))
+    assert workspace.get_next_version('cup', '.mb') == 5
+
+
+def read_data_file(entry):
+    with open(entry.data.file, 'r') as f:
+        return f.read()
+
+
+def test_entry_batch():
+    '''Entry.batch coalesces writes and flushes once'''
+
+    entry = fsfs.get_entry(root + '/model')
+    assert entry.get_status() == 'waiting'
+    assert 'status' not in entry.read()
+
+    before = read_data_file(entry)
+    with entry.batch():
+        entry.set_status('complete')
+        entry.new_comment('First')
+        entry.new_comment('Second')
+        assert entry.read('status') == 'complete'
+        assert read_data_file(entry) == before
+
+    assert entry.get_status() == 'complete'
+    assert [c['body'] for c in entry.get_comments()] == ['First', 'Second']
+
+    # Changes are discarded when the batch fails
+    try:
+        with entry.batch():
+            entry.set_status('waiting')
+            raise ValueError()
+    except ValueError:
+        pass
+    assert entry.get_status() == 'complete'
+
+
+def test_bulk_write():
+    '''bulk_write writes the same data to many entries'''
+
+    entries = []
+    for name in ['shot_a', 'shot_b', 'shot_c']:
+        fsfs.tag(root + '/' + name, 'shot')
+        entries.append(fsfs.get_entry(root + '/' + name))
+
+    construct.bulk_write(entries, status='complete', frame_range=[1, 100])
+    for entry in entries:
+        assert entry.read('status') == 'complete'
+        assert entry.read('frame_range') == [1, 100]
+        assert not entry._batch_depth
+
+
+def test_write_new_entry():
+    '''Writing to a directory that is not an Entry yet creates it'''
+
+    entry = fsfs.get_entry(root + '/new_entry')
+    entry.write(x=1)
+    assert entry.exists
+    assert entry.read('x') == 1
+
+    other = fsfs.get_entry(root + '/new_entry_replace')
+    other.write(replace=True, y=2)
+    assert other.read() == {'y': 2}
+
+
+def test_append_log_migration():
+    '''Comments stored in Entry data migrate to an append log'''
+
+    entry = fsfs.get_entry(root + '/model/work/maya')
+    entry.write(comments=[{'user': 'a', 'body': 'Old'}])
+    entry.new_comment('New')
+
+    # Reads include comments stored in data without migrating them
+    data = read_data_file(entry)
+    assert [c['body'] for c in entry.get_comments()] == ['Old', 'New']
+    latest = next(entry.iter_comments(latest_first=True))
+    assert latest['body'] == 'New'
+    assert read_data_file(entry) == data
+
+    assert entry.migrate_logs() == ['comments']
+    assert 'comments' not in entry.read()
+    assert [c['body'] for c in entry.get_comments()] == ['Old', 'New']
+    assert entry.migrate_logs() == []
+
+    # Comments are discarded when a batch fails
+    try:
+        with entry.batch():
+            entry.new_comment('Discarded')
+            assert entry.get_comments()[-1]['body'] == 'Discarded'
+            raise ValueError()
+    except ValueError:
+        pass
+    assert [c['body'] for c in entry.get_comments()] == ['Old', 'New']
+
+
+def test_version_log_migration():
+    '''Versions stored in Workspace data are read and migrated'''
+
+    workspace = fsfs.get_entry(root + '/model/work/maya')
+    workspace.write(versions=[{'name': 'cup', 'version': 1}])
+    workspace.new_version(
+        'user', 'cup', 2, 'maya', workspace.path + '/mdl_cup_v002.mb'
+    )
+
+    versions = [v['version'] for v in workspace.iter_versions()]
+    assert versions == [2, 1]
+    assert 'versions' in workspace.read()
+
+    assert 'versions' in workspace.migrate_logs()
+    assert 'versions' not in workspace.read()
+    versions = [v['version'] for v in workspace.iter_versions(False)]
+    assert versions == [1, 2]
+
+    # Versions are discarded when a batch fails
+    try:
+        with workspace.batch():
+            workspace.new_version(
+                'user', 'cup', 3, 'maya', workspace.path + '/mdl_cup_v003.mb'
+            )
+            raise ValueError()
+    except ValueError:
+        pass
+    assert len(list(workspace.iter_versions())) == 2
+
+
+def test_iter_children():
+    '''Entry.iter_children streams children with ordering and limits'''
+
+    for name in ['v001', 'v002', 'v003']:
+        fsfs.tag(root + '/model/publish/' + name, 'publish')
+    fsfs.tag(root + '/model/publish/v002/review', 'review')
+
+    task = fsfs.get_entry(root + '/model')
+    publishes = [e.path for e in task.publishes]
+    streamed = [e.path for e in task.iter_publishes()]
+    assert streamed == sorted(publishes)
+
+    latest = [e.path for e in task.iter_publishes(latest_first=True)]
+    assert latest == list(reversed(streamed))
+
+    assert task.get_latest_publish().path == root + '/model/publish/v003'
+    assert len(list(task.iter_publishes(limit=2))) == 2
+
+    # Levels match fsfs semantics
+    children = [e.path for e in task.iter_children(levels=2)]
+    fs_children = [e.path for e in task.children(levels=2)]
+    assert children == sorted(fs_children)
+
+
+def test_copy_indexed_entry():
+    '''Copying an Entry within an indexed project indexes it's children'''
+
+    project = root + '/indexed'
+    fsfs.tag(project, 'project')
+    fsfs.tag(project + '/shot_a', 'shot')
+    fsfs.tag(project + '/shot_a/comp', 'task')
+    entry_index = entryindex.get_index(project)
+    entry_index.rebuild()
+    entryindex.connect()
+    try:
+        shot = fsfs.get_entry(project + '/shot_a')
+        shot.copy(project + '/shot_b')
+
+        tasks = entry_index.query(tags=['task'])
+        assert tasks == [project + '/shot_a/comp', project + '/shot_b/comp']
+        uuids = [fsfs.get_entry(path).uuid for path in tasks]
+        assert uuids[0] != uuids[1]
+
+        copied = fsfs.get_entry(project + '/shot_b')
+        assert [e.path for e in copied.tasks] == [project + '/shot_b/comp']
+    finally:
+        entryindex.disconnect()
+
+    # Directories without an index are cached
+    assert entryindex.find_index(root + '/model') is None
+    assert root + '/model' in entryindex._no_index
+    assert entryindex.find_index(root + '/model') is None
+
+
+def test_iter_children_order():
+    '''iter_children orders paths the same with and without an index'''
+
+    project = root + '/ordered'
+    fsfs.tag(project, 'project')
+    for path in ['sq/sh_b', 'sq/sh_a', 'sq-2/sh_a', 'sq-2/sh_a/fx']:
+        fsfs.tag(project + '/' + path, 'shot')
+    entry = fsfs.get_entry(project)
+
+    walked = [e.path for e in entry.iter_children(['shot'], levels=3)]
+    latest = [e.path for e in entry.iter_children(['shot'], 3, True)]
+    assert walked == [
+        project + '/sq/sh_a',
+        project + '/sq/sh_b',
+        project + '/sq-2/sh_a',
+        project + '/sq-2/sh_a/fx',
+    ]
+    assert latest == list(reversed(walked))
+
+    entryindex.get_index(project).rebuild()
+    try:
+        indexed = [e.path for e in entry.iter_children(['shot'], levels=3)]
+        assert indexed == walked
+        indexed = [e.path for e in entry.iter_children(['shot'], 3, True)]
+        assert indexed == latest
+    finally:
+        entryindex.disconnect()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from construct import api
+from construct.vendor.lucidity import Template
+
+
+def test_parse_many():
+    '''Parse many paths with one Template'''
+
+    template = Template(
+        'workspace_file',
+        r'{task:[^_/]+}_{name}_v{version:\d+}{ext:\.\w+}',
+        anchor=None
+    )
+    paths = [
+        'mdl_cup_v001.ma',
+        'notes.txt',
+        'mdl_cup_v002.ma',
+    ]
+    data, rejects = template.parse_many(paths)
+    assert rejects == set(['notes.txt'])
+    assert data == [template.parse(paths[0]), template.parse(paths[2])]
+    assert [d['version'] for d in data] == ['001', '002']
+
+
+def test_path_template_cache():
+    '''Path templates are cached by name and pattern'''
+
+    template = api.get_path_template('workspace_file')
+    assert template is api.get_path_template('workspace_file')
+
+    templates = api.get_path_templates()
+    assert templates['workspace_file'] is template
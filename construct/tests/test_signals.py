@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from construct import signals
+
+
+received = []
+
+
+def on_exact(value):
+    received.append(('exact', value))
+
+
+def on_wildcard(value):
+    received.append(('wildcard', value))
+
+
+def test_send_exact_and_wildcard():
+    '''Send signal to exact and wildcard subscribers'''
+
+    del received[:]
+    signals.connect('test.signal', on_exact)
+    signals.connect('test.*', on_wildcard)
+
+    signals.send('test.signal', 1)
+    assert received == [('exact', 1), ('wildcard', 1)]
+
+    signals.send('test.other', 2)
+    assert received[-1] == ('wildcard', 2)
+    assert signals.send('nomatch.signal', 3) == []
+
+    signals.disconnect('test.signal', on_exact)
+    signals.disconnect('test.*', on_wildcard)
+
+
+def test_dispatch_cache_invalidated():
+    '''Signal dispatch cache is invalidated by connect and disconnect'''
+
+    del received[:]
+    signals.send('test.late', 1)
+    assert received == []
+
+    signals.connect('test.*', on_wildcard)
+    signals.send('test.late', 2)
+    assert received == [('wildcard', 2)]
+
+    signals.disconnect('test.*', on_wildcard)
+    signals.send('test.late', 3)
+    assert received == [('wildcard', 2)]
+    assert 'test.late' not in signals._subscribers
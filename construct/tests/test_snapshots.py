@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import os
+import shutil
+import tempfile
+import fsfs
+from construct import snapshots
+from construct.models import factory
+from construct.utils import unipath
+
+
+root = None
+
+
+def setup_module():
+    global root
+    root = unipath(tempfile.mkdtemp())
+    fsfs.set_entry_factory(factory)
+    template = fsfs.get_entry(root + '/template')
+    template.tag('shot')
+    template.write(fps=24)
+    fsfs.tag(root + '/template/comp', 'task')
+    with open(root + '/template/.data/comments.jsonl', 'w') as f:
+        f.write('{}\n')
+    with open(root + '/template/notes.txt', 'w') as f:
+        f.write('notes')
+    with open(root + '/template/history.jsonl', 'w') as f:
+        f.write('{}\n')
+    with open(root + '/template/run.sh', 'w') as f:
+        f.write('#!/bin/sh\n')
+    os.chmod(root + '/template/run.sh', 0o755)
+
+
+def teardown_module():
+    fsfs.set_default_policy()
+    snapshots.clear_snapshots()
+    shutil.rmtree(root)
+
+
+def test_copy_template():
+    '''copy_template creates entries from a cached template snapshot'''
+
+    template = fsfs.get_entry(root + '/template')
+    snapshot = snapshots.get_snapshot(template)
+    assert snapshots.get_snapshot(template) is snapshot
+    assert snapshot.tags == {'.': ['shot'], 'comp': ['task']}
+
+    copies = [
+        snapshots.copy_template(template, root + '/copy%d' % i)
+        for i in range(2)
+    ]
+    uuids = set([template.uuid])
+    for copy in copies:
+        assert copy.read('fps') == 24
+        assert 'shot' in copy.tags
+        assert 'task' in fsfs.get_entry(copy.path + '/comp').tags
+        assert os.path.isfile(copy.path + '/notes.txt')
+        assert not os.path.exists(copy.path + '/.data/comments.jsonl')
+        # Excludes only apply to data directories
+        assert os.path.isfile(copy.path + '/history.jsonl')
+        assert os.stat(copy.path + '/run.sh').st_mode & 0o777 == 0o755
+        uuids.add(copy.uuid)
+    assert len(uuids) == 3
+
+    # Snapshot is read again when the template changes
+    fsfs.tag(root + '/template/light', 'task')
+    new_snapshot = snapshots.get_snapshot(template)
+    assert new_snapshot is not snapshot
+    assert 'light' in new_snapshot.tags
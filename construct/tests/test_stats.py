@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import
+from nose.tools import assert_raises
+from construct import stats
+
+
+def setup_module():
+    stats.disable_profiling()
+    stats.reset_profile()
+
+
+def teardown_module():
+    stats.disable_profiling()
+    stats.reset_profile()
+
+
+@stats.log_call
+def profiled(value):
+    return value * 2
+
+
+@stats.log_call
+def profiled_error():
+    raise ValueError('profiled_error')
+
+
+def test_log_call_disabled():
+    '''log_call records nothing while profiling is disabled'''
+
+    stats.disable_profiling()
+    stats.reset_profile()
+
+    assert profiled(2) == 4
+    assert profiled.__name__ == 'profiled'
+    assert stats.get_report() == []
+
+
+def test_log_call_enabled():
+    '''log_call aggregates call timings while profiling is enabled'''
+
+    stats.reset_profile()
+    stats.enable_profiling()
+    try:
+        for i in range(10):
+            assert profiled(i) == i * 2
+        assert_raises(ValueError, profiled_error)
+    finally:
+        stats.disable_profiling()
+
+    report = {r['name']: r for r in stats.get_report()}
+    assert len(report) == 2
+
+    record = [r for n, r in report.items() if n.endswith('profiled')][0]
+    assert record['calls'] == 10
+    assert record['timed_calls'] == 10
+    assert record['min_time'] <= record['p50'] <= record['max_time']
+    assert record['p99'] <= record['max_time']
+
+    error_record = [r for n, r in report.items() if 'profiled_error' in n][0]
+    assert error_record['calls'] == 1
+
+    formatted = stats.format_report(limit=1)
+    assert len(formatted.splitlines()) == 2
+
+
+def test_log_call_sampling():
+    '''log_call counts all calls but only times sampled calls'''
+
+    stats.reset_profile()
+    stats.enable_profiling(sample_rate=0.0)
+    try:
+        for i in range(10):
+            profiled(i)
+    finally:
+        stats.disable_profiling()
+
+    record = stats.get_report()[0]
+    assert record['calls'] == 10
+    assert record['timed_calls'] == 0
+    assert record['total_time'] == 0.0
@@ -1,8 +1,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import, division, print_function
+import os
 import time
+import shutil
+import tempfile
 from timeit import default_timer
-from construct.tasks import Task, AsyncTask, task, TaskCollection
+from construct.tasks import (
+    Task,
+    AsyncTask,
+    task,
+    process_task,
+    ProcessTask,
+    TaskCollection,
+    wait_any,
+)
+from construct.utils import import_file
 from construct.errors import TimeoutError
 from construct.constants import *
 from nose.tools import raises
@@ -25,6 +37,11 @@ def func_raises():
     raise ValueError
 
 
+@process_task('process.pid')
+def process_pid(value):
+    return os.getpid(), value
+
+
 def test_call_Task():
     '''Call a Task'''
 
@@ -135,6 +152,60 @@ def test_AsyncRequest_returns_asap():
     assert value
 
 
+def test_ProcessTask_request():
+    '''Use a process task request'''
+
+    r = process_pid.request(args=('value',))
+    pid, value = r.get(10)
+
+    assert r.status == SUCCESS
+    assert value == 'value'
+    assert pid != os.getpid()
+
+    # Still callable as a normal function
+    assert process_pid('value') == (os.getpid(), 'value')
+
+
+def test_ProcessTask_not_importable():
+    '''Process tasks from modules imported by path run in process'''
+
+    tmpdir = tempfile.mkdtemp()
+    try:
+        module_path = os.path.join(tmpdir, 'process_module.py')
+        with open(module_path, 'w') as f:
+            f.write('import os\n\ndef get_pid():\n    return os.getpid()\n')
+        module = import_file(module_path)
+
+        t = ProcessTask(module.get_pid, 'process.module')
+        r = t.request()
+        assert r.get(10) == os.getpid()
+        assert r.status == SUCCESS
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def test_wait_any():
+    '''wait_any returns as soon as one request completes'''
+
+    t = AsyncTask(func_poll, 'func.poll', 'Polling task')
+    fast = t.request(args=(0.05,))
+    slow = t.request(args=(0.5,))
+    for r in (fast, slow):
+        # Start request threads
+        try:
+            r.get(0)
+        except TimeoutError:
+            pass
+
+    st = default_timer()
+    completed = wait_any([slow, fast])
+
+    assert default_timer() - st < 0.4
+    assert completed == [fast]
+    assert wait_any([slow], timeout=0) == []
+    assert slow.get() and wait_any([slow, fast]) == [slow, fast]
+
+
 def test_task_decorator():
     '''Task function decorator'''
 
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+import shutil
+import tempfile
+import fsfs
+from construct import templateregistry
+from construct.models import factory
+from construct.utils import unipath
+
+
+root = None
+
+
+def setup_module():
+    global root
+    root = unipath(tempfile.mkdtemp())
+    fsfs.set_entry_factory(factory)
+    fsfs.tag(root + '/project/shot_a', 'shot')
+    fsfs.tag(root + '/project/asset_a', 'asset')
+    fsfs.tag(root + '/builtin/shot_a', 'shot')
+    fsfs.tag(root + '/builtin/shot_b', 'shot')
+
+
+def teardown_module():
+    fsfs.set_default_policy()
+    templateregistry.clear_registries()
+    shutil.rmtree(root)
+
+
+def test_template_registry():
+    '''TemplateRegistry indexes templates by name and tag'''
+
+    paths = [root + '/project', root + '/builtin', root + '/missing']
+    registry = templateregistry.get_registry(paths)
+    assert templateregistry.get_registry(paths) is registry
+
+    templates = registry.get_templates()
+    assert sorted(templates) == ['asset_a', 'shot_a', 'shot_b']
+    assert templates['shot_a'].path == root + '/project/shot_a'
+
+    shots = registry.get_templates('shot')
+    assert sorted(shots) == ['shot_a', 'shot_b']
+    assert registry.get_templates('shot', 'asset') == {}
+
+    # Cached until a search path changes
+    by_name = registry.by_name
+    registry.get_templates('asset')
+    assert registry.by_name is by_name
+
+    fsfs.tag(root + '/builtin/asset_b', 'asset')
+    assert sorted(registry.get_templates('asset')) == ['asset_a', 'asset_b']
+    assert registry.by_name is not by_name
+
+    # Retagging a template refreshes the registry
+    fsfs.tag(root + '/builtin/shot_b', 'asset')
+    assert sorted(registry.get_templates('asset')) == [
+        'asset_a', 'asset_b', 'shot_b'
+    ]
+    fsfs.untag(root + '/builtin/shot_b', 'asset')
+    assert 'shot_b' not in registry.get_templates('asset')
+
+
+def test_template_registry_shadowing():
+    '''Templates only shadow same named templates that match the tags'''
+
+    fsfs.tag(root + '/first/comp', 'asset')
+    fsfs.tag(root + '/second/comp', 'shot')
+    paths = [root + '/first', root + '/second']
+    registry = templateregistry.TemplateRegistry(paths)
+
+    assert registry.get_templates()['comp'].path == root + '/first/comp'
+    assert registry.get_templates('asset')['comp'].path == (
+        root + '/first/comp'
+    )
+    assert registry.get_templates('shot')['comp'].path == (
+        root + '/second/comp'
+    )
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+from construct import yamlutils
+from construct.constants import DEFAULT_CONFIG
+from construct.vendor import yaml
+
+
+def test_load_matches_vendored_yaml():
+    '''yamlutils loads the same data as the vendored yaml package'''
+
+    with open(DEFAULT_CONFIG, 'r') as f:
+        text = f.read()
+
+    assert yamlutils.safe_load(text) == yaml.safe_load(text)
+
+
+def test_dump_roundtrip():
+    '''yamlutils dumps block style yaml that loads back to the same data'''
+
+    data = {'name': 'shot', 'tags': ['a', 'b'], 'fps': 24.0}
+    text = yamlutils.safe_dump(data)
+    assert '{' not in text
+    assert yamlutils.safe_load(text) == data
@@ -173,20 +173,23 @@ class weakset(object):
         return len(self._refs)
 
     def __iter__(self):
-        for i in range(len(self._refs)):
-            id_ = self._ids.pop(0)
-            ref = self._refs.pop(0)
+        # Iterate over a snapshot so subscribers can be read from many
+        # threads, dead references are removed by their callbacks
+        for ref in list(self._refs):
             obj = ref()
             if obj is not None:
                 yield obj
-                self._refs.append(ref)
-                self._ids.append(id_)
 
     def discard(self, obj):
-        if obj not in self._refs:
-            return
+        if obj in self._refs:
+            # Dead reference passed by a weakref callback
+            index = self._refs.index(obj)
+        else:
+            id_ = weak_id(obj)
+            if id_ not in self._ids:
+                return
+            index = self._ids.index(id_)
 
-        index = self._refs.index(obj)
         self._ids.pop(index)
         self._refs.pop(index)
 
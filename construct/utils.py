@@ -16,15 +16,19 @@ __all__ = [
     'isolated_imports',
     'import_file',
     'iter_modules',
+    'iter_module_paths',
     'missing',
     'classproperty',
     'dummy_ctxmanager',
-    'cached_property'
+    'cached_property',
+    'atomic_write',
 ]
 
 import inspect
 import os
 import sys
+import stat
+import tempfile
 from collections import Mapping
 from fstrings import f
 from glob import glob
@@ -36,6 +40,10 @@ platform = sys.platform.rstrip('0123456789').lower()
 if platform == 'darwin':
     platform = 'mac'
 missing = object()
+# os.umask can only be read by setting it, so read it once on import instead
+# of while other threads may be creating files
+_umask = os.umask(0o022)
+os.umask(_umask)
 
 
 def package_path(*paths):
@@ -223,14 +231,20 @@ def iter_modules(*paths):
     they are yielded.
     '''
 
+    for module_path in iter_module_paths(*paths):
+        yield import_file(module_path, isolated=False)
+
+
+def iter_module_paths(*paths):
+    '''Iterate over paths yielding the paths to all contained python modules
+    and packages without importing them.'''
+
     for path in paths:
         for py_file in glob(path + '/*.py'):
-            mod = import_file(py_file, isolated=False)
-            yield mod
+            yield py_file
 
         for py_pkg in glob(path + '/*/__init__.py'):
-            mod = import_file(os.path.dirname(py_pkg), isolated=False)
-            yield mod
+            yield os.path.dirname(py_pkg)
 
 
 class classproperty(object):
@@ -261,3 +275,44 @@ class cached_property(object):
         value = self.method(obj)
         setattr(obj, self.method.__name__, value)
         return value
+
+
+def atomic_write(path, data, mode='w'):
+    '''Write data to a temporary file next to path then rename it to path.
+    Readers never see a partially written file. The file keeps the mode of
+    an existing file at path, new files get the default mode for the umask.'''
+
+    root, basename = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=basename + '.',
+        suffix='.tmp',
+        dir=root
+    )
+    try:
+        with os.fdopen(fd, mode) as f:
+            f.write(data)
+        os.chmod(tmp_path, _get_file_mode(path))
+        _replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _get_file_mode(path):
+    '''Get the permission bits of path or the default mode of a new file'''
+
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        return 0o666 & ~_umask
+
+
+def _replace(src, dst):
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        # Python 2 on Windows can not rename over an existing file
+        if platform == 'win' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
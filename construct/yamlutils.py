@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+'''
+YAML loading and dumping used by Construct.
+
+Uses the libyaml backed CSafeLoader and CSafeDumper of an installed pyyaml
+when available, the vendored pure python yaml package is used as a fallback.
+'''
+from __future__ import absolute_import
+
+__all__ = [
+    'HAS_LIBYAML',
+    'Loader',
+    'Dumper',
+    'safe_load',
+    'safe_dump',
+    'load_file',
+]
+
+
+def _get_yaml():
+    '''Get the fastest available yaml module, Loader and Dumper'''
+
+    try:
+        import yaml
+        return yaml, yaml.CSafeLoader, yaml.CSafeDumper, True
+    except (ImportError, AttributeError):
+        pass
+
+    from construct.vendor import yaml
+    try:
+        return yaml, yaml.CSafeLoader, yaml.CSafeDumper, True
+    except AttributeError:
+        return yaml, yaml.SafeLoader, yaml.SafeDumper, False
+
+
+yaml, Loader, Dumper, HAS_LIBYAML = _get_yaml()
+
+
+def safe_load(stream):
+    '''Like yaml.safe_load'''
+
+    return yaml.load(stream, Loader=Loader)
+
+
+def safe_dump(data, stream=None, **kwargs):
+    '''Like yaml.safe_dump, defaults to block style.'''
+
+    kwargs.setdefault('default_flow_style', False)
+    return yaml.dump(data, stream, Dumper=Dumper, **kwargs)
+
+
+def load_file(path):
+    '''Load a yaml file'''
+
+    with open(path, 'r') as f:
+        return safe_load(f.read())
@@ -56,7 +56,8 @@ setup(
         'backports.shutil_get_terminal_size',
         'win_unicode_console',
         'fsfs',
-        'entrypoints'
+        'entrypoints',
+        'futures; python_version < "3"',
     ],
     entry_points={
         'console_scripts': [